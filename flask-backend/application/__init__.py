@@ -10,10 +10,13 @@ from config import (
 from flask import Flask
 
 # Import the database configuration
-from database import init_db, create_tables
+from database import init_db, create_tables, create_search_index, get_startup_mode, check_schema_revision
 
 # Import the extensions for the app
-from application.extensions import jwt, migrate
+from application.extensions import jwt, migrate, password_hasher, current_user_cache, last_login_writer, event_loop, azure_function_client, azure_topic_cache, azure_single_flight, feed_jobs, public_feeds_cache
+
+# Import the JSON provider of the responses
+from application.json_provider import FastJSONProvider
 
 # Import the CORS module
 from flask_cors import CORS
@@ -22,7 +25,7 @@ from flask_cors import CORS
 import logging
 
 # Import the models to create the tables
-from application.models import User, Feed, Topic, Resource
+from application.models import User, Feed, FeedSummary, Topic, Resource
 
 
 
@@ -47,12 +50,25 @@ def create_app():
     app.config.from_object(DevelopmentDockerConfig)
     # print(app.config)
 
+    # Serialize the JSON responses with orjson when it is installed (ISO-8601 dates)
+    app.json = FastJSONProvider(app)
+
     # Initialize extensions
 
     # Initialize the database with the newly created app
     init_db(app)
-    with app.app_context():
-        create_tables(app)
+
+    # Production: the schema is owned by the migrations, only check its revision. Development: create the missing tables
+    production = get_startup_mode(app) == 'production'
+    schema_ready = True
+    if production:
+        schema_ready = check_schema_revision(app)
+    else:
+        with app.app_context():
+            create_tables(app)
+
+    # Create the search indexes on topic and feed names (kept in sync by the database), created by the migrations in production
+    create_search_index(app, create=not production)
 
     # Initialize the migration extension
     # Import the db object from the application module
@@ -64,6 +80,39 @@ def create_app():
     # Initialize objects of the extensions
     jwt.init_app(app)
 
+    # Resolve the user of the JWT tokens (flask_jwt_extended.current_user) through the user cache
+    current_user_cache.init_app(app, jwt)
+
+    # Initialize the batched writes of the last login times (flushed on shutdown)
+    last_login_writer.init_app(app)
+
+    # Initialize the password hashing pool (used by the login, the registration and the seeder)
+    password_hasher.init_app(app)
+
+    # Run the async views on the persistent event loop (before the clients that use it, stopped after them)
+    event_loop.init_app(app)
+
+    # Initialize the shared HTTP client for the Azure Function (closed on shutdown)
+    azure_function_client.init_app(app)
+
+    # Initialize the per-topic cache in front of the Azure Function
+    azure_topic_cache.init_app(app)
+
+    # Initialize the coalescing of concurrent Azure Function requests
+    azure_single_flight.init_app(app)
+
+    # Initialize the background job queue of the feed creation requests
+    feed_jobs.init_app(app)
+
+    # Initialize the response cache of the public feed listings
+    public_feeds_cache.init_app(app)
+
+    # Register the maintenance commands (flask feeds rebuild-summaries, flask replica sync, flask seed-bench)
+    from .cli import feeds_cli, replica_cli, seed_bench_command
+    app.cli.add_command(feeds_cli)
+    app.cli.add_command(replica_cli)
+    app.cli.add_command(seed_bench_command)
+
     # Configure CORS to allow requests from any origin
     CORS(app, supports_credentials=True, origins=["http://front-end-url-if-apply", "http://localhost:5000"], allow_headers=["Content-Type", "Authorization", "X-CSRF-TOKEN", "Set-Cookie"], expose_headers=["Content-Type", "Authorization", "X-CSRF-TOKEN", "Set-Cookie"])
 
@@ -81,9 +130,10 @@ def create_app():
     # Import the function here to avoid circular import
     from database import StartupSeeder
 
-    # Run the function once initially, to seed the database
+    # Run the function once initially, to seed the database (once across the workers, under a lock)
     table = StartupSeeder(app)
-    table.seed()
+    if schema_ready:
+        table.seed()
 
 
     # Configure logging
@@ -1,4 +1,4 @@
 from .auth.routes import auth_bp
 from .user.routes import user_bp
 from .feeds.routes import feeds_bp
-from .helper_methods import ErrorHandler
\ No newline at end of file
+from .helper_methods import ErrorHandler, ConditionalRequest
\ No newline at end of file
@@ -3,7 +3,7 @@
 # Import flask and the necessary dependencies
 from flask import Blueprint, request, jsonify, current_app as app
 from application.blueprints.helper_methods import ErrorHandler
-from application.services import AuthService
+from application.services import AuthService, PasswordHasherBusy
 from flask_jwt_extended import jwt_required
 
 
@@ -28,8 +28,11 @@ def login_user_endpoint():
     # Create a new user service object
     auth_service = AuthService(payload)
 
-    # Login the user
-    response = auth_service.login_user()
+    # Login the user, the password hashing pool may be saturated by a burst of logins
+    try:
+        response = auth_service.login_user()
+    except PasswordHasherBusy as e:
+        return ErrorHandler.make_busy_response(str(e))
 
     return response
 
@@ -1,10 +1,11 @@
 
 # Import flask and the necessary dependencies
-from flask import Blueprint, current_app as app, jsonify, request
-from application.blueprints.helper_methods import ErrorHandler
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, current_app as app, g, jsonify, request, stream_with_context, url_for
+from application.blueprints.helper_methods import ErrorHandler, ConditionalRequest
+from flask_jwt_extended import jwt_required, current_user
 from application.extensions import jwt
-from application.services import FeedDataHandler, PaginationService, FeedsService, AzureFunctionService
+from database import reads_from_replica
+from application.services import FeedDataHandler, PaginationService, FeedsService, AzureFunctionService, FeedJobQueueFull
 
 
 # Create a blueprint object
@@ -26,11 +27,20 @@ async def fetch_news_feed_data_endpoint():
     """
     An asynchronous endpoint to fetch news feeds data from the Azure Function.
 
+    Clients can opt in to a background job with the "Prefer: respond-async" header or
+    the mode=async query parameter: the payload is validated, the job is queued and the
+    endpoint returns 202 with the job, to be followed at /feeds/jobs/<job_id>.
+
+    When the jobs are disabled, mode=async is refused with 501, while the Prefer header is
+    only a preference: the feed is created synchronously, without Preference-Applied.
+
     Args:
         payload (dict): The payload containing the topics to fetch.
 
     Returns:
         JSON: The response from the Azure Function.
+        JSON: The queued job (202) in async mode.
+        JSON: An error (501) for mode=async when the jobs are disabled.
 
     """
     
@@ -38,6 +48,25 @@ async def fetch_news_feed_data_endpoint():
 
     payload = ErrorHandler.get_json_payload()
 
+    # Queue the request as a background job when the client opts in
+    feed_jobs = app.extensions.get('feed_jobs')
+    jobs_enabled = feed_jobs is not None and feed_jobs.enabled
+    if request.args.get('mode') == 'async' and not jobs_enabled:
+        return ErrorHandler.make_error_response("Background feed jobs are not enabled on this server, retry without mode=async.", 501)
+
+    if jobs_enabled and _wants_async():
+        try:
+            job = feed_jobs.submit(payload, current_user.id)
+        except FeedJobQueueFull as e:
+            return ErrorHandler.make_error_response(str(e), 503)
+
+        response = jsonify(job)
+        response.status_code = 202
+        response.headers['Location'] = url_for('feeds.feed_job', job_id=job['job_id'])
+        if 'respond-async' in request.headers.get('Prefer', ''):
+            response.headers['Preference-Applied'] = 'respond-async'
+        return response
+
     feed = FeedDataHandler(payload)
 
     # Process the request
@@ -48,9 +77,48 @@ async def fetch_news_feed_data_endpoint():
 
 
 
+@feeds_bp.route('/jobs/<job_id>', methods=['GET'], endpoint='feed_job')
+@ErrorHandler.handle_exceptions
+@jwt_required()
+def feed_job_endpoint(job_id):
+    """
+    Get the status, progress and result of a feed creation job of the current user.
+
+    Args:
+        job_id (str): The ID of the job returned by /feeds/create-feed in async mode.
+
+    Returns:
+        JSON: The job, with its result once succeeded or its error once failed.
+    """
+    feed_jobs = app.extensions.get('feed_jobs')
+    job = feed_jobs.get(job_id, current_user.id) if feed_jobs is not None else None
+
+    if job is None:
+        return ErrorHandler.make_error_response(f"Job {job_id} not found", 404)
+
+    response = jsonify(job)
+
+    # Tell the client when to poll again while the job is not finished
+    if job['status'] in ('queued', 'running'):
+        response.headers['Retry-After'] = '1'
+
+    return response, 200
+
+
+def _wants_async() -> bool:
+    """
+    Check if the client asked to run the request as a background job.
+
+    Returns:
+        bool: True for the "Prefer: respond-async" header or the mode=async query parameter.
+    """
+    return request.args.get('mode') == 'async' or 'respond-async' in request.headers.get('Prefer', '')
+
+
 @feeds_bp.route('/list', methods=['GET'], endpoint='list_feeds')
 @ErrorHandler.handle_exceptions
 @jwt_required()
+@reads_from_replica
 def list_feeds_endpoint():
     """
     List the private feeds of the current user, with pagination and sorting by update/creation date.
@@ -58,80 +126,188 @@ def list_feeds_endpoint():
     Args:
         page (int): The page number for pagination.
         per_page (int): The number of items per page for pagination.
+        cursor (str): Opaque keyset cursor, empty for the first page. Replaces page when provided.
+        count (str): "exact" to include the total in cursor mode, "none" by default.
 
     Returns:
         JSON: The serialized paginated private feeds.
+        304: If the client's cached page (If-None-Match) is still current.
     """
-    current_user_id = get_jwt_identity()
+    current_user_id = current_user.id
+
+    # Answer 304 from the fingerprint of the user's feeds, before loading the page
+    fingerprint = PaginationService.get_feeds_fingerprint(user_id=current_user_id)
+    etag = ConditionalRequest.make_etag('list', current_user_id, sorted(request.args.items(multi=True)), *fingerprint)
+    if ConditionalRequest.is_not_modified(etag):
+        return ConditionalRequest.not_modified_response(etag, private=True)
 
     # Get pagination params (default 1st page, 10 items per page)
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
 
+    # Get keyset pagination params (cursor mode is used when a cursor is present, even empty)
+    cursor = request.args.get('cursor')
+    count = request.args.get('count', 'none')
+
     # Initialize the pagination service
-    pagination_service = PaginationService(page=page, per_page=per_page)
+    pagination_service = PaginationService(page=page, per_page=per_page, cursor=cursor, count=count)
 
     # Get paginated and serialized private feeds
     paginated_feeds = pagination_service.get_paginated_feeds(user_id=current_user_id)
 
     # Return the serialized paginated feeds
-    return jsonify(paginated_feeds), 200
+    response = ConditionalRequest.set_validators(jsonify(paginated_feeds), etag, private=True)
+    return response, 200
 
 
 
 @feeds_bp.route('/list-public', methods=['GET'], endpoint='list_public_feeds')
 @ErrorHandler.handle_exceptions
+@reads_from_replica
 def list_public_feeds_endpoint():
 
     """
-    List public feeds with optional topic filter, with pagination and sorting by update/creation date.
+    List public feeds with optional topic and name filters, with pagination and sorting by update/creation date.
 
     Args:
         page (int): The page number for pagination.
         per_page (int): The number of items per page for pagination.
+        cursor (str): Opaque keyset cursor, empty for the first page. Replaces page when provided.
+        count (str): "exact" to include the total in cursor mode, "none" by default.
         topic_filter (str): The topic filter to apply to the feeds.
+        name_filter (str): The feed name filter to apply to the feeds.
 
     Returns:
         JSON: The serialized paginated
+        304: If the client's cached page (If-None-Match) is still current.
 
     """
+    # Serve the page from the response cache without touching the database
+    cache = app.extensions.get('public_feeds_cache')
+    cache_key = cache.make_key(request.args) if cache is not None and cache.enabled else None
+    cached = cache.get(cache_key) if cache_key is not None else None
+    if cached is not None:
+        body, etag = cached
+        if ConditionalRequest.is_not_modified(etag):
+            return ConditionalRequest.not_modified_response(etag)
+        return ConditionalRequest.set_validators(app.response_class(body, mimetype='application/json'), etag), 200
+
+    # Invalidations from here on mean the page read below may be stale, and must not be cached
+    cache_generation = cache.generation() if cache_key is not None else None
+
+    # Right after a write the replicas may still show the old feeds, fill the cache from the primary
+    if cache_key is not None and cache.invalidated_within(app.config.get('READ_YOUR_WRITES_WINDOW', 5)):
+        g.read_from_replica = False
+
+    # Answer 304 from the fingerprint of the public feeds, before loading the page
+    fingerprint = PaginationService.get_feeds_fingerprint(is_public=True)
+    etag = ConditionalRequest.make_etag('list-public', sorted(request.args.items(multi=True)), *fingerprint)
+    if ConditionalRequest.is_not_modified(etag):
+        return ConditionalRequest.not_modified_response(etag)
+
     # Get pagination params (default 1st page, 10 items per page)
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     topic_filter = request.args.get('topic', None)
+    name_filter = request.args.get('name', None)
+
+    # Get keyset pagination params (cursor mode is used when a cursor is present, even empty)
+    cursor = request.args.get('cursor')
+    count = request.args.get('count', 'none')
 
     # Initialize the pagination service
-    pagination_service = PaginationService(page=page, per_page=per_page)
+    pagination_service = PaginationService(page=page, per_page=per_page, cursor=cursor, count=count)
 
-    # Get paginated and serialized public feeds, optionally filtered by topic
-    paginated_feeds = pagination_service.get_paginated_feeds(is_public=True, topic_filter=topic_filter)
+    # Get paginated and serialized public feeds, optionally filtered by topic and name
+    paginated_feeds = pagination_service.get_paginated_feeds(is_public=True, topic_filter=topic_filter, name_filter=name_filter)
+
+    response = ConditionalRequest.set_validators(jsonify(paginated_feeds), etag)
+
+    # Cache the page, tagged with its feeds. Keyset pages after the first one without the exact
+    # total only change when one of their feeds changes, new and updated feeds go to the top
+    if cache_key is not None:
+        cache.set(
+            cache_key, response.get_data(), etag, pagination_service.feed_ids,
+            topic_filter=topic_filter, name_filter=name_filter,
+            whole_listing=not cursor or count == 'exact', generation=cache_generation
+        )
 
     # Return the serialized paginated feeds
-    return jsonify(paginated_feeds), 200
+    return response, 200
 
 
 @feeds_bp.route('/details/<int:feed_id>', methods=['GET'], endpoint='feed_details')
 @ErrorHandler.handle_exceptions
+@reads_from_replica
 def feed_details_endpoint(feed_id):
 
     """
     Get details of a specific feed, including its topics and resources (paginated).
 
+    The details are streamed as newline-delimited JSON when the client sends
+    "Accept: application/x-ndjson" or the format=ndjson query parameter.
+
     Args:
         feed_id (int): The ID of the feed to get details for.
+        resources_per_topic (int): The number of most recent resources per topic (20 by default).
 
     Returns:
         JSON: The serialized feed details.
+        NDJSON: The feed details line, one line per resource and an end line, in streaming mode.
+        304: If the client's cached details (If-None-Match / If-Modified-Since) are still current.
 
     """
+    resources_per_topic = request.args.get('resources_per_topic', 20, type=int)
+    if resources_per_topic < 1:
+        raise ValueError("resources_per_topic must be a positive integer.")
+
+    # Answer 304 from the last update of the feed, before loading its topics and resources
+    stream = _wants_ndjson()
+    last_modified = PaginationService.get_feed_last_modified(feed_id)
+    etag = ConditionalRequest.make_etag('details', feed_id, resources_per_topic, stream, last_modified)
+    if ConditionalRequest.is_not_modified(etag, last_modified):
+        return ConditionalRequest.not_modified_response(etag, last_modified, private=True)
+
     # Initialize the pagination service
     pagination_service = PaginationService()
 
+    # Stream the resources when asked, memory stays flat whatever the number of resources
+    if stream:
+        chunks = pagination_service.stream_feed_details(
+            feed_id, resources_per_topic, batch_size=app.config.get('FEED_DETAILS_STREAM_BATCH_SIZE', 500)
+        )
+        response = Response(stream_with_context(chunks), mimetype='application/x-ndjson')
+        response.vary.add('Accept')
+        return ConditionalRequest.set_validators(response, etag, last_modified, private=True)
+
+    # The JSON response is built in memory, so its size is capped
+    max_resources_per_topic = app.config.get('FEED_DETAILS_MAX_RESOURCES_PER_TOPIC', 100)
+    if resources_per_topic > max_resources_per_topic:
+        raise ValueError(
+            f"resources_per_topic must be at most {max_resources_per_topic}, "
+            "use the NDJSON stream (Accept: application/x-ndjson) for more."
+        )
+
     # Get the serialized feed details, including topics and resources
-    feed_details = pagination_service.get_feed_details(feed_id)
+    feed_details = pagination_service.get_feed_details(feed_id, resources_per_topic)
 
     # Return the serialized feed details
-    return jsonify(feed_details), 200
+    response = jsonify(feed_details)
+    response.vary.add('Accept')
+    return ConditionalRequest.set_validators(response, etag, last_modified, private=True), 200
+
+
+def _wants_ndjson() -> bool:
+    """
+    Check if the client asked for the feed details as a newline-delimited JSON stream.
+
+    Returns:
+        bool: True for the format=ndjson query parameter, or when NDJSON is preferred over JSON.
+    """
+    if request.args.get('format') == 'ndjson':
+        return True
+
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
 
 
 @feeds_bp.route('/<int:feed_id>', methods=['PUT'], endpoint='update_feed')
@@ -212,3 +388,38 @@ async def test_azure_func_endpoint():
     # Return the response
     return jsonify(response), 200
 
+
+
+@feeds_bp.route('/azure-func-stats', methods=['GET'], endpoint='azure_func_stats')
+@ErrorHandler.handle_exceptions
+@jwt_required()
+def azure_func_stats_endpoint():
+    """
+    Get the counters of the Azure Function topic cache and request coalescing.
+
+    Returns:
+        JSON: The cache hits, upstream misses, coalesced waits and cache size.
+    """
+    response = {
+        'single_flight': app.extensions['azure_single_flight'].stats(),
+        'topic_cache': app.extensions['azure_topic_cache'].stats()
+    }
+
+    return jsonify(response), 200
+
+
+@feeds_bp.route('/cache-stats', methods=['GET'], endpoint='cache_stats')
+@ErrorHandler.handle_exceptions
+@jwt_required()
+def cache_stats_endpoint():
+    """
+    Get the hit, miss and invalidation counters of the public feed listings response cache.
+
+    Returns:
+        JSON: The counters and size of the cache.
+    """
+    cache = app.extensions.get('public_feeds_cache')
+
+    return jsonify({
+        'public_feeds_cache': cache.stats() if cache is not None else None
+    }), 200
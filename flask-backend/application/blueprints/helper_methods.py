@@ -3,7 +3,9 @@
 # Import the necessary libraries
 from flask import make_response, request, jsonify, current_app as app
 from werkzeug.exceptions import HTTPException
-from flask_jwt_extended.exceptions import NoAuthorizationError
+from flask_jwt_extended.exceptions import NoAuthorizationError, UserLookupError
+from datetime import datetime, timezone
+import hashlib
 import httpx
 
 
@@ -27,6 +29,23 @@ class ErrorHandler:
         response = jsonify({'error': message})
         response.status_code = status_code
         return make_response(response, status_code)
+
+
+    @staticmethod
+    def make_busy_response(message, retry_after=1):
+        """
+        Create a 503 error response asking the client to retry later.
+
+        Args:
+            message (str): The error message to include in the response.
+            retry_after (int, optional): Seconds after which the client may retry. Defaults to 1.
+
+        Returns:
+            Response: A Flask response object with the error message and a Retry-After header.
+        """
+        response = ErrorHandler.make_error_response(message, 503)
+        response.headers['Retry-After'] = str(retry_after)
+        return response
     
     @staticmethod
     def handle_general_exception(e):
@@ -99,6 +118,9 @@ class ErrorHandler:
             except NoAuthorizationError as e:
                 app.logger.error('NoAuthorizationError: %s Authorization required. Please log in first.' , e)
                 return ErrorHandler.make_error_response(str('Authorization required. Please log in first.'), 401)
+            except UserLookupError as e:
+                app.logger.error('UserLookupError: %s', e)
+                return ErrorHandler.make_error_response('The user of the token no longer exists. Please log in again.', 401)
             except Exception as e:
                 app.logger.error('An error occurred: %s', e, exc_info=True)
                 return ErrorHandler.make_error_response(str(e), 500)
@@ -123,6 +145,95 @@ class ErrorHandler:
         except Exception as e:
             return make_response("Invalid or broken JSON request", 400)
 
+class ConditionalRequest:
+    """
+    A class to answer conditional GET requests (If-None-Match / If-Modified-Since) with 304
+    before the response body is built.
+
+    The validators are computed from a cheap fingerprint of the data behind the response,
+    so a 304 costs one small query instead of loading and serializing the response.
+    """
+
+    @staticmethod
+    def make_etag(*parts) -> str:
+        """
+        Build a strong ETag from the parts that identify a representation.
+
+        Args:
+            *parts: The endpoint, the query arguments, the fingerprint of the data, ...
+
+        Returns:
+            str: The ETag value, without quotes.
+        """
+        return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+
+    @staticmethod
+    def is_not_modified(etag: str, last_modified: datetime = None) -> bool:
+        """
+        Check if the client's cached representation is still current.
+
+        If-None-Match takes precedence, If-Modified-Since is only checked when it is absent.
+
+        Args:
+            etag (str): The current ETag of the representation.
+            last_modified (datetime, optional): The naive UTC date of the last change of the data.
+
+        Returns:
+            bool: True if the request can be answered with 304.
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+
+        if last_modified is not None and request.if_modified_since is not None:
+            # HTTP dates have a resolution of one second
+            last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+            return request.if_modified_since >= last_modified
+
+        return False
+
+
+    @staticmethod
+    def not_modified_response(etag: str, last_modified: datetime = None, private: bool = False):
+        """
+        Create an empty 304 response with the validators of the representation.
+
+        Returns:
+            Response: A Flask response object with a 304 status code.
+        """
+        response = make_response('', 304)
+        ConditionalRequest.set_validators(response, etag, last_modified, private)
+        return response
+
+
+    @staticmethod
+    def set_validators(response, etag: str, last_modified: datetime = None, private: bool = False):
+        """
+        Add the ETag, Last-Modified and Cache-Control headers to a response.
+
+        The responses must be revalidated on every use (no-cache), and the ones that depend
+        on the logged-in user are not stored by shared caches (private).
+
+        Args:
+            response (Response): The response to update.
+            etag (str): The ETag of the representation.
+            last_modified (datetime, optional): The naive UTC date of the last change of the data.
+            private (bool, optional): Whether the response depends on the logged-in user.
+
+        Returns:
+            Response: The updated response.
+        """
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+        response.cache_control.no_cache = True
+        if private:
+            response.cache_control.private = True
+            response.vary.add('Cookie')
+
+        return response
+
 
 # Custom errors for the application
 
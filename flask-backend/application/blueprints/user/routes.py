@@ -3,7 +3,7 @@ from flask import Blueprint, request
 
 # Import the required libraries
 from application.blueprints.helper_methods import ErrorHandler
-from application.services import UserService
+from application.services import UserService, PasswordHasherBusy
 
 
 
@@ -27,7 +27,10 @@ def register_user_endpoint():
     # Create a new user service object
     user_service = UserService(payload)
 
-    # Register the user
-    response = user_service.register_user()
+    # Register the user, the password hashing pool may be saturated by a burst of logins
+    try:
+        response = user_service.register_user()
+    except PasswordHasherBusy as e:
+        return ErrorHandler.make_busy_response(str(e))
 
     return response
@@ -0,0 +1,78 @@
+# Description: This file contains the maintenance commands of the application, run with the flask CLI.
+
+# Import the necessary modules
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from database import db, sync_sqlite_replicas, SyntheticDataSeeder
+from application.services.feeds_service import FeedSummaryService
+
+
+# Group of the feed maintenance commands: flask feeds <command>
+feeds_cli = AppGroup('feeds', help='Feed maintenance commands.')
+
+
+@feeds_cli.command('rebuild-summaries')
+@click.option('--batch-size', default=FeedSummaryService.BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Number of feeds rebuilt and committed at a time.')
+def rebuild_summaries_command(batch_size):
+    """
+    Backfill or rebuild the feed listing summaries (feed_summaries read model) from the
+    feeds, users and topics tables.
+    """
+    written = FeedSummaryService.rebuild(batch_size)
+    click.echo(f"Rebuilt {written} feed summaries.")
+
+
+
+# Group of the read replica commands: flask replica <command>
+replica_cli = AppGroup('replica', help='Read replica commands.')
+
+
+@replica_cli.command('sync')
+def sync_replica_command():
+    """
+    Copy the primary database into the SQLite replicas of DATABASE_REPLICA_URLS, a stand-in
+    for replication when developing locally. Server replicas are left to the database.
+    """
+    written = sync_sqlite_replicas(db.engine, current_app.extensions.get('database_replicas', []))
+    if not written:
+        click.echo("No SQLite replica is configured (DATABASE_REPLICA_URLS).")
+        return
+
+    for path in written:
+        click.echo(f"Copied the primary database to {path}.")
+
+
+
+@click.command('seed-bench')
+@click.option('--users', default=1000, show_default=True, type=click.IntRange(min=1), help='Number of users.')
+@click.option('--feeds', default=10000, show_default=True, type=click.IntRange(min=0), help='Total number of feeds, spread over the users.')
+@click.option('--topics-per-feed', default=5, show_default=True, type=click.IntRange(min=0), help='Distinct topics of each feed.')
+@click.option('--resources-per-topic', default=10, show_default=True, type=click.IntRange(min=0), help='Resources of each topic.')
+@click.option('--seed', default=42, show_default=True, type=int, help='Seed of the random generator, the same seed gives the same dataset.')
+@click.option('--chunk-size', default=SyntheticDataSeeder.CHUNK_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Rows inserted per statement and committed at a time.')
+@with_appcontext
+def seed_bench_command(users, feeds, topics_per_feed, resources_per_topic, seed, chunk_size):
+    """
+    Fill the database with a large synthetic dataset for the performance benchmarks
+    (users, feeds, topics, resources and their listing summaries). Run it on a new database.
+    """
+    total = feeds * (1 + topics_per_feed * (1 + resources_per_topic))
+
+    def report_progress(counts):
+        inserted = counts['feeds'] + counts['topics'] + counts['resources']
+        click.echo(f"  {inserted:,} / {total:,} rows ({counts['feeds']:,} feeds)")
+
+    seeder = SyntheticDataSeeder(current_app._get_current_object(), seed=seed, chunk_size=chunk_size, progress_callback=report_progress)
+    try:
+        counts = seeder.seed_dataset(users, feeds, topics_per_feed, resources_per_topic)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    rows = counts['users'] + counts['feeds'] + counts['topics'] + counts['resources']
+    click.echo(
+        f"Inserted {counts['users']:,} users, {counts['feeds']:,} feeds, {counts['topics']:,} topics and "
+        f"{counts['resources']:,} resources in {counts['seconds']:.1f} s ({rows / max(counts['seconds'], 0.001):,.0f} rows/s)."
+    )
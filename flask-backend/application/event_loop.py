@@ -0,0 +1,242 @@
+# Description:
+"""
+    This file contains the EventLoopThread class which runs the async views and the async
+        services of the application on one long-lived event loop, instead of a new event
+        loop per request.
+"""
+
+# Import the necessary modules
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import functools
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopThread:
+    """
+    A Flask extension that owns an event loop running in a background thread for the life of the process.
+
+    By default Flask runs each async view with asgiref's async_to_sync, which sets up a new event
+    loop for every request, so nothing bound to a loop (an httpx.AsyncClient and its connection
+    pool, asyncio primitives, in-flight tasks) can be shared between requests. With this extension
+    the async views are submitted to the persistent loop and the request thread waits for their
+    result. Async resources created on the loop can then be reused by every request.
+
+    Each coroutine runs in a copy of the context of the thread that submitted it (contextvars),
+    so the request and app contexts of Flask are available in the async views as usual.
+
+    Blocking work (database queries, ...) must not run on the loop itself, the async code sends it
+    to threads with asyncio.to_thread as before.
+
+    The thread is started on first use rather than in create_app, so each forked worker process
+    starts its own loop and CLI commands never start it. With ASYNC_EVENT_LOOP_ENABLED set to false,
+    the async views run with Flask's default async_to_sync.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.loop = None
+
+        self._thread = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Read the configuration, run the async views of the app on the loop and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        self.enabled = app.config.get('ASYNC_EVENT_LOOP_ENABLED', True)
+
+        # Flask calls app.async_to_sync to run each async view, see Flask.ensure_sync
+        if self.enabled:
+            app.async_to_sync = self.async_to_sync
+
+        app.extensions['event_loop'] = self
+
+        # Stop the loop when the process exits
+        atexit.register(self.shutdown)
+
+
+    def async_to_sync(self, func):
+        """
+        Wrap a coroutine function so that calling it runs the coroutine on the loop and returns its result.
+
+        Args:
+            func (function): The coroutine function (an async view).
+
+        Returns:
+            function: A blocking function with the same arguments.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func(*args, **kwargs))
+        return wrapper
+
+
+    def run(self, coro, timeout: float = None):
+        """
+        Run a coroutine on the loop in a copy of the current context, and wait for its result.
+
+        Args:
+            coro (coroutine): The coroutine to run.
+            timeout (float, optional): Seconds to wait for the result. Defaults to no limit.
+
+        Returns:
+            Any: The result of the coroutine.
+
+        Raises:
+            RuntimeError: If called from the loop thread itself, which would block the loop.
+            Exception: Any exception raised by the coroutine.
+        """
+        if self.is_current():
+            coro.close()
+            raise RuntimeError("EventLoopThread.run cannot be called from the event loop thread, await the coroutine instead.")
+
+        return self.submit(coro).result(timeout)
+
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop in a copy of the current context, without waiting for it.
+
+        Args:
+            coro (coroutine): The coroutine to run.
+
+        Returns:
+            concurrent.futures.Future: The future of the result of the coroutine.
+        """
+        loop = self._start()
+        context = contextvars.copy_context()
+        future = concurrent.futures.Future()
+
+        def schedule():
+            if not future.set_running_or_notify_cancel():
+                coro.close()
+                return
+
+            # A task runs in a copy of the context current when it is created
+            task = context.run(loop.create_task, coro)
+            task.add_done_callback(functools.partial(self._copy_result, future))
+
+        loop.call_soon_threadsafe(schedule)
+        return future
+
+
+    def is_current(self) -> bool:
+        """
+        Check if the caller runs on the loop of the extension.
+
+        Returns:
+            bool: True inside a coroutine or callback of the loop.
+        """
+        try:
+            return self.loop is not None and asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+
+    def call_soon(self, coro, timeout: float = 5):
+        """
+        Run a coroutine on the loop if it is running, for clean-ups such as closing async clients.
+
+        Args:
+            coro (coroutine): The coroutine to run.
+            timeout (float, optional): Seconds to wait for the result. Defaults to 5.
+
+        Returns:
+            Any: The result of the coroutine, or None if the loop is not running.
+        """
+        loop = self.loop
+        if loop is None or not loop.is_running() or self.is_current():
+            coro.close()
+            return None
+
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """
+        Cancel the pending tasks, stop the loop and wait for its thread.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread. Defaults to 5.
+        """
+        with self._lock:
+            loop, thread = self.loop, self._thread
+            self.loop, self._thread = None, None
+
+        if loop is None:
+            return
+
+        async def cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+        except Exception as e:
+            logger.warning("The pending tasks of the event loop could not be cancelled: %s", e)
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """
+        Private method that starts the loop thread on first use, and returns the loop.
+        """
+        if self.loop is not None:
+            return self.loop
+
+        with self._lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(target=self._run_loop, args=(loop, ready), name='event-loop', daemon=True)
+                thread.start()
+                ready.wait()
+                self.loop, self._thread = loop, thread
+
+        return self.loop
+
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        """
+        Private method that runs the loop in its thread until it is stopped.
+        """
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+
+    @staticmethod
+    def _copy_result(future: concurrent.futures.Future, task: asyncio.Task) -> None:
+        """
+        Private method that copies the outcome of a task to the future of its caller.
+        """
+        if task.cancelled():
+            future.set_exception(concurrent.futures.CancelledError())
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
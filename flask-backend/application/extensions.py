@@ -3,6 +3,11 @@
 # Import the required modules
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
+from application.event_loop import EventLoopThread
+from application.services.auth_service import PasswordHasher, CurrentUserCache, LastLoginWriter
+from application.services.azure_function_service import AzureFunctionClient, TopicCache, TopicSingleFlight
+from application.services.feed_jobs_service import FeedJobQueue
+from application.services.feeds_service import PublicFeedsCache
 
 
 # Initialize the extensions
@@ -11,4 +16,31 @@ from flask_migrate import Migrate
 jwt = JWTManager()
 
 # Migrate is used to manage the database migrations.
-migrate = Migrate()
\ No newline at end of file
+migrate = Migrate()
+
+# PasswordHasher hashes and verifies the passwords with bcrypt in a bounded pool of processes.
+password_hasher = PasswordHasher()
+
+# CurrentUserCache resolves the user of the JWT token of each request from an in-process cache.
+current_user_cache = CurrentUserCache()
+
+# LastLoginWriter buffers the last login times of the users and writes them in batches.
+last_login_writer = LastLoginWriter()
+
+# EventLoopThread runs the async views and services on one long-lived event loop.
+event_loop = EventLoopThread()
+
+# AzureFunctionClient is the shared, pooled HTTP client used to call the Azure Function.
+azure_function_client = AzureFunctionClient()
+
+# TopicCache keeps the Azure Function data of each topic to avoid fetching repeated topics.
+azure_topic_cache = TopicCache()
+
+# TopicSingleFlight coalesces concurrent Azure Function requests for the same topics.
+azure_single_flight = TopicSingleFlight()
+
+# FeedJobQueue runs the feed creation requests as background jobs when the client opts in.
+feed_jobs = FeedJobQueue()
+
+# PublicFeedsCache keeps the public feed listing pages, invalidated by tags on feed writes.
+public_feeds_cache = PublicFeedsCache()
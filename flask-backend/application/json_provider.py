@@ -0,0 +1,170 @@
+# Description: This file contains the JSON provider used by jsonify and every JSON response of the application.
+
+# Import the necessary modules
+import dataclasses
+import decimal
+import json
+import logging
+import uuid
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional, the standard library serializer is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    A JSON provider that serializes with orjson when it is installed, and with the standard
+    library json module otherwise.
+
+    Both serializers produce the same documents:
+
+    - Datetimes and dates are written as ISO-8601 strings ("2024-09-01T10:30:00.123456")
+      instead of the RFC 822 dates of the default provider.
+    - Non-ASCII characters are written as UTF-8 instead of \\u escapes.
+    - Keys are sorted and the output is indented in debug mode, like the default provider.
+
+    The serializer is chosen with the JSON_SERIALIZER setting: "auto" (orjson if installed),
+    "orjson" or "stdlib".
+    """
+
+    # Write UTF-8 like orjson does, so both serializers return the same bytes
+    ensure_ascii = False
+
+    def __init__(self, app):
+        super().__init__(app)
+
+        serializer = app.config.get('JSON_SERIALIZER', 'auto')
+        if serializer not in ('auto', 'orjson', 'stdlib'):
+            raise ValueError("Invalid JSON_SERIALIZER, it must be 'auto', 'orjson' or 'stdlib'.")
+
+        if serializer == 'orjson' and orjson is None:
+            logger.warning("JSON_SERIALIZER is 'orjson' but the 'orjson' package is not installed, falling back to the standard library.")
+
+        self.use_orjson = orjson is not None and serializer != 'stdlib'
+
+
+    @property
+    def serializer(self) -> str:
+        """
+        Get the name of the serializer in use.
+
+        Returns:
+            str: "orjson" or "stdlib".
+        """
+        return 'orjson' if self.use_orjson else 'stdlib'
+
+
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize data as a JSON string.
+
+        Args:
+            obj (Any): The data to serialize.
+            **kwargs: Options of json.dumps. orjson only supports indent and sort_keys, other
+                options fall back to the standard library.
+
+        Returns:
+            str: The JSON document.
+        """
+        return self.dumps_bytes(obj, **kwargs).decode()
+
+
+    def dumps_bytes(self, obj, **kwargs) -> bytes:
+        """
+        Serialize data as UTF-8 encoded JSON, without decoding the orjson output to a string.
+
+        Args:
+            obj (Any): The data to serialize.
+            **kwargs: Options of json.dumps.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        indent = kwargs.pop('indent', None)
+        sort_keys = kwargs.pop('sort_keys', self.sort_keys)
+        kwargs.pop('separators', None)
+
+        if self.use_orjson and not kwargs:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+
+            try:
+                return orjson.dumps(obj, default=self.default, option=option)
+            except orjson.JSONEncodeError:
+                # Values orjson rejects (e.g. integers over 64 bits) are left to the standard library
+                pass
+
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        separators = (',', ': ') if indent else (',', ':')
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys, separators=separators, **kwargs).encode()
+
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize data from a JSON string or bytes.
+
+        Args:
+            s (str | bytes): The JSON document.
+            **kwargs: Options of json.loads, which fall back to the standard library.
+
+        Returns:
+            Any: The deserialized data.
+        """
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+
+        return json.loads(s, **kwargs)
+
+
+    def response(self, *args, **kwargs):
+        """
+        Serialize the given arguments as JSON and return a response with the application/json mimetype.
+
+        Same as the default provider, but the serialized bytes are given to the response as they are.
+
+        Returns:
+            Response: The JSON response.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        body = self.dumps_bytes(obj, indent=2 if indent else None)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+    @staticmethod
+    def default(obj):
+        """
+        Serialize the values the serializers don't support natively.
+
+        Args:
+            obj (Any): The value to serialize.
+
+        Returns:
+            Any: A value the serializers support.
+
+        Raises:
+            TypeError: If the value is not serializable.
+        """
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+            return str(obj)
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        if hasattr(obj, '__html__'):
+            return str(obj.__html__())
+
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
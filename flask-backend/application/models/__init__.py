@@ -1,2 +1,2 @@
 from .user_models import User
-from .feeds_models import Feed, Resource, Topic
\ No newline at end of file
+from .feeds_models import Feed, FeedSummary, Resource, Topic
\ No newline at end of file
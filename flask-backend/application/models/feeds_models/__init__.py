@@ -1,3 +1,4 @@
 from .feed import Feed
+from .feed_summary import FeedSummary
 from .resource import Resource
 from .topic import Topic
\ No newline at end of file
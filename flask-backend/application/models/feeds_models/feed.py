@@ -20,6 +20,17 @@ class Feed(db.Model):
 
     __tablename__ = 'feeds'
 
+    """
+        Composite indexes matching the listing access paths:
+        public feeds ordered by update date, and the feeds of a user ordered by update date.
+        The id column is included so the keyset pagination tiebreaker is also served by the index.
+    """
+
+    __table_args__ = (
+        db.Index('ix_feeds_is_public_updated_at', 'is_public', 'updated_at', 'id'),
+        db.Index('ix_feeds_user_id_updated_at', 'user_id', 'updated_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     name = db.Column(db.String(255), nullable=False)
@@ -27,8 +38,11 @@ class Feed(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationship to Topics and Resources
-    topics = db.relationship('Topic', back_populates='feed', lazy=True, cascade="all, delete-orphan")
+    # Relationship to Topics and Resources, in insertion order like the listing summaries
+    topics = db.relationship('Topic', back_populates='feed', lazy=True, cascade="all, delete-orphan", order_by='Topic.id')
+
+    # Relationship to the listing summary (read model), deleted with the feed
+    summary = db.relationship('FeedSummary', lazy=True, uselist=False, cascade="all, delete-orphan")
 
 
     # Method to serialize the object data
@@ -0,0 +1,42 @@
+# Desc: Feed summary model for the application
+
+# Import the database object (db) from the application module
+from database import db
+
+
+class FeedSummary(db.Model):
+    """
+    Description: This class represents the feed_summaries table in the database.
+
+    It is a read model of the feed listings: one row per feed with the columns a listing
+    returns, including the username of the creator and the ordered topic names, so the
+    listings are read from this table alone instead of joining feeds, users and topics.
+    The rows are written in the same transaction as the feed and its topics.
+
+    Attributes:
+        feed_id (int): The ID of the summarized feed.
+        user_id (int): The user ID of the feed owner.
+        name (str): The name of the feed.
+        is_public (bool): A flag indicating if the feed is public or private.
+        creator (str): The username of the feed owner.
+        topics (list): The names of the topics of the feed, in insertion order.
+        created_at (DateTime): The date and time the feed was created.
+        updated_at (DateTime): The date and time the feed was last updated.
+    """
+
+    __tablename__ = 'feed_summaries'
+
+    # Same access paths as the feeds table: public feeds and the feeds of a user, by update date
+    __table_args__ = (
+        db.Index('ix_feed_summaries_is_public_updated_at', 'is_public', 'updated_at', 'feed_id'),
+        db.Index('ix_feed_summaries_user_id_updated_at', 'user_id', 'updated_at', 'feed_id'),
+    )
+
+    feed_id = db.Column(db.Integer, db.ForeignKey('feeds.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(255), nullable=False)
+    is_public = db.Column(db.Boolean, nullable=False)
+    creator = db.Column(db.String(50), nullable=False)
+    topics = db.Column(db.JSON, nullable=False, default=list)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
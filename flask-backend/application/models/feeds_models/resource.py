@@ -20,6 +20,9 @@ class Resource(db.Model):
 
     __tablename__ = 'resources'
 
+    # Composite index for the most recent resources of a topic (feed details)
+    __table_args__ = (db.Index('ix_resources_topic_id_date', 'topic_id', 'date'),)
+
     id = db.Column(db.Integer, primary_key=True)
     topic_id = db.Column(db.Integer, db.ForeignKey('topics.id'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
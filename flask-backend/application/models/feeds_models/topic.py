@@ -30,7 +30,12 @@ class Topic(db.Model):
         the same topic name to be used across different feeds.
     """
 
-    __table_args__ = (db.UniqueConstraint('feed_id', 'name', name='unique_topic_per_feed'),)
+    __table_args__ = (
+        db.UniqueConstraint('feed_id', 'name', name='unique_topic_per_feed'),
+        # The unique constraint above already indexes feed_id as its leading column,
+        # this index serves the lookups of topics by name across feeds
+        db.Index('ix_topics_name', 'name'),
+    )
 
 
     # Relationship to Resources
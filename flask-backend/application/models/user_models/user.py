@@ -3,7 +3,7 @@
 # Import the required modules
 from database import db
 from flask_login import UserMixin
-from flask_bcrypt import generate_password_hash, check_password_hash
+from flask import current_app
 
 
 
@@ -43,16 +43,18 @@ class User(db.Model, UserMixin):
     def password(self, password: str) -> None:
         """
         Hashes the password and stores it in the password_hash attribute.
+        The hashing runs in the password hashing pool of the application.
         
         Args:
             password (str): The plaintext password to be hashed.
         """
-        self.password_hash = generate_password_hash(password).decode('utf8')
+        self.password_hash = current_app.extensions['password_hasher'].hash(password)
 
 
     def verify_password(self, password: str) -> bool:
         """
         Verifies the provided password against the stored password hash.
+        The verification runs in the password hashing pool of the application.
         
         Args:
             password (str): The plaintext password to verify.
@@ -60,7 +62,17 @@ class User(db.Model, UserMixin):
         Returns:
             bool: True if the password matches the hash, False otherwise.
         """
-        return check_password_hash(self.password_hash, password)
+        return current_app.extensions['password_hasher'].verify(password, self.password_hash)
+
+
+    def needs_rehash(self) -> bool:
+        """
+        Checks if the password hash was made with another work factor than the configured one.
+
+        Returns:
+            bool: True if the password must be hashed again on the next login.
+        """
+        return current_app.extensions['password_hasher'].needs_rehash(self.password_hash)
 
 
     # Serialize the object instance to a JSON formatted object
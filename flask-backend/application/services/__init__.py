@@ -1,5 +1,6 @@
 from .base_validation_service import BaseValidationService
 from .user_service import UserService
-from .auth_service import AuthService
-from .feeds_service import FeedDataHandler, FeedsService, TopicService, ResourcesService, PaginationService
-from .azure_function_service import AzureFunctionService
\ No newline at end of file
+from .auth_service import AuthService, PasswordHasher, PasswordHasherBusy, CurrentUserCache, CurrentUser, LastLoginWriter
+from .feeds_service import FeedDataHandler, FeedsService, TopicService, ResourcesService, PaginationService, BulkFeedWriter, PublicFeedsCache, FeedSummaryService
+from .azure_function_service import AzureFunctionService, AzureFunctionClient, TopicCache, TopicSingleFlight
+from .feed_jobs_service import FeedJobQueue, FeedJobQueueFull
\ No newline at end of file
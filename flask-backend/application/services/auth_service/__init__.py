@@ -1 +1,4 @@
-from .auth_service import AuthService
\ No newline at end of file
+from .auth_service import AuthService
+from .password_hasher import PasswordHasher, PasswordHasherBusy
+from .current_user_cache import CurrentUserCache, CurrentUser
+from .last_login_writer import LastLoginWriter
\ No newline at end of file
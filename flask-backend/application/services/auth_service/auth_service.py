@@ -5,8 +5,7 @@
 # Import the required modules and database
 from database import db
 from application.services import BaseValidationService
-from datetime import datetime
-from flask import make_response
+from flask import current_app, make_response
 from flask_jwt_extended import create_access_token, set_access_cookies, unset_jwt_cookies
 
 
@@ -26,6 +25,7 @@ class AuthService(BaseValidationService):
 
         Raises:
             ValueError: If the username or password is incorrect.
+            PasswordHasherBusy: If too many logins are being processed.
 
         Returns:
             JSON: The response JSON with the JWT token.
@@ -46,9 +46,13 @@ class AuthService(BaseValidationService):
         if not user.verify_password(password):
             raise ValueError('Invalid password.')
 
-        # Update the last login time
-        user.last_login = datetime.utcnow()
-        db.session.commit()
+        # Hash the password again if the work factor changed since it was hashed
+        if user.needs_rehash():
+            user.password = password
+            db.session.commit()
+
+        # Record the last login time, written with the next batch unless LAST_LOGIN_WRITE_MODE is "sync"
+        current_app.extensions['last_login_writer'].record(user)
 
         # Create a JWT token
         access_token = create_access_token(identity=user.id)
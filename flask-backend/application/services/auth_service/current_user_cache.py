@@ -0,0 +1,210 @@
+# Description:
+"""
+    This file contains the CurrentUserCache class which resolves the user of the JWT token
+        of each request (flask_jwt_extended.current_user) from a small in-process cache,
+        so the authorization checks don't query the users table on every request.
+"""
+
+# Import the necessary modules
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from flask import jsonify
+from sqlalchemy import event, select
+from database import db
+from application.models import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    A read-only copy of the user row of the JWT token, safe to share across requests and threads.
+
+    Attributes:
+        id (int): The unique identifier of the user.
+        username (str): The username of the user.
+        last_login (DateTime): The date and time of the user's last login.
+    """
+    id: int
+    username: str
+    last_login: datetime = None
+
+
+class CurrentUserCache:
+    """
+    A Flask extension that registers the user lookup of the JWT manager and caches the users
+    it loads, with a TTL and LRU eviction bounded by CURRENT_USER_CACHE_MAX_ENTRIES.
+
+    Every request with a JWT resolves its user through the cache: the first request of a user
+    loads the row, the next ones within CURRENT_USER_CACHE_TTL seconds cost no query. Tokens of
+    users that no longer exist are rejected with 401.
+
+    The entry of a user is dropped when a transaction that updates or deletes the user commits.
+    Each process has its own cache, so changes committed by other processes are only seen once
+    the entries expire (TTL).
+    """
+
+    def __init__(self, app=None, jwt=None):
+        self.enabled = False
+        self.ttl = 60
+        self.max_entries = 1024
+
+        # user id -> (expires_at, CurrentUser)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters exposed to measure the cache
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        if app is not None and jwt is not None:
+            self.init_app(app, jwt)
+
+
+    def init_app(self, app, jwt) -> None:
+        """
+        Read the cache settings, register the user lookup of the JWT manager and the
+        invalidation of the changed users, and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+            jwt (JWTManager): The JWT manager of the application.
+        """
+        self.enabled = app.config.get('CURRENT_USER_CACHE_ENABLED', True)
+        self.ttl = app.config.get('CURRENT_USER_CACHE_TTL', 60)
+        self.max_entries = app.config.get('CURRENT_USER_CACHE_MAX_ENTRIES', 1024)
+
+        jwt.user_lookup_loader(self._lookup)
+        jwt.user_lookup_error_loader(self._lookup_error)
+
+        # Collect the users written by each flush, and drop them from the cache once committed
+        if not event.contains(db.session, 'after_flush', self._collect_changed_users):
+            event.listen(db.session, 'after_flush', self._collect_changed_users)
+            event.listen(db.session, 'after_commit', self._invalidate_changed_users)
+            event.listen(db.session, 'after_rollback', self._discard_changed_users)
+
+        app.extensions['current_user_cache'] = self
+
+
+    def get(self, user_id: int):
+        """
+        Get a user by ID, from the cache or from the database.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            CurrentUser: The user.
+            None: If the user doesn't exist.
+        """
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[0] > time.time():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+
+        # Always read the primary, a replica may not have a new user yet
+        row = db.session.execute(
+            select(User.id, User.username, User.last_login).where(User.id == user_id),
+            bind_arguments={'bind': db.engine}
+        ).first()
+        if row is None:
+            return None
+
+        user = CurrentUser(id=row.id, username=row.username, last_login=row.last_login)
+        if self.enabled:
+            with self._lock:
+                self._entries[user_id] = (time.time() + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return user
+
+
+    def invalidate(self, *user_ids) -> None:
+        """
+        Drop users from the cache, they are loaded again on their next request.
+
+        Args:
+            *user_ids (int): The IDs of the users.
+        """
+        with self._lock:
+            for user_id in user_ids:
+                if self._entries.pop(user_id, None) is not None:
+                    self.invalidations += 1
+
+
+    def clear(self) -> None:
+        """
+        Remove all the users from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+    def stats(self) -> dict:
+        """
+        Get the counters and the size of the cache.
+
+        Returns:
+            dict: Whether the cache is enabled, its hits, misses, invalidations and entries.
+        """
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries)
+        }
+
+
+    def _lookup(self, jwt_header: dict, jwt_data: dict):
+        """
+        Private method that loads the user of a JWT token, registered as the user lookup of the JWT manager.
+        """
+        return self.get(jwt_data['sub'])
+
+
+    @staticmethod
+    def _lookup_error(jwt_header: dict, jwt_data: dict):
+        """
+        Private method that answers the requests whose token belongs to a user that no longer exists.
+        """
+        return jsonify({
+            'status': 401,
+            'message': 'The user of the token no longer exists'
+        }), 401
+
+
+    @staticmethod
+    def _collect_changed_users(session, flush_context) -> None:
+        """
+        Private method that records the IDs of the users updated or deleted by a flush, until the transaction ends.
+        """
+        for instance in list(session.dirty) + list(session.deleted):
+            if isinstance(instance, User) and instance.id is not None:
+                session.info.setdefault('changed_user_ids', set()).add(instance.id)
+
+
+    def _invalidate_changed_users(self, session) -> None:
+        """
+        Private method that drops the users written by a committed transaction from the cache.
+        """
+        user_ids = session.info.pop('changed_user_ids', None)
+        if user_ids:
+            self.invalidate(*user_ids)
+
+
+    @staticmethod
+    def _discard_changed_users(session) -> None:
+        """
+        Private method that forgets the users written by a rolled back transaction, they didn't change.
+        """
+        session.info.pop('changed_user_ids', None)
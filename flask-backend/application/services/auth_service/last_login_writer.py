@@ -0,0 +1,215 @@
+# Description:
+"""
+    This file contains the LastLoginWriter class which records the last login time of the
+        users, buffering the updates in memory and writing them in batches so the logins
+        don't each wait for a write transaction.
+"""
+
+# Import the necessary modules
+import atexit
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import update
+from database import db
+from application.models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginWriter:
+    """
+    A Flask extension that writes the last_login of the users.
+
+    In "batched" mode (LAST_LOGIN_WRITE_MODE) a login only records the time in memory. A
+    background thread writes the recorded times every LAST_LOGIN_FLUSH_INTERVAL milliseconds,
+    or as soon as LAST_LOGIN_FLUSH_SIZE users are waiting, as a single UPDATE of all of them
+    in one transaction. Several logins of the same user before a flush are written once,
+    with the latest time. The pending times are written when the process exits, and a crash
+    loses at most the times of the last interval.
+
+    In "sync" mode the login writes its last_login in its own transaction, as before.
+
+    The thread is started on first use rather than in create_app, so CLI commands never start it.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.mode = 'batched'
+        self.flush_interval = 0.5
+        self.flush_size = 100
+
+        # user id -> last login time, waiting to be written
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+        # Counters exposed to measure the batching
+        self.recorded = 0
+        self.written = 0
+        self.flushes = 0
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Read the write settings from the app configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+
+        Raises:
+            ValueError: If LAST_LOGIN_WRITE_MODE is not "batched" or "sync".
+        """
+        self.app = app
+        self.mode = app.config.get('LAST_LOGIN_WRITE_MODE', 'batched')
+        if self.mode not in ('batched', 'sync'):
+            raise ValueError("Invalid LAST_LOGIN_WRITE_MODE, it must be 'batched' or 'sync'.")
+
+        self.flush_interval = app.config.get('LAST_LOGIN_FLUSH_INTERVAL', 500) / 1000
+        self.flush_size = app.config.get('LAST_LOGIN_FLUSH_SIZE', 100)
+
+        app.extensions['last_login_writer'] = self
+
+        # Write the pending times when the process exits
+        atexit.register(self.shutdown)
+
+
+    def record(self, user: User, logged_in_at: datetime = None) -> None:
+        """
+        Record the login of a user, written now in sync mode or with the next batch otherwise.
+
+        Args:
+            user (User): The user that logged in.
+            logged_in_at (datetime, optional): The login time. Defaults to now (UTC).
+        """
+        logged_in_at = logged_in_at or datetime.utcnow()
+
+        if self.mode == 'sync':
+            user.last_login = logged_in_at
+            db.session.commit()
+            return
+
+        self._start()
+        with self._lock:
+            previous = self._pending.get(user.id)
+            if previous is None or previous < logged_in_at:
+                self._pending[user.id] = logged_in_at
+            self.recorded += 1
+            full = len(self._pending) >= self.flush_size
+
+        # Write the batch now rather than at the end of the interval
+        if full:
+            self._wake.set()
+
+
+    def flush(self) -> int:
+        """
+        Write the pending last login times in one transaction.
+
+        If the write fails the times are kept for the next flush, unless newer ones were recorded since.
+
+        Returns:
+            int: The number of users written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        with self.app.app_context():
+            try:
+                db.session.execute(
+                    update(User), [{'id': user_id, 'last_login': logged_in_at} for user_id, logged_in_at in pending.items()]
+                )
+                db.session.commit()
+
+            except Exception as e:
+                db.session.rollback()
+                logger.error("The last login times of %s users could not be written: %s", len(pending), e)
+                with self._lock:
+                    for user_id, logged_in_at in pending.items():
+                        self._pending.setdefault(user_id, logged_in_at)
+                return 0
+
+            # The bulk UPDATE bypasses the session events, drop the cached users explicitly
+            current_user_cache = self.app.extensions.get('current_user_cache')
+            if current_user_cache is not None:
+                current_user_cache.invalidate(*pending)
+
+        with self._lock:
+            self.written += len(pending)
+            self.flushes += 1
+
+        return len(pending)
+
+
+    def stats(self) -> dict:
+        """
+        Get the counters of the batching.
+
+        Returns:
+            dict: The mode, the logins recorded, the users written, the flushes and the users waiting.
+        """
+        return {
+            'mode': self.mode,
+            'recorded': self.recorded,
+            'written': self.written,
+            'flushes': self.flushes,
+            'pending': len(self._pending)
+        }
+
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """
+        Stop the background thread and write the pending times.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread. Defaults to 5.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = thread is not None
+
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout)
+
+        self._stopping = False
+        self.flush()
+
+
+    def _start(self) -> None:
+        """
+        Private method that starts the background thread on first use.
+        """
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name='last-login-writer', daemon=True)
+                self._thread.start()
+
+
+    def _work(self) -> None:
+        """
+        Private method that writes the pending times every interval, or when a batch is full, until stopped.
+        """
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("The last login writer failed: %s", e, exc_info=True)
+
+            if self._stopping:
+                return
@@ -0,0 +1,299 @@
+# Description:
+"""
+    This file contains the PasswordHasher class which hashes and verifies the user
+        passwords with bcrypt in a bounded pool of worker processes, so the hashing
+        never runs on the request threads of the application.
+"""
+
+# Import the necessary modules
+import atexit
+import logging
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import bcrypt
+
+
+logger = logging.getLogger(__name__)
+
+
+# Program of the hashing processes: runs the bcrypt functions received on stdin and writes their
+# results on stdout, as length-prefixed pickles. It only imports bcrypt, never the main module
+# of the application, so any script creating the app can use the pool without a __main__ guard
+WORKER_PROGRAM = '''
+import os, pickle, signal, struct, sys
+import bcrypt
+signal.signal(signal.SIGINT, signal.SIG_IGN)
+if int(sys.argv[1]) and hasattr(os, 'nice'):
+    os.nice(int(sys.argv[1]))
+reader, writer = sys.stdin.buffer, sys.stdout.buffer
+while True:
+    header = reader.read(4)
+    if len(header) < 4:
+        break
+    name, args = pickle.loads(reader.read(struct.unpack('!I', header)[0]))
+    try:
+        result = (True, getattr(bcrypt, name)(*args))
+    except Exception as e:
+        result = (False, e)
+    data = pickle.dumps(result)
+    writer.write(struct.pack('!I', len(data)) + data)
+    writer.flush()
+'''
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when too many passwords are waiting to be hashed or verified.
+    """
+
+    pass
+
+
+class PasswordHasher:
+    """
+    A Flask extension that hashes and verifies passwords with bcrypt.
+
+    bcrypt is slow on purpose, and a login or a registration spends tens to hundreds of
+    milliseconds hashing. Running it on the request threads lets a burst of logins take
+    the CPU away from every other request of the worker. The hashing is sent to a pool of
+    PASSWORD_HASH_WORKERS processes instead, so at most that many hashes use the CPU at a
+    time, and the request threads wait for them without holding the GIL. At most
+    PASSWORD_HASH_MAX_PENDING hashes are accepted at a time, the next ones wait up to
+    PASSWORD_HASH_QUEUE_TIMEOUT seconds and are then rejected with PasswordHasherBusy.
+
+    The processes run with PASSWORD_HASH_NICE added to their niceness: under load the request
+    threads get the CPU before the hashes, which a pool of threads in the worker can't do.
+
+    The processes are plain interpreters running WORKER_PROGRAM, started on first use and
+    fed through pipes, rather than a multiprocessing pool: spawned multiprocessing workers
+    import the main module of the parent again, and would create the app in every worker
+    when a script creates it at import time.
+
+    The work factor is PASSWORD_HASH_ROUNDS. Hashes made with another work factor are
+    still verified, and needs_rehash tells the login to hash the password again.
+
+    With PASSWORD_HASH_WORKERS set to 0 the hashing runs inline, on the calling thread.
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = 2
+        self.max_pending = 32
+        self.queue_timeout = 5.0
+        self.nice = 10
+
+        # Idle worker processes, and the number of processes started
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._pending = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Read the hashing settings from the app configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        self.rounds = app.config.get('PASSWORD_HASH_ROUNDS', 12)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 32)
+        self.queue_timeout = app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5.0)
+        self.nice = app.config.get('PASSWORD_HASH_NICE', 10)
+        self._pending = threading.BoundedSemaphore(self.max_pending)
+
+        app.extensions['password_hasher'] = self
+
+        # Stop the worker processes when the process exits
+        atexit.register(self.shutdown)
+
+        # A forked worker process (gunicorn --preload) starts its own pool
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget_workers)
+
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured work factor.
+
+        Args:
+            password (str): The plaintext password.
+
+        Returns:
+            str: The bcrypt hash of the password.
+
+        Raises:
+            PasswordHasherBusy: If too many passwords are waiting to be hashed.
+        """
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run('hashpw', password.encode('utf-8'), salt).decode('utf-8')
+
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Verify a password against a bcrypt hash, whatever its work factor.
+
+        Args:
+            password (str): The plaintext password.
+            password_hash (str): The stored bcrypt hash.
+
+        Returns:
+            bool: True if the password matches the hash, False otherwise.
+
+        Raises:
+            PasswordHasherBusy: If too many passwords are waiting to be verified.
+        """
+        try:
+            return self._run('checkpw', password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            # Not a bcrypt hash
+            return False
+
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Check if a hash was made with another work factor than the configured one.
+
+        Args:
+            password_hash (str): The stored bcrypt hash ("$2b$<rounds>$<salt and hash>").
+
+        Returns:
+            bool: True if the password must be hashed again.
+        """
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+    def shutdown(self) -> None:
+        """
+        Stop the idle worker processes, the busy ones are stopped when they finish their hash.
+        """
+        with self._lock:
+            self._started = 0
+            idle, self._idle = self._idle, queue.LifoQueue()
+
+        while True:
+            try:
+                self._stop_worker(idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+    def _run(self, name: str, *args):
+        """
+        Private method that runs a bcrypt function in a worker process, or inline without workers.
+
+        Args:
+            name (str): The name of the bcrypt function (hashpw or checkpw).
+            *args: The arguments of the function.
+
+        Raises:
+            PasswordHasherBusy: If no slot is freed within the queue timeout.
+        """
+        if not self._pending.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy("Too many passwords are being processed, please try again later.")
+
+        try:
+            if self.workers <= 0:
+                return getattr(bcrypt, name)(*args)
+
+            idle = self._idle
+            worker = self._get_worker(idle)
+            try:
+                succeeded, result = self._call_worker(worker, name, args)
+            except (OSError, EOFError, pickle.UnpicklingError, struct.error):
+                # The worker died (e.g. killed by the OS), a new one is started on a later call
+                logger.warning("A password hashing process stopped, hashing inline.")
+                self._stop_worker(worker)
+                with self._lock:
+                    if idle is self._idle:
+                        self._started -= 1
+                return getattr(bcrypt, name)(*args)
+
+            # Give the worker back, unless the pool was shut down in the meantime
+            if idle is self._idle:
+                idle.put(worker)
+            else:
+                self._stop_worker(worker)
+
+            if not succeeded:
+                raise result
+            return result
+
+        finally:
+            self._pending.release()
+
+
+    def _get_worker(self, idle: queue.LifoQueue) -> subprocess.Popen:
+        """
+        Private method that takes an idle worker process, starting one while under PASSWORD_HASH_WORKERS,
+        or waits for a busy one to finish.
+        """
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            start = self._started < self.workers
+            if start:
+                self._started += 1
+
+        if start:
+            return subprocess.Popen(
+                [sys.executable, '-c', WORKER_PROGRAM, str(self.nice)], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+        return idle.get()
+
+
+    @staticmethod
+    def _call_worker(worker: subprocess.Popen, name: str, args: tuple) -> tuple:
+        """
+        Private method that sends a function call to a worker process and reads its result.
+
+        Returns:
+            tuple: Whether the call succeeded, and its result or exception.
+        """
+        data = pickle.dumps((name, args))
+        worker.stdin.write(struct.pack('!I', len(data)) + data)
+        worker.stdin.flush()
+
+        header = worker.stdout.read(4)
+        if len(header) < 4:
+            raise EOFError("The password hashing process exited.")
+        return pickle.loads(worker.stdout.read(struct.unpack('!I', header)[0]))
+
+
+    @staticmethod
+    def _stop_worker(worker: subprocess.Popen) -> None:
+        """
+        Private method that stops a worker process: it exits once its stdin is closed.
+        """
+        try:
+            worker.stdin.close()
+            worker.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            worker.kill()
+        worker.stdout.close()
+
+
+    def _forget_workers(self) -> None:
+        """
+        Private method that drops the worker processes inherited from the parent process after a fork,
+        they belong to the parent.
+        """
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(self.max_pending)
@@ -1 +1,4 @@
-from .azure_function_service import AzureFunctionService
\ No newline at end of file
+from .azure_function_service import AzureFunctionService
+from .azure_function_client import AzureFunctionClient
+from .topic_cache import TopicCache
+from .single_flight import TopicSingleFlight
\ No newline at end of file
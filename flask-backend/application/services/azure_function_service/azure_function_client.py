@@ -0,0 +1,175 @@
+# Description:
+"""
+    This file contains the AzureFunctionClient class which owns the shared, pooled
+        HTTP client used to communicate with the Azure Function service.
+"""
+
+# Import the necessary modules
+import asyncio
+import atexit
+import importlib.util
+import logging
+import threading
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+class AzureFunctionClient:
+    """
+    A Flask extension that owns a long-lived HTTP client for the Azure Function.
+
+    The client keeps a connection pool with keep-alive to the function host, so requests
+    stop paying the TCP + TLS handshake on every call. It is created with the application
+    (create_app) and closed when the process shuts down.
+
+    An httpx.AsyncClient is bound to the event loop that opened its connections. When the async
+    views run on the persistent loop of the application (EventLoopThread), apost sends the requests
+    through an AsyncClient created on that loop and shared by every request. Anywhere else (Flask's
+    default loop per request) it falls back to the synchronous client, which is thread-safe, through
+    asyncio.to_thread.
+    """
+
+    def __init__(self, app=None):
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+        self.event_loop = None
+        self.settings = {}
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Read the HTTP client settings from the app configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        http2 = app.config.get('AZURE_HTTP2', False)
+
+        # HTTP/2 is optional, it requires the "h2" package (pip install httpx[http2])
+        if http2 and importlib.util.find_spec('h2') is None:
+            logger.warning("AZURE_HTTP2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1.")
+            http2 = False
+
+        self.settings = {
+            'max_connections': app.config.get('AZURE_HTTP_MAX_CONNECTIONS', 20),
+            'max_keepalive_connections': app.config.get('AZURE_HTTP_MAX_KEEPALIVE_CONNECTIONS', 10),
+            'keepalive_expiry': app.config.get('AZURE_HTTP_KEEPALIVE_EXPIRY', 30.0),
+            'connect_timeout': app.config.get('AZURE_HTTP_CONNECT_TIMEOUT', 5.0),
+            'read_timeout': app.config.get('AZURE_HTTP_READ_TIMEOUT', 30.0),
+            'pool_timeout': app.config.get('AZURE_HTTP_POOL_TIMEOUT', 5.0),
+            'http2': http2
+        }
+
+        # The persistent event loop of the async views, if any (initialized before this extension)
+        self.event_loop = app.extensions.get('event_loop')
+
+        app.extensions['azure_function_client'] = self
+
+        # Close the pooled connections when the process exits
+        atexit.register(self.close)
+
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        Get the shared HTTP client, creating it on first use.
+
+        The client is created lazily so that each forked worker process opens its own pool.
+
+        Returns:
+            httpx.Client: The pooled HTTP client.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+
+    def post(self, url: str, json: dict) -> httpx.Response:
+        """
+        Send a POST request with a JSON body through the pooled client.
+
+        Args:
+            url (str): The URL to send the request to.
+            json (dict): The JSON body of the request.
+
+        Returns:
+            httpx.Response: The response from the server.
+        """
+        return self.client.post(url, json=json)
+
+
+    async def apost(self, url: str, json: dict) -> httpx.Response:
+        """
+        Send a POST request with a JSON body from async code.
+
+        On the persistent event loop the request goes through the shared AsyncClient, elsewhere
+        through the pooled sync client in a worker thread.
+
+        Args:
+            url (str): The URL to send the request to.
+            json (dict): The JSON body of the request.
+
+        Returns:
+            httpx.Response: The response from the server.
+        """
+        if self.event_loop is not None and self.event_loop.is_current():
+            if self._async_client is None:
+                self._async_client = self._create_client(httpx.AsyncClient)
+            return await self._async_client.post(url, json=json)
+
+        return await asyncio.to_thread(self.post, url, json)
+
+
+    def close(self) -> None:
+        """
+        Close the pooled clients and release their connections.
+        """
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+            # The async client must be closed on the loop that owns its connections
+            async_client, self._async_client = self._async_client, None
+
+        if async_client is not None and self.event_loop is not None:
+            try:
+                self.event_loop.call_soon(async_client.aclose())
+            except Exception as e:
+                logger.warning("The async Azure Function client could not be closed: %s", e)
+
+
+    def _create_client(self, client_class=httpx.Client):
+        """
+        Private method that builds an httpx client from the extension settings.
+
+        Args:
+            client_class (type, optional): httpx.Client or httpx.AsyncClient. Defaults to httpx.Client.
+
+        Returns:
+            httpx.Client: The configured HTTP client.
+        """
+        settings = self.settings
+
+        limits = httpx.Limits(
+            max_connections=settings.get('max_connections', 20),
+            max_keepalive_connections=settings.get('max_keepalive_connections', 10),
+            keepalive_expiry=settings.get('keepalive_expiry', 30.0)
+        )
+
+        timeout = httpx.Timeout(
+            connect=settings.get('connect_timeout', 5.0),
+            read=settings.get('read_timeout', 30.0),
+            write=settings.get('read_timeout', 30.0),
+            pool=settings.get('pool_timeout', 5.0)
+        )
+
+        return client_class(limits=limits, timeout=timeout, http2=settings.get('http2', False))
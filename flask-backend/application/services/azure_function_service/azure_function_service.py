@@ -5,31 +5,112 @@
 """
 
 # Import the necessary modules
-import httpx
+import asyncio
+from flask import current_app as app
 from httpx import HTTPStatusError
+from application.services.azure_function_service.topic_cache import normalize_topic
+from application.services.azure_function_service.single_flight import UpstreamFetchError
 
 class AzureFunctionService:
     """
     A service class to interact with the Azure Function service asynchronously.
     """
-    def __init__(self, function_url):
+    def __init__(self, function_url, client=None, cache=None, single_flight=None):
         self.function_url = function_url
 
+        # Use the shared pooled client owned by the application unless one is provided
+        self.client = client or app.extensions['azure_function_client']
+
+        # Per-topic cache in front of the Azure Function (None when not registered)
+        self.cache = cache if cache is not None else app.extensions.get('azure_topic_cache')
+
+        # Coalescing of concurrent fetches of the same topics (None when not registered)
+        self.single_flight = single_flight if single_flight is not None else app.extensions.get('azure_single_flight')
+
     async def fetch_data(self, topics: list):
         """
         Sends asynchronous request to the Azure Function with a list of topics.
 
+        Topics found in the topic cache are served from it. Topics already being fetched by
+        another request await that request, and only the remaining ones are sent upstream.
+        The results are merged back in the order of the requested topics.
+
         Args:
             topics (list): The list of topics to fetch.
 
         Returns:
-            dict: The response from the Azure Function.
+            list: The data of each topic, as returned by the Azure Function.
+            dict: An error message if the request failed.
+        """
+        # Split the request into cached and missing topics
+        topics_data = self.cache.get_many(topics) if self._cache_enabled else {}
+        missing_topics = self._missing_topics(topics, topics_data)
+
+        # Lead the topics nobody is fetching and wait on the ones already in flight
+        if self.single_flight is not None:
+            self.single_flight.record_hits(len(topics_data))
+            leading, waiting = self.single_flight.claim(missing_topics)
+        else:
+            leading, waiting = missing_topics, {}
+
+        if leading:
+            try:
+                response = await self._request_topics(list(leading.values()))
+            except BaseException as e:
+                self._fail_leading(leading, {"error": f"An error occurred: {str(e)}"})
+                raise
+
+            # Propagate upstream errors as they are
+            if isinstance(response, dict):
+                self._fail_leading(leading, response)
+                return response
+
+            fetched_data = self._index_response(response)
+            if self._cache_enabled:
+                self.cache.set_many(fetched_data)
+            if self.single_flight is not None:
+                self.single_flight.resolve(leading, fetched_data)
+            topics_data.update(fetched_data)
+
+        # Collect the topics fetched by the other in-flight requests
+        for key, future in waiting.items():
+            try:
+                data = await asyncio.wrap_future(future)
+            except UpstreamFetchError as e:
+                return e.response
+            if data is not None:
+                topics_data[key] = data
+
+        return self._merge_topics_data(topics, topics_data)
+
+
+    @property
+    def _cache_enabled(self) -> bool:
+        return self.cache is not None and self.cache.enabled
+
+
+    def _fail_leading(self, leading: dict, response: dict) -> None:
+        """
+        Private method that propagates an upstream error to the callers waiting on the led topics.
+        """
+        if self.single_flight is not None:
+            self.single_flight.fail(leading, response)
+
+
+    async def _request_topics(self, topics: list):
         """
+        Private method that sends the list of topics to the Azure Function.
+
+        Args:
+            topics (list): The list of topics to fetch.
 
+        Returns:
+            list: The response from the Azure Function.
+            dict: An error message if the request failed.
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                # Send the list of topics as JSON to the Azure Function
-                response = await client.post(self.function_url, json={"topics": topics})
+            # Send the list of topics as JSON to the Azure Function through the pooled client
+            response = await self.client.apost(self.function_url, {"topics": topics})
 
             # Check if the response was successful
             response.raise_for_status()
@@ -49,4 +130,61 @@ class AzureFunctionService:
         except Exception as e:
             # Handle other possible errors
             return {"error": f"An error occurred: {str(e)}"}
-        
+
+
+    @staticmethod
+    def _missing_topics(topics: list, topics_data: dict) -> dict:
+        """
+        Private method that returns the topics without data, without duplicates.
+
+        Args:
+            topics (list): The list of requested topics.
+            topics_data (dict): A mapping of normalized topic keys to their data.
+
+        Returns:
+            dict: A mapping of normalized topic keys to the topics that must be requested upstream.
+        """
+        missing_topics = {}
+        for topic in topics:
+            key = normalize_topic(topic)
+            if key not in topics_data and key not in missing_topics:
+                missing_topics[key] = topic
+        return missing_topics
+
+
+    @staticmethod
+    def _index_response(response: list) -> dict:
+        """
+        Private method that indexes a valid Azure Function response by normalized topic.
+
+        Args:
+            response (list): The response from the Azure Function.
+
+        Returns:
+            dict: A mapping of normalized topic keys to their data.
+        """
+        indexed = {}
+        for entry in response:
+            if not isinstance(entry, dict) or not isinstance(entry.get('data'), dict):
+                continue
+            indexed[normalize_topic(entry.get('topic'))] = entry['data']
+        return indexed
+
+
+    @staticmethod
+    def _merge_topics_data(topics: list, topics_data: dict) -> list:
+        """
+        Private method that builds the Azure Function response shape for the requested topics.
+
+        Args:
+            topics (list): The list of requested topics.
+            topics_data (dict): A mapping of normalized topic keys to their data.
+
+        Returns:
+            list: A list of {"topic", "data"} entries in the order of the requested topics.
+        """
+        return [
+            {"topic": topic, "data": topics_data[normalize_topic(topic)]}
+            for topic in topics
+            if normalize_topic(topic) in topics_data
+        ]
@@ -0,0 +1,155 @@
+# Description:
+"""
+    This file contains the single-flight coordinator used to coalesce concurrent
+        Azure Function requests for the same topics.
+"""
+
+# Import the necessary modules
+import threading
+from concurrent.futures import Future
+
+
+class UpstreamFetchError(Exception):
+    """
+    Raised to the coalesced callers when the upstream request they waited on failed.
+
+    Attributes:
+        response (dict): The error response returned by the leading request.
+    """
+
+    def __init__(self, response: dict):
+        super().__init__(response.get('error'))
+        self.response = response
+
+
+class TopicSingleFlight:
+    """
+    A Flask extension that coalesces concurrent upstream fetches keyed by normalized topic.
+
+    The first caller that needs a topic becomes its leader and performs the upstream request.
+    Every other caller that needs the same topic while the request is in flight awaits the
+    leader's future instead of sending its own. Callers with partly overlapping topic lists
+    lead the topics nobody is fetching and wait on the rest.
+
+    Thread-safe futures are used because each async view runs on its own event loop and thread,
+    the callers await them through asyncio.wrap_future.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        # Counters exposed to measure the savings
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Read the configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        self.enabled = app.config.get('AZURE_SINGLE_FLIGHT_ENABLED', True)
+        app.extensions['azure_single_flight'] = self
+
+
+    def record_hits(self, count: int) -> None:
+        """
+        Count the topics that were served from the cache without any upstream request.
+
+        Args:
+            count (int): The number of cache hits.
+        """
+        if count:
+            with self._lock:
+                self.hits += count
+
+
+    def claim(self, topics: dict) -> tuple:
+        """
+        Claim the topics that must be fetched, splitting them into led and awaited topics.
+
+        Args:
+            topics (dict): A mapping of normalized topic keys to topic names.
+
+        Returns:
+            tuple: A mapping of the led keys to topic names, and a mapping of the awaited keys to their futures.
+        """
+        leading = {}
+        waiting = {}
+
+        with self._lock:
+            for key, topic in topics.items():
+                future = self._inflight.get(key) if self.enabled else None
+                if future is not None:
+                    waiting[key] = future
+                    self.coalesced += 1
+                else:
+                    if self.enabled:
+                        self._inflight[key] = Future()
+                    leading[key] = topic
+                    self.misses += 1
+
+        return leading, waiting
+
+
+    def resolve(self, keys, results: dict) -> None:
+        """
+        Publish the upstream data of the led topics to every caller waiting on them.
+
+        Args:
+            keys (iterable): The led topic keys.
+            results (dict): A mapping of normalized topic keys to their data. Missing keys resolve to None.
+        """
+        for key, future in self._release(keys):
+            future.set_result(results.get(key))
+
+
+    def fail(self, keys, response: dict) -> None:
+        """
+        Propagate an upstream error to every caller waiting on the led topics.
+
+        Args:
+            keys (iterable): The led topic keys.
+            response (dict): The error response of the upstream request.
+        """
+        for key, future in self._release(keys):
+            future.set_exception(UpstreamFetchError(response))
+
+
+    def stats(self) -> dict:
+        """
+        Get the single-flight counters.
+
+        Returns:
+            dict: The hits, misses, coalesced waits and in-flight topics.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._inflight)
+            }
+
+
+    def _release(self, keys) -> list:
+        """
+        Private method that removes the led keys from the in-flight table.
+
+        Args:
+            keys (iterable): The led topic keys.
+
+        Returns:
+            list: The (key, future) pairs that were in flight.
+        """
+        with self._lock:
+            released = [(key, self._inflight.pop(key)) for key in keys if key in self._inflight]
+        return released
@@ -0,0 +1,348 @@
+# Description:
+"""
+    This file contains the per-topic cache placed in front of the Azure Function.
+        It keeps the upstream data of each topic so that repeated topics across
+        feed creations are not fetched again until they expire.
+"""
+
+# Import the necessary modules
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    Normalize a topic name so that equivalent topics share the same cache key.
+
+    Args:
+        topic (str): The topic name.
+
+    Returns:
+        str: The normalized topic key.
+    """
+    return str(topic).strip().casefold()
+
+
+class MemoryTopicCache:
+    """
+    In-process cache tier with a TTL and LRU eviction, bounded by entry count and bytes.
+
+    Values are stored as serialized JSON strings, so every hit returns an independent copy
+    and the byte bound reflects the real payload size.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+
+        # key -> (expires_at, serialized value)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key: str):
+        """
+        Get a serialized value by key, refreshing its LRU position.
+
+        Args:
+            key (str): The normalized topic key.
+
+        Returns:
+            str: The serialized value.
+            None: If the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+
+    def set(self, key: str, value: str, expires_at: float = None) -> None:
+        """
+        Store a serialized value, evicting the least recently used entries when over the bounds.
+
+        Args:
+            key (str): The normalized topic key.
+            value (str): The serialized value.
+            expires_at (float, optional): Absolute expiry timestamp. Defaults to now + ttl.
+        """
+        size = len(value)
+
+        # Values larger than the whole cache are never stored
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at or time.time() + self.ttl, value)
+            self.current_bytes += size
+
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def _remove(self, key: str) -> None:
+        """
+        Private method that removes an entry and updates the byte counter. The lock must be held.
+        """
+        _, value = self._entries.pop(key)
+        self.current_bytes -= len(value)
+
+
+class SQLiteTopicCache:
+    """
+    File-backed cache tier stored in a SQLite database.
+
+    It survives restarts and can be shared by all the worker processes on the same host.
+    Each thread uses its own connection, and WAL mode lets readers work alongside the writer.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        # A forked worker process (gunicorn --preload) opens its own connections
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget_connections)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS topic_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_topic_cache_accessed_at ON topic_cache (accessed_at)")
+
+
+    def get(self, key: str):
+        """
+        Get a serialized value and its expiry by key.
+
+        Args:
+            key (str): The normalized topic key.
+
+        Returns:
+            tuple: The serialized value and its absolute expiry timestamp.
+            None: If the key is missing or expired.
+        """
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value, expires_at FROM topic_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+
+            connection.execute("UPDATE topic_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0], row[1]
+
+
+    def set_many(self, values: dict) -> None:
+        """
+        Store several serialized values in one transaction and trim the table to its bounds.
+
+        Args:
+            values (dict): A mapping of normalized topic keys to serialized values.
+        """
+        now = time.time()
+        rows = [(key, value, now + self.ttl, now) for key, value in values.items()]
+
+        with self._connection() as connection:
+            connection.executemany("INSERT OR REPLACE INTO topic_cache VALUES (?, ?, ?, ?)", rows)
+            connection.execute("DELETE FROM topic_cache WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM topic_cache WHERE key NOT IN "
+                "(SELECT key FROM topic_cache ORDER BY accessed_at DESC LIMIT ?)", (self.max_entries,)
+            )
+
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache file.
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM topic_cache")
+
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Private method that returns the connection of the current thread, opening it on first use.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+    def _forget_connections(self) -> None:
+        """
+        Private method that drops the connections inherited from the parent process after a fork.
+        """
+        self._local = threading.local()
+
+
+class TopicCache:
+    """
+    A Flask extension that caches the Azure Function data of each topic.
+
+    Lookups go to the in-process tier first and then to the optional SQLite tier,
+    promoting SQLite hits into memory.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.memory = None
+        self.sqlite = None
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Build the cache tiers from the app configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        self.enabled = app.config.get('AZURE_TOPIC_CACHE_ENABLED', True)
+        ttl = app.config.get('AZURE_TOPIC_CACHE_TTL', 600)
+        max_entries = app.config.get('AZURE_TOPIC_CACHE_MAX_ENTRIES', 1024)
+
+        self.memory = MemoryTopicCache(ttl, max_entries, app.config.get('AZURE_TOPIC_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+        sqlite_path = app.config.get('AZURE_TOPIC_CACHE_SQLITE_PATH')
+        if self.enabled and sqlite_path:
+            try:
+                self.sqlite = SQLiteTopicCache(sqlite_path, ttl, app.config.get('AZURE_TOPIC_CACHE_SQLITE_MAX_ENTRIES', 10000))
+            except sqlite3.Error as e:
+                logger.warning("The SQLite topic cache could not be opened at %s: %s", sqlite_path, e)
+                self.sqlite = None
+
+        app.extensions['azure_topic_cache'] = self
+
+
+    def get_many(self, topics: list) -> dict:
+        """
+        Get the cached data for a list of topics.
+
+        Args:
+            topics (list): The list of topic names.
+
+        Returns:
+            dict: A mapping of normalized topic keys to their cached data, only for the cached topics.
+        """
+        found = {}
+        if not self.enabled:
+            return found
+
+        for topic in topics:
+            key = normalize_topic(topic)
+            if key in found:
+                continue
+
+            value = self.memory.get(key)
+
+            # Fall back to the SQLite tier and promote the hit into memory
+            if value is None and self.sqlite is not None:
+                try:
+                    row = self.sqlite.get(key)
+                except sqlite3.Error as e:
+                    logger.warning("SQLite topic cache read failed: %s", e)
+                    row = None
+                if row is not None:
+                    value, expires_at = row
+                    self.memory.set(key, value, expires_at)
+
+            if value is not None:
+                found[key] = json.loads(value)
+
+        return found
+
+
+    def set_many(self, data: dict) -> None:
+        """
+        Store the upstream data of several topics.
+
+        Args:
+            data (dict): A mapping of normalized topic keys to their upstream data.
+        """
+        if not self.enabled or not data:
+            return
+
+        serialized = {key: json.dumps(value) for key, value in data.items()}
+
+        for key, value in serialized.items():
+            self.memory.set(key, value)
+
+        if self.sqlite is not None:
+            try:
+                self.sqlite.set_many(serialized)
+            except sqlite3.Error as e:
+                logger.warning("SQLite topic cache write failed: %s", e)
+
+
+    def stats(self) -> dict:
+        """
+        Get the size of the in-process cache tier.
+
+        Returns:
+            dict: Whether the cache is enabled, its entries and bytes, and if the SQLite tier is active.
+        """
+        return {
+            'enabled': self.enabled,
+            'entries': len(self.memory) if self.memory is not None else 0,
+            'bytes': self.memory.current_bytes if self.memory is not None else 0,
+            'sqlite_tier': self.sqlite is not None
+        }
+
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from every cache tier.
+        """
+        if self.memory is not None:
+            self.memory.clear()
+        if self.sqlite is not None:
+            self.sqlite.clear()
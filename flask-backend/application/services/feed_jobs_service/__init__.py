@@ -0,0 +1,2 @@
+from .feed_job_queue import FeedJobQueue, FeedJobQueueFull
+from .job_store import MemoryJobStore, SQLiteJobStore
\ No newline at end of file
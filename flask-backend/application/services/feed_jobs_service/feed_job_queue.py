@@ -0,0 +1,318 @@
+# Description:
+"""
+    This file contains the FeedJobQueue class which runs the feed creation requests
+        as background jobs, so the HTTP request returns before the upstream fetch
+        and the database inserts are done.
+"""
+
+# Import the necessary modules
+import asyncio
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from application.services.feeds_service import FeedDataHandler
+from application.services.feed_jobs_service.job_store import (
+    MemoryJobStore, SQLiteJobStore, QUEUED, SUCCEEDED, FAILED
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Stages reported as the progress of a job, in order
+STAGES = (QUEUED, 'fetching_topics', 'saving_feed', 'completed')
+
+
+class FeedJobQueueFull(Exception):
+    """
+    Raised when a job is submitted while the queue is full.
+    """
+
+    pass
+
+
+class FeedJobQueue:
+    """
+    A Flask extension that runs feed creation jobs on a pool of worker threads.
+
+    Jobs are handed to the workers through an in-process queue. Their status, progress and
+    result live in a job store: in memory by default, or in a SQLite file when
+    FEED_JOBS_SQLITE_PATH is set. With the SQLite store the jobs survive a restart: the queued
+    ones are run when the queue starts, and the interrupted ones are marked as failed, since
+    their feed may already exist.
+
+    The memory store is only seen by the process that created the jobs, so with several worker
+    processes (gunicorn) the polling of a job would reach workers that don't know it. The jobs
+    are only enabled by default with the SQLite store (see FEED_JOBS_ENABLED in config.py).
+
+    The workers are started on first use rather than in create_app, so CLI commands
+    (flask db upgrade, ...) never start running jobs.
+    """
+
+    # Bound of the in-process job store, finished jobs are dropped first
+    MAX_STORED_JOBS = 1000
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = False
+        self.store = None
+        self.workers = 4
+        self.stale_after = 300
+
+        self._queue = None
+        self._threads = []
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Build the job store from the app configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        self.app = app
+        self.enabled = app.config.get('FEED_JOBS_ENABLED', True)
+        self.workers = app.config.get('FEED_JOBS_WORKERS', 4)
+        self.stale_after = app.config.get('FEED_JOBS_STALE_AFTER', 300)
+        self._queue = queue.Queue(maxsize=app.config.get('FEED_JOBS_MAX_QUEUED', 100))
+
+        retention = app.config.get('FEED_JOBS_RETENTION', 3600)
+        self.store = MemoryJobStore(retention, self.MAX_STORED_JOBS)
+
+        sqlite_path = app.config.get('FEED_JOBS_SQLITE_PATH')
+        if self.enabled and sqlite_path:
+            try:
+                self.store = SQLiteJobStore(sqlite_path, retention)
+            except sqlite3.Error as e:
+                # The in-process store would lose the jobs polled from other worker processes
+                logger.warning("The SQLite job store could not be opened at %s, the feed jobs are disabled: %s", sqlite_path, e)
+                self.enabled = False
+        elif self.enabled:
+            logger.info("The feed jobs use the in-process store, which only works with a single worker process.")
+
+        app.extensions['feed_jobs'] = self
+
+        # Stop the workers when the process exits
+        atexit.register(self.shutdown)
+
+
+    def submit(self, payload: dict, user_id: int) -> dict:
+        """
+        Validate a feed creation payload and queue it as a job.
+
+        Args:
+            payload (dict): The feed creation payload.
+            user_id (int): The owner of the feed.
+
+        Returns:
+            dict: The serialized queued job.
+
+        Raises:
+            ValueError: If the payload is invalid.
+            FeedJobQueueFull: If the queue is full.
+        """
+        # Reject invalid payloads now, instead of failing the job later
+        FeedDataHandler(payload).validate_payload()
+
+        self._start()
+
+        now = datetime.utcnow()
+        job = {
+            'id': uuid.uuid4().hex,
+            'user_id': user_id,
+            'status': QUEUED,
+            'stage': QUEUED,
+            'payload': payload,
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        }
+        self.store.create(job)
+
+        try:
+            self._queue.put_nowait(job['id'])
+        except queue.Full:
+            self.store.update(job['id'], status=FAILED, error="The job queue is full.")
+            raise FeedJobQueueFull("Too many feeds are being created, please try again later.")
+
+        return self.serialize_job(job)
+
+
+    def get(self, job_id: str, user_id: int):
+        """
+        Get a job of a user.
+
+        Args:
+            job_id (str): The job ID.
+            user_id (int): The user requesting the job.
+
+        Returns:
+            dict: The serialized job.
+            None: If the job doesn't exist or belongs to another user.
+        """
+        self._start()
+
+        job = self.store.get(job_id)
+        if job is None or job['user_id'] != user_id:
+            return None
+
+        return self.serialize_job(job)
+
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """
+        Stop the workers once they finish their current job.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker. Defaults to 5.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+
+        # Drop the jobs still queued (the SQLite store runs them again on restart) so the
+        # stop signals never wait for room in the queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+
+        for _ in threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(timeout)
+
+
+    @staticmethod
+    def serialize_job(job: dict) -> dict:
+        """
+        Serialize a job for the API, without its payload and owner.
+
+        Args:
+            job (dict): The job.
+
+        Returns:
+            dict: The job ID, status, progress, timestamps, and the result or the error once finished.
+        """
+        stage = job['stage']
+        serialized = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'progress': {
+                'stage': stage,
+                'step': STAGES.index(stage) if stage in STAGES else 0,
+                'steps': len(STAGES) - 1
+            },
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at']
+        }
+
+        if job['status'] == SUCCEEDED:
+            serialized['result'] = job['result']
+        elif job['status'] == FAILED:
+            serialized['error'] = job['error']
+
+        return serialized
+
+
+    def _start(self) -> None:
+        """
+        Private method that starts the workers on first use, and queues the jobs left over by a restart.
+        """
+        if self._threads:
+            return
+
+        with self._lock:
+            if self._threads:
+                return
+
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"feed-job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+            for job_id in self.store.pending(self.stale_after):
+                try:
+                    self._queue.put_nowait(job_id)
+                except queue.Full:
+                    logger.warning("The job queue is full, job %s stays queued until the next restart.", job_id)
+                    break
+
+
+    def _work(self) -> None:
+        """
+        Private method that runs the queued jobs until the queue is stopped.
+        """
+        while True:
+            job_id = self._queue.get()
+            try:
+                if job_id is None:
+                    return
+                self._run(job_id)
+            except Exception as e:
+                logger.error("Feed job %s could not be run: %s", job_id, e, exc_info=True)
+            finally:
+                self._queue.task_done()
+
+
+    def _run(self, job_id: str) -> None:
+        """
+        Private method that runs a job, recording its progress and its result or error.
+
+        Args:
+            job_id (str): The job ID.
+        """
+        # Another worker (or process sharing the SQLite store) may have claimed it already
+        if not self.store.claim(job_id):
+            return
+
+        job = self.store.get(job_id)
+
+        def report_progress(stage: str) -> None:
+            self.store.update(job_id, stage=stage)
+
+        with self.app.app_context():
+            try:
+                handler = FeedDataHandler(job['payload'], progress_callback=report_progress)
+                result = self._run_coroutine(handler.process_request(user_id=job['user_id']))
+
+            except ValueError as e:
+                self.store.update(job_id, status=FAILED, error=str(e))
+
+            except Exception as e:
+                logger.error("Feed job %s failed: %s", job_id, e, exc_info=True)
+                self.store.update(job_id, status=FAILED, error=str(e))
+
+            else:
+                self.store.update(job_id, status=SUCCEEDED, stage=STAGES[-1], result=result)
+
+
+    def _run_coroutine(self, coro):
+        """
+        Private method that runs a coroutine of a job and waits for its result, on the persistent
+        event loop of the application when it is enabled, so the jobs share its async resources.
+
+        Args:
+            coro (coroutine): The coroutine to run.
+
+        Returns:
+            Any: The result of the coroutine.
+        """
+        event_loop = self.app.extensions.get('event_loop')
+        if event_loop is not None and event_loop.enabled:
+            return event_loop.run(coro)
+
+        return asyncio.run(coro)
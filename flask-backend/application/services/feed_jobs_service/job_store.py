@@ -0,0 +1,303 @@
+# Description:
+"""
+    This file contains the stores of the feed creation jobs: an in-process store
+        and a SQLite-backed store that keeps the jobs across restarts.
+"""
+
+# Import the necessary modules
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+# Job statuses
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+# Error of the running jobs found without progress after a restart
+INTERRUPTED_ERROR = "The job was interrupted, check your feeds before creating it again."
+
+
+class MemoryJobStore:
+    """
+    In-process job store. The jobs are lost when the process exits, and they are only seen by
+    the process that created them: with several worker processes, use SQLiteJobStore.
+
+    Finished jobs are kept for the retention period, and the oldest finished jobs are
+    dropped first when the store is over its bound.
+    """
+
+    def __init__(self, retention: float, max_jobs: int):
+        self.retention = retention
+        self.max_jobs = max_jobs
+
+        # job_id -> job dict, in creation order
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def create(self, job: dict) -> None:
+        """
+        Store a new job and prune the expired ones.
+
+        Args:
+            job (dict): The job to store.
+        """
+        with self._lock:
+            self._prune()
+            self._jobs[job['id']] = dict(job)
+
+
+    def get(self, job_id: str):
+        """
+        Get a copy of a job by ID.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            dict: The job.
+            None: If the job doesn't exist.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+
+    def update(self, job_id: str, **fields) -> None:
+        """
+        Update the fields of a job and its updated_at timestamp.
+
+        Args:
+            job_id (str): The job ID.
+            **fields: The fields to update.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields, updated_at=datetime.utcnow())
+
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Mark a queued job as running.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            bool: True if the job was queued and is now claimed by the caller.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != QUEUED:
+                return False
+            job.update(status=RUNNING, updated_at=datetime.utcnow())
+            return True
+
+
+    def pending(self, stale_after: float) -> list:
+        """
+        Get the IDs of the queued jobs to run after a restart. Always empty for the in-process store.
+        """
+        return []
+
+
+    def _prune(self) -> None:
+        """
+        Private method that drops the expired finished jobs, then the oldest finished jobs over the bound.
+        The lock must be held.
+        """
+        expired_before = datetime.utcnow() - timedelta(seconds=self.retention)
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED_STATUSES]
+
+        for job_id in finished:
+            if self._jobs[job_id]['updated_at'] < expired_before or len(self._jobs) >= self.max_jobs:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """
+    Job store kept in a SQLite database, so the jobs and their results survive a restart.
+
+    The file can be shared by all the worker processes on the same host. Each thread uses
+    its own connection, and jobs are claimed with a conditional UPDATE so that a job is
+    only run by one worker.
+    """
+
+    COLUMNS = ('id', 'user_id', 'status', 'stage', 'payload', 'result', 'error', 'created_at', 'updated_at')
+    JSON_COLUMNS = ('payload', 'result')
+
+    def __init__(self, path: str, retention: float):
+        self.path = path
+        self.retention = retention
+        self._local = threading.local()
+
+        # A forked worker process (gunicorn --preload) opens its own connections
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget_connections)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS feed_jobs ("
+                "id TEXT PRIMARY KEY, user_id INTEGER NOT NULL, status TEXT NOT NULL, stage TEXT NOT NULL, "
+                "payload TEXT NOT NULL, result TEXT, error TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_feed_jobs_status_updated_at ON feed_jobs (status, updated_at)")
+
+
+    def create(self, job: dict) -> None:
+        """
+        Store a new job and prune the expired ones.
+
+        Args:
+            job (dict): The job to store.
+        """
+        expired_before = (datetime.utcnow() - timedelta(seconds=self.retention)).isoformat()
+        with self._connection() as connection:
+            connection.execute(
+                f"DELETE FROM feed_jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATUSES))}) AND updated_at < ?",
+                (*FINISHED_STATUSES, expired_before)
+            )
+            connection.execute(
+                f"INSERT INTO feed_jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                [self._to_column(column, job.get(column)) for column in self.COLUMNS]
+            )
+
+
+    def get(self, job_id: str):
+        """
+        Get a job by ID.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            dict: The job.
+            None: If the job doesn't exist.
+        """
+        row = self._connection().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM feed_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return {column: self._from_column(column, value) for column, value in zip(self.COLUMNS, row)}
+
+
+    def update(self, job_id: str, **fields) -> None:
+        """
+        Update the fields of a job and its updated_at timestamp.
+
+        Args:
+            job_id (str): The job ID.
+            **fields: The fields to update.
+        """
+        fields['updated_at'] = datetime.utcnow()
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        values = [self._to_column(column, value) for column, value in fields.items()]
+
+        with self._connection() as connection:
+            connection.execute(f"UPDATE feed_jobs SET {assignments} WHERE id = ?", (*values, job_id))
+
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Mark a queued job as running, unless another worker claimed it first.
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            bool: True if the job was queued and is now claimed by the caller.
+        """
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "UPDATE feed_jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, datetime.utcnow().isoformat(), job_id, QUEUED)
+            )
+            return cursor.rowcount == 1
+
+
+    def pending(self, stale_after: float) -> list:
+        """
+        Get the IDs of the queued jobs to run after a restart.
+
+        Running jobs that stopped reporting progress for stale_after seconds were interrupted.
+        They are marked as failed rather than run again: the feed may have been committed before
+        the job was, and the feed creation is not idempotent.
+
+        Args:
+            stale_after (float): Seconds after which a running job is considered interrupted.
+
+        Returns:
+            list: The IDs of the queued jobs, oldest first.
+        """
+        now = datetime.utcnow()
+        stale_before = (now - timedelta(seconds=stale_after)).isoformat()
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE feed_jobs SET status = ?, error = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (FAILED, INTERRUPTED_ERROR, now.isoformat(), RUNNING, stale_before)
+            )
+            rows = connection.execute(
+                "SELECT id FROM feed_jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+
+    def _to_column(self, column: str, value):
+        """
+        Private method that converts a job field to its stored value.
+        """
+        if value is None:
+            return None
+        if column in self.JSON_COLUMNS:
+            return json.dumps(value, default=str)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+
+    def _from_column(self, column: str, value):
+        """
+        Private method that converts a stored value back to its job field.
+        """
+        if value is None:
+            return None
+        if column in self.JSON_COLUMNS:
+            return json.loads(value)
+        if column in ('created_at', 'updated_at'):
+            return datetime.fromisoformat(value)
+        return value
+
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Private method that returns the connection of the current thread, opening it on first use.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+    def _forget_connections(self) -> None:
+        """
+        Private method that drops the connections inherited from the parent process after a fork.
+        """
+        self._local = threading.local()
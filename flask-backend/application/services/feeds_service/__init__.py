@@ -1,5 +1,8 @@
 from .topics_service import TopicService
 from .feeds_service import FeedsService
+from .feed_summary_service import FeedSummaryService
 from .resources_service import ResourcesService
+from .bulk_feed_writer import BulkFeedWriter
 from .feed_data_handler import FeedDataHandler
-from .pagination_service import PaginationService
\ No newline at end of file
+from .pagination_service import PaginationService
+from .public_feeds_cache import PublicFeedsCache
\ No newline at end of file
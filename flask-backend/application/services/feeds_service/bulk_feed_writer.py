@@ -0,0 +1,126 @@
+# Description: Bulk write path for the creation of a feed with its topics and resources.
+
+# Import the necessary modules
+from sqlalchemy import insert
+from database import db
+from application.models import Feed, Topic, Resource
+from application.services.feeds_service.topics_service import TopicService
+from application.services.feeds_service.resources_service import ResourcesService
+from application.services.feeds_service.feed_summary_service import FeedSummaryService
+from application.services.feeds_service.public_feeds_cache import invalidate_feed_cache
+
+
+class BulkFeedWriter:
+    """
+    A service class that inserts a feed, its topics and all its resources in a single transaction.
+
+    Rows are written with INSERT ... RETURNING statements (executemany for the topics and the
+    resources) instead of one ORM object per row, and each resource finds its topic through a
+    dictionary lookup from topic name to ID.
+    """
+
+    def insert_feed(self, user_id: int, feed_name: str, is_public: bool, topics: list, feeds_data: list) -> dict:
+        """
+        Insert the feed, its topics and their resources in one transaction.
+
+        Args:
+            user_id (int): The owner of the feed.
+            feed_name (str): The name of the feed.
+            is_public (bool): Whether the feed is public or not.
+            topics (list): The list of topic names to insert.
+            feeds_data (list): The data returned by the Azure Function for the topics.
+
+        Returns:
+            dict: The inserted feed columns, with its serialized resources grouped by topic name.
+
+        Raises:
+            ValueError: If a topic is invalid.
+        """
+        try:
+            # Insert the feed and get its generated columns back
+            feed = db.session.execute(
+                insert(Feed).returning(Feed.id, Feed.name, Feed.is_public),
+                [{'user_id': user_id, 'name': feed_name, 'is_public': is_public}]
+            ).one()
+
+            for topic in topics:
+                TopicService._validate_topic(topic, feed.id)
+
+            # Insert the topics and map each topic name to its ID
+            topic_rows = db.session.execute(
+                insert(Topic).returning(Topic.id, Topic.name),
+                [{'feed_id': feed.id, 'name': topic} for topic in topics]
+            ).all()
+            topic_ids = {row.name: row.id for row in topic_rows}
+
+            # Insert the resources of every topic in batches
+            resource_rows = self._build_resource_rows(topic_ids, feeds_data)
+            inserted_resources = []
+            if resource_rows:
+                inserted_resources = db.session.execute(
+                    insert(Resource).returning(
+                        Resource.id, Resource.topic_id, Resource.title, Resource.date,
+                        Resource.type, Resource.editorial, Resource.languages
+                    ),
+                    resource_rows
+                ).all()
+
+            # Write the listing summary of the feed in the same transaction
+            FeedSummaryService.refresh([feed.id])
+
+            db.session.commit()
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Drop the cached public listings the new feed and its topics belong to
+        invalidate_feed_cache(feed.id, {'id': feed.id, 'is_public': feed.is_public, 'name': feed.name, 'topics': list(topic_ids)})
+
+        return {
+            'id': feed.id,
+            'name': feed.name,
+            'is_public': feed.is_public,
+            'topics': self._group_resources(topic_ids, inserted_resources)
+        }
+
+
+    @staticmethod
+    def _build_resource_rows(topic_ids: dict, feeds_data: list) -> list:
+        """
+        Private method that builds the column values of every resource to insert.
+
+        Args:
+            topic_ids (dict): A mapping of topic names to their IDs.
+            feeds_data (list): The data returned by the Azure Function for the topics.
+
+        Returns:
+            list: The column values of each resource.
+        """
+        rows = []
+        for data in feeds_data:
+            topic_id = topic_ids.get(data['topic'])
+            if topic_id is None:
+                continue
+
+            rows.extend(ResourcesService.build_resource_row(topic_id, item) for item in data['data']['items'])
+        return rows
+
+
+    @staticmethod
+    def _group_resources(topic_ids: dict, resources: list) -> dict:
+        """
+        Private method that serializes the inserted resources grouped by topic name.
+
+        Args:
+            topic_ids (dict): A mapping of topic names to their IDs.
+            resources (list): The inserted resource rows.
+
+        Returns:
+            dict: A mapping of topic names to their serialized resources.
+        """
+        grouped = {topic_id: [] for topic_id in topic_ids.values()}
+        for resource in resources:
+            grouped[resource.topic_id].append(dict(resource._mapping))
+
+        return {name: grouped[topic_id] for name, topic_id in topic_ids.items()}
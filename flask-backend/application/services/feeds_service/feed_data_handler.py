@@ -2,20 +2,27 @@
 
 # Required Libraries
 from application.services.feeds_service import FeedsService, TopicService, ResourcesService
+from application.services.feeds_service.bulk_feed_writer import BulkFeedWriter
+from application.services.feeds_service.feed_summary_service import FeedSummaryService
 from application.services.azure_function_service import AzureFunctionService
 from flask import current_app as app
+from flask_jwt_extended import get_jwt_identity
 from database import db
 import asyncio
 
 
 class FeedDataHandler:
-    def __init__(self, payload: dict):
+    def __init__(self, payload: dict, progress_callback=None):
         # Initialize the services
         self.feeds_service = FeedsService()
         self.topic_service = TopicService()
         self.resources_service = ResourcesService()
+        self.bulk_feed_writer = BulkFeedWriter()
         self.azure_function_service = AzureFunctionService(app.config['AZURE_FUNCTION_URL'])
 
+        # Write path used to save the feed: "bulk" (single transaction) or "orm" (one object per row)
+        self.write_path = app.config.get('FEED_WRITE_PATH', 'bulk')
+
         # Initialize the attributes
         self.feed_name = None
         self.is_public = None
@@ -24,12 +31,20 @@ class FeedDataHandler:
         # Initialize the payload
         self.payload = payload
 
+        # Optional callable notified with the name of each stage (used by the background jobs)
+        self.progress_callback = progress_callback
+
 
-    async def process_request(self) -> dict:
+    async def process_request(self, user_id: int = None) -> dict:
         # Validate and initialize the payload
         self._validate_and_initialize_payload()
 
+        # Background jobs run outside the request, so they provide the owner of the feed
+        if user_id is None:
+            user_id = get_jwt_identity()
+
         # Fetch data for the topics from the third-party API asynchronously
+        self._report_progress('fetching_topics')
         news_data = await self.azure_function_service.fetch_data(self.topics)
 
         # Validate and parse the response data
@@ -40,8 +55,69 @@ class FeedDataHandler:
             not_found_topics_str = ", ".join(not_found_topics)
             raise ValueError(f"No data found for the provided topics: {not_found_topics_str}. Please insert another topic that exists.")
 
+        # Save the feed, its topics and resources
+        self._report_progress('saving_feed')
+        feed = await self.save_feed(user_id, found_topics, news_data)
+
+        # Return the response data
+        response = {
+            "feed_id": feed['id'],
+            "feed_name": feed['name'],
+            "is_public": feed['is_public'],
+            "topics": feed['topics'],
+            "not_found_topics": not_found_topics
+        }
+
+        return response
+
+
+    def validate_payload(self) -> None:
+        """
+        Validate the payload without processing it, to reject invalid requests before they are queued.
+
+        Raises:
+            ValueError: If the payload data is invalid.
+        """
+        self._validate_and_initialize_payload()
+
+
+    async def save_feed(self, user_id: int, found_topics: list, news_data: list, write_path: str = None) -> dict:
+        """
+        Save the feed, its topics and resources with the configured write path.
+
+        Args:
+            user_id (int): The owner of the feed.
+            found_topics (list): The list of topics with data.
+            news_data (list): The data returned by the Azure Function.
+            write_path (str, optional): "bulk" or "orm". Defaults to the FEED_WRITE_PATH setting.
+
+        Returns:
+            dict: The inserted feed, with its serialized resources grouped by topic name.
+        """
+        if (write_path or self.write_path) == 'orm':
+            return await self._insert_feed_orm(user_id, found_topics, news_data)
+
+        return await asyncio.to_thread(
+            self.bulk_feed_writer.insert_feed, user_id, self.feed_name, self.is_public, found_topics, news_data
+        )
+
+
+    async def _insert_feed_orm(self, user_id: int, found_topics: list, news_data: list) -> dict:
+        """
+        Private method that inserts the feed, its topics and resources one ORM object at a time.
+
+        This is the original write path, kept to compare it with the bulk write path.
+
+        Args:
+            user_id (int): The owner of the feed.
+            found_topics (list): The list of topics with data.
+            news_data (list): The data returned by the Azure Function.
+
+        Returns:
+            dict: The inserted feed, with its serialized resources grouped by topic name.
+        """
         # Save the data to the database asynchronously
-        feed_model = await asyncio.to_thread(self.feeds_service.insert_feed, self.feed_name, self.is_public)
+        feed_model = await asyncio.to_thread(self.feeds_service.insert_feed, self.feed_name, self.is_public, user_id)
 
 
         try:
@@ -59,6 +135,9 @@ class FeedDataHandler:
         # Insert the feed resources into the database
         resources_models = await asyncio.to_thread(self.resources_service.insert_feed_resources, topics_models, news_data)
 
+        # The topics and resources were committed after the feed, mark the feed as changed
+        await asyncio.to_thread(self.feeds_service.touch_feed, feed_model.id)
+
         # Create a dictionary to hold the serialized topics and their resources
         serialized_topics = {}
         for topic_model in topics_models:
@@ -71,16 +150,20 @@ class FeedDataHandler:
             # Add the topic and its resources to the dictionary
             serialized_topics[topic_model.name] = serialized_resources
 
-        # Return the response data
-        response = {
-            "feed_id": feed_model.id,
-            "feed_name": feed_model.name,
+        return {
+            "id": feed_model.id,
+            "name": feed_model.name,
             "is_public": feed_model.is_public,
-            "topics": serialized_topics,
-            "not_found_topics": not_found_topics
+            "topics": serialized_topics
         }
 
-        return response
+
+    def _report_progress(self, stage: str) -> None:
+        """
+        Private method that notifies the progress callback of the current stage, if any.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(stage)
 
 
     def _validate_and_initialize_payload(self) -> None:
@@ -194,5 +277,8 @@ class FeedDataHandler:
         for topic in topics_models:
             db.session.add(topic)
 
+        # Add the topics to the listing summaries of their feeds in the same transaction
+        FeedSummaryService.refresh({topic.feed_id for topic in topics_models})
+
         # Commit the transaction
         db.session.commit()
\ No newline at end of file
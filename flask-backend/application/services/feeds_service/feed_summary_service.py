@@ -0,0 +1,132 @@
+# Description: Maintenance of the feed summary read model.
+
+# Import the necessary modules
+from sqlalchemy import delete, insert, select
+from database import db
+from application.models import Feed, FeedSummary, Topic, User
+
+
+class FeedSummaryService:
+    """
+    A service class that keeps the feed_summaries read model in sync with the feeds, their
+    creators and their topics.
+
+    The write paths refresh the summaries of the feeds they change before committing, so the
+    summaries are written in the same transaction as the feeds and topics. The whole table can
+    be rebuilt with "flask feeds rebuild-summaries".
+    """
+
+    # Number of feeds refreshed per statement (keeps the IN lists under the database limits)
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def refresh(feed_ids) -> None:
+        """
+        Rewrite the summaries of the given feeds in the current transaction, without committing it.
+
+        The pending changes of the session are flushed first, so the summaries reflect them.
+        The summaries of the feeds that no longer exist are removed.
+
+        Args:
+            feed_ids (iterable): The IDs of the feeds to refresh.
+        """
+        feed_ids = list(feed_ids)
+        if not feed_ids:
+            return
+
+        db.session.flush()
+
+        for start in range(0, len(feed_ids), FeedSummaryService.BATCH_SIZE):
+            batch = feed_ids[start:start + FeedSummaryService.BATCH_SIZE]
+            rows = FeedSummaryService.build_rows(batch)
+
+            db.session.execute(delete(FeedSummary).where(FeedSummary.feed_id.in_(batch)))
+            if rows:
+                db.session.execute(insert(FeedSummary), rows)
+
+
+    @staticmethod
+    def rebuild(batch_size: int = None) -> int:
+        """
+        Rebuild the summaries of all the feeds, committing after each batch of feeds.
+
+        Args:
+            batch_size (int, optional): The number of feeds per batch. Defaults to BATCH_SIZE.
+
+        Returns:
+            int: The number of summaries written.
+        """
+        batch_size = batch_size or FeedSummaryService.BATCH_SIZE
+
+        # Drop the summaries left over by feeds deleted outside of the write paths
+        db.session.execute(delete(FeedSummary).where(FeedSummary.feed_id.not_in(select(Feed.id))))
+        db.session.commit()
+
+        written = 0
+        last_id = 0
+        while True:
+            feed_ids = db.session.execute(
+                select(Feed.id).where(Feed.id > last_id).order_by(Feed.id).limit(batch_size)
+            ).scalars().all()
+            if not feed_ids:
+                break
+
+            FeedSummaryService.refresh(feed_ids)
+            db.session.commit()
+
+            written += len(feed_ids)
+            last_id = feed_ids[-1]
+
+        return written
+
+
+    @staticmethod
+    def is_empty() -> bool:
+        """
+        Check if the read model has no summaries while there are feeds, e.g. on a database
+        created before the read model existed.
+
+        Returns:
+            bool: True if the summaries must be backfilled.
+        """
+        has_summaries = db.session.execute(select(FeedSummary.feed_id).limit(1)).first() is not None
+        has_feeds = db.session.execute(select(Feed.id).limit(1)).first() is not None
+        return has_feeds and not has_summaries
+
+
+    @staticmethod
+    def build_rows(feed_ids: list) -> list:
+        """
+        Build the summary rows of the given feeds from the feeds, users and topics tables.
+
+        Args:
+            feed_ids (list): The IDs of the feeds.
+
+        Returns:
+            list: The column values of the summary of each existing feed.
+        """
+        feeds = db.session.execute(
+            select(
+                Feed.id, Feed.user_id, Feed.name, Feed.is_public, Feed.created_at, Feed.updated_at,
+                User.username
+            ).join(User, User.id == Feed.user_id).where(Feed.id.in_(feed_ids))
+        ).all()
+
+        # Topic names of each feed, in insertion order
+        topics = {}
+        topic_rows = db.session.execute(
+            select(Topic.feed_id, Topic.name).where(Topic.feed_id.in_(feed_ids)).order_by(Topic.feed_id, Topic.id)
+        )
+        for feed_id, name in topic_rows:
+            topics.setdefault(feed_id, []).append(name)
+
+        return [{
+            'feed_id': feed.id,
+            'user_id': feed.user_id,
+            'name': feed.name,
+            'is_public': bool(feed.is_public),
+            'creator': feed.username,
+            'topics': topics.get(feed.id, []),
+            'created_at': feed.created_at,
+            'updated_at': feed.updated_at
+        } for feed in feeds]
@@ -3,8 +3,11 @@
 # Import the necessary modules
 from database import db
 from application.models import Feed
-from flask_jwt_extended import get_jwt_identity
+from application.services.feeds_service.feed_summary_service import FeedSummaryService
+from application.services.feeds_service.public_feeds_cache import feed_cache_state, invalidate_feed_cache
+from flask_jwt_extended import current_user, get_jwt_identity
 from datetime import datetime
+from sqlalchemy import update
 
 class FeedsService:
     """
@@ -12,32 +15,64 @@ class FeedsService:
     """
 
     @staticmethod
-    def insert_feed(feed_name: str, is_public: bool) -> Feed:
+    def insert_feed(feed_name: str, is_public: bool, user_id: int = None) -> Feed:
         """
         Insert a new feed into the database.
 
         Args:
             feed_name (str): The name of the feed.
             is_public (bool): Whether the feed is public or not.
+            user_id (int, optional): The owner of the feed. Defaults to the user of the JWT token.
 
         Returns:
             Feed: The newly created feed object.
         """
-        # Get the user ID from the JWT token
-        user_id = get_jwt_identity()
+        # Get the user ID from the JWT token if not provided
+        if user_id is None:
+            user_id = get_jwt_identity()
 
         # Create the feed object
         new_feed = Feed(name=feed_name, is_public=is_public, user_id=user_id)
 
         # Add the feed to the database and flush the session
         db.session.add(new_feed)
+        db.session.flush()
+
+        # Write the listing summary of the feed in the same transaction
+        FeedSummaryService.refresh([new_feed.id])
 
         # Commit all the updates to the session database
         db.session.commit()
 
+        # Drop the cached public listings the new feed belongs to
+        invalidate_feed_cache(new_feed.id, feed_cache_state(new_feed))
+
         return new_feed
 
 
+    @staticmethod
+    def touch_feed(feed_id: int) -> None:
+        """
+        Set the updated_at of a feed to now, to mark a change of its topics or resources.
+
+        The ETags of the feed listings and details are derived from updated_at, so writes
+        committed after the feed itself must touch it.
+
+        Args:
+            feed_id (int): The ID of the feed.
+        """
+        db.session.execute(update(Feed).where(Feed.id == feed_id).values(updated_at=datetime.utcnow()))
+
+        # Rewrite the listing summary with the new topics and update date in the same transaction
+        FeedSummaryService.refresh([feed_id])
+        db.session.commit()
+
+        # Drop the cached public listings the feed belongs to with its new topics
+        feed = db.session.get(Feed, feed_id)
+        if feed is not None:
+            invalidate_feed_cache(feed_id, feed_cache_state(feed))
+
+
     @staticmethod
     def update_feed(feed_id, payload) -> dict:
         """
@@ -76,8 +111,7 @@ class FeedsService:
             raise ValueError('Feed not found')
         
         # Ensure the user is the owner of the feed
-        user_id = get_jwt_identity()
-        if feed.user_id != user_id:
+        if feed.user_id != current_user.id:
             raise ValueError('Unauthorized to update this feed')
 
         # Update feed attributes if provided
@@ -89,15 +123,23 @@ class FeedsService:
         if not isinstance(is_public, bool):
             raise ValueError('is_public must be a boolean')
 
+        # Keep the state before the update to drop the cached listings the feed leaves
+        previous_state = feed_cache_state(feed)
+
         if feed_name:
             feed.name = feed_name
         if is_public is not None:
             feed.is_public = is_public
 
+        # Rewrite the listing summary of the feed in the same transaction
+        FeedSummaryService.refresh([feed.id])
 
         # Commit changes to the database
         db.session.commit()
 
+        # Drop the cached public listings the feed leaves or joins
+        invalidate_feed_cache(feed.id, previous_state, feed_cache_state(feed))
+
 
         response = {
             'id': feed.id,
@@ -138,12 +180,16 @@ class FeedsService:
             raise ValueError('Feed not found')
 
         # Ensure the user is the owner of the feed
-        user_id = get_jwt_identity()
-        if feed.user_id != user_id:
+        if feed.user_id != current_user.id:
             raise ValueError('Unauthorized to delete this feed')
 
-        # Delete the feed from the database
+        # Keep the state of the feed to drop the cached listings it leaves
+        previous_state = feed_cache_state(feed)
+
+        # Delete the feed from the database (its listing summary is deleted with it)
         db.session.delete(feed)
         db.session.commit()
 
+        invalidate_feed_cache(feed_id, previous_state)
+
         return {'message': f'Feed {int(feed_id)} deleted successfully'}
\ No newline at end of file
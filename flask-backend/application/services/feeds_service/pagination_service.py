@@ -1,27 +1,48 @@
-from application.models import Feed, Topic, Resource
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from application.models import Feed, FeedSummary, Topic, Resource
+from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import joinedload
+from database import db, indexed_name_matches, name_contains_clause
+from flask import abort, current_app
+from flask_jwt_extended import jwt_required, current_user, verify_jwt_in_request
+import base64
+import json
 
 
 class PaginationService:
-    def __init__(self, page=1, per_page=10):
+    def __init__(self, page=1, per_page=10, cursor=None, count='none'):
         self.page = page
         self.per_page = per_page
 
+        # Keyset pagination: an opaque cursor ("" for the first page) and the count mode ("none" or "exact")
+        self.cursor = cursor
+        self.count = count
 
-    def get_paginated_feeds(self, user_id=None, is_public=None, topic_filter=None):
+        # IDs of the feeds of the last page returned (used to tag cached pages)
+        self.feed_ids = []
+
+
+    def get_paginated_feeds(self, user_id=None, is_public=None, topic_filter=None, name_filter=None):
         """
         Fetch and paginate feeds based on the provided parameters.
+        The feeds are read from the feed_summaries read model, which holds the creator and the
+        topic names of each feed, so a page costs a count and a scan of one narrow table (plus
+        one search index probe per filter) regardless of its size.
+
+        When a cursor is provided, the feeds are paginated by keyset on (updated_at, id)
+        instead of OFFSET/LIMIT, so deep pages never scan the skipped rows.
 
         Args:
             user_id (int): Filter feeds by user_id (for private feeds).
             is_public (bool): Filter feeds by public status (True for public, False for private).
-            topic_filter (str): Filter feeds by topic.
+            topic_filter (str): Filter feeds by a substring of any of their topic names.
+            name_filter (str): Filter feeds by a substring of their name.
 
         Returns:
             dict: Serialized paginated feeds and pagination details.
         """
-        # Start a base query
-        query = Feed.query
+        # Start a base query on the read model, no joins are needed to serialize the feeds
+        query = FeedSummary.query
 
         # Filter by user_id if provided (for private feeds)
         if user_id is not None:
@@ -31,22 +52,22 @@ class PaginationService:
         if is_public is not None:
             query = query.filter_by(is_public=is_public)
 
-        # Apply topic filter if provided
+        # Apply the topic and feed name filters if provided
+        search_backend = current_app.extensions.get('search_backend', 'like')
         if topic_filter:
-            query = query.join(Topic).filter(Topic.name.ilike(f"%{topic_filter}%"))
+            query = query.filter(self._topic_filter(topic_filter, search_backend))
+        if name_filter:
+            query = query.filter(self._name_filter(name_filter, search_backend))
+
+        if self.cursor is not None:
+            return self._get_keyset_page(query, is_public)
 
         # Paginate the query results
-        paginated_feeds = query.order_by(Feed.updated_at.desc()).paginate(page=self.page, per_page=self.per_page, error_out=False)
+        paginated_feeds = query.order_by(FeedSummary.updated_at.desc(), FeedSummary.feed_id.desc()).paginate(page=self.page, per_page=self.per_page, error_out=False)
 
         # Serialize the feeds and pagination details
-        feeds = [{
-            "name": feed.name,
-            "creator": feed.user.username if is_public else None,
-            "is_public": feed.is_public,
-            "topics": [topic.name for topic in feed.topics],
-            "created_at": feed.created_at,
-            "updated_at": feed.updated_at
-        } for feed in paginated_feeds.items]
+        feeds = [self._serialize_feed(summary, is_public) for summary in paginated_feeds.items]
+        self.feed_ids = [summary.feed_id for summary in paginated_feeds.items]
 
         return {
             "feeds": feeds,
@@ -55,52 +76,355 @@ class PaginationService:
         }
 
 
-    def get_feed_details(self, feed_id):
+    @staticmethod
+    def _topic_filter(topic_filter, search_backend):
+        """
+        Private method that builds the filter of the feeds with a topic name containing a term.
+
+        Selective terms are looked up in the search index. Other terms are checked feed by feed
+        with EXISTS, so the listing scan stops as soon as the page is full. Both forms return
+        each feed once, however many of its topics match.
+        """
+        matches = indexed_name_matches('topics_search', topic_filter, search_backend)
+        if matches is not None:
+            return FeedSummary.feed_id.in_(select(Topic.feed_id).where(Topic.id.in_(matches)))
+
+        return select(Topic.id).where(
+            Topic.feed_id == FeedSummary.feed_id, name_contains_clause(Topic, topic_filter)
+        ).exists()
+
+
+    @staticmethod
+    def _name_filter(name_filter, search_backend):
+        """
+        Private method that builds the filter of the feeds with a name containing a term.
+        """
+        matches = indexed_name_matches('feeds_search', name_filter, search_backend)
+        if matches is not None:
+            return FeedSummary.feed_id.in_(matches)
+
+        return name_contains_clause(FeedSummary, name_filter)
+
+
+    def _get_keyset_page(self, query, is_public) -> dict:
+        """
+        Private method that gets the page of feeds that follows the cursor.
+
+        Args:
+            query (Query): The filtered feed summaries query.
+            is_public (bool): Whether the creator of each feed is serialized.
+
+        Returns:
+            dict: Serialized feeds, the cursor of the next page and the optional total count.
+
+        Raises:
+            ValueError: If the cursor or the count mode is invalid.
+        """
+        if self.count not in ('none', 'exact'):
+            raise ValueError("Invalid count mode, it must be 'none' or 'exact'.")
+
+        # The total is optional because it requires a full COUNT(*) of the filtered feeds
+        total = query.order_by(None).count() if self.count == 'exact' else None
+
+        # Continue strictly after the last feed of the previous page. The row-value comparison
+        # lets the composite (updated_at, feed_id) indexes seek straight to the position
+        if self.cursor:
+            updated_at, feed_id = self._decode_cursor(self.cursor)
+            query = query.filter(tuple_(FeedSummary.updated_at, FeedSummary.feed_id) < tuple_(updated_at, feed_id))
+
+        # Fetch one extra feed to know if there is a next page
+        items = query.order_by(FeedSummary.updated_at.desc(), FeedSummary.feed_id.desc()).limit(self.per_page + 1).all()
+        has_next = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        self.feed_ids = [summary.feed_id for summary in items]
+
+        response = {
+            "feeds": [self._serialize_feed(summary, is_public) for summary in items],
+            "per_page": self.per_page,
+            "next_cursor": self._encode_cursor(items[-1]) if has_next else None
+        }
+
+        if total is not None:
+            response["total"] = total
+
+        return response
+
+
+    @staticmethod
+    def _serialize_feed(summary, is_public) -> dict:
+        """
+        Private method that serializes the summary of a feed of a listing.
+        """
+        return {
+            "name": summary.name,
+            "creator": summary.creator if is_public else None,
+            "is_public": summary.is_public,
+            "topics": summary.topics,
+            "created_at": summary.created_at,
+            "updated_at": summary.updated_at
+        }
+
+
+    @staticmethod
+    def _encode_cursor(summary) -> str:
+        """
+        Private method that encodes the keyset position of a feed summary as an opaque cursor.
+        """
+        position = json.dumps([summary.updated_at.isoformat(), summary.feed_id])
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """
+        Private method that decodes an opaque cursor into its (updated_at, id) keyset position.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            position = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            updated_at, feed_id = json.loads(position)
+            return datetime.fromisoformat(updated_at), int(feed_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError('Invalid pagination cursor.') from e
+
+
+    @staticmethod
+    def get_feeds_fingerprint(user_id=None, is_public=None) -> tuple:
+        """
+        Get a cheap fingerprint of a feed listing: the number of feeds and their latest update.
+
+        Every write changes it: inserting or updating a feed sets its updated_at to the newest
+        value, and deleting one lowers the count. The topics and resources of a feed are written
+        when the feed is created. The topic and name filters are not applied, so the fingerprint
+        covers every page and filter of the listing and is served by the composite indexes.
+        It is read from the same read model as the listings.
+
+        Args:
+            user_id (int): Fingerprint the feeds of this user.
+            is_public (bool): Fingerprint the public or private feeds.
+
+        Returns:
+            tuple: The number of feeds and the latest updated_at (None when there are no feeds).
+        """
+        query = select(func.count(FeedSummary.feed_id), func.max(FeedSummary.updated_at))
+
+        if user_id is not None:
+            query = query.where(FeedSummary.user_id == user_id)
+        if is_public is not None:
+            query = query.where(FeedSummary.is_public == is_public)
+
+        return tuple(db.session.execute(query).one())
+
+
+    @staticmethod
+    def get_feed_last_modified(feed_id) -> datetime:
+        """
+        Get the date of the last change of a feed, with the same checks as its details
+        but without loading its topics and resources.
+
+        Args:
+            feed_id (int): The ID of the feed.
+
+        Returns:
+            datetime: The updated_at of the feed.
+
+        Raises:
+            NotFound: If the feed doesn't exist.
+            ValueError: If the feed is private and belongs to another user.
+        """
+        feed = db.session.execute(
+            select(Feed.user_id, Feed.is_public, Feed.updated_at).where(Feed.id == feed_id)
+        ).first()
+        if feed is None:
+            abort(404)
+
+        verify_jwt_in_request()
+        if not feed.is_public and feed.user_id != current_user.id:
+            raise ValueError("You do not have permission to view this feed.")
+
+        return feed.updated_at
+
+
+    def get_feed_details(self, feed_id, resources_per_topic=20):
         """
         Get detailed information about a specific feed, including its topics and resources.
-        Paginate the resources (limit to 20 most recent).
+        Paginate the resources (limit to 20 most recent per topic), grouped by topic name.
+
+        The feed and its topics are loaded in one query, and the most recent resources of
+        every topic are loaded in a second, windowed query.
 
         Args:
             feed_id (int): The ID of the feed to fetch.
+            resources_per_topic (int): The maximum number of resources per topic.
 
         Returns:
             dict: Serialized feed details and resources.
         """
-        # Fetch the feed
-        feed = Feed.query.get_or_404(feed_id)
+        feed = self._get_visible_feed(feed_id)
+
+        # Serialize feed details
+        feed_details = self._serialize_feed_details(feed)
+        feed_details["resources"] = {topic.name: [] for topic in feed.topics}
+
+        # Get the resources of every topic (limit to the most recent ones) in one query
+        topic_names = {topic.id: topic.name for topic in feed.topics}
+        for resource in self._get_top_resources(list(topic_names), resources_per_topic):
+            feed_details["resources"][topic_names[resource.topic_id]].append(self._serialize_resource(resource))
+
+        return feed_details
+
+
+    def stream_feed_details(self, feed_id, resources_per_topic=20, batch_size=500):
+        """
+        Stream the details of a feed as newline-delimited JSON (NDJSON).
+
+        The feed is checked and loaded before the stream starts, so a missing feed or a missing
+        permission is still reported as an error response. The resources are then read from a
+        server-side cursor, batch_size rows at a time, and each batch is written as one chunk,
+        so the memory used does not depend on the number of resources.
+
+        The stream contains one line with the feed details, one line per resource (with the
+        name of its topic), and a last line with the number of resources sent.
+
+        Args:
+            feed_id (int): The ID of the feed to fetch.
+            resources_per_topic (int): The maximum number of resources per topic.
+            batch_size (int): The number of resources fetched and written at a time.
+
+        Returns:
+            generator: The NDJSON chunks of the response.
+        """
+        feed = self._get_visible_feed(feed_id)
+
+        feed_details = self._serialize_feed_details(feed)
+        topic_names = {topic.id: topic.name for topic in feed.topics}
+
+        def generate():
+            yield current_app.json.dumps({"type": "feed", **feed_details}) + "\n"
+
+            count = 0
+            if topic_names:
+                query = self._top_resources_query(list(topic_names), resources_per_topic)
+                result = db.session.execute(query.execution_options(yield_per=batch_size))
+
+                for rows in result.partitions():
+                    count += len(rows)
+                    yield "".join(
+                        current_app.json.dumps({
+                            "type": "resource",
+                            "topic": topic_names[resource.topic_id],
+                            **self._serialize_resource(resource)
+                        }) + "\n"
+                        for resource in rows
+                    )
+
+            yield current_app.json.dumps({"type": "end", "resources": count}) + "\n"
+
+        return generate()
+
+
+    @staticmethod
+    def _get_visible_feed(feed_id):
+        """
+        Private method that gets a feed with its topics, if it is public or belongs to the current user.
+
+        Args:
+            feed_id (int): The ID of the feed to fetch.
+
+        Returns:
+            Feed: The feed, with its topics loaded.
+
+        Raises:
+            ValueError: If the feed is private and belongs to another user.
+        """
+        # Fetch the feed and its topics in the same round trip
+        feed = Feed.query.options(joinedload(Feed.topics)).filter_by(id=feed_id).first_or_404()
 
         # Ensure the JWT is verified before accessing JWT-dependent methods
         verify_jwt_in_request()
 
-        # Now you can safely call get_jwt_identity()
-        user_id = get_jwt_identity()
-        print(f"User ID: {user_id}")
-        print(f"Feed User ID: {feed.user_id}")
+        # Now you can safely use the current user
+        user_id = current_user.id
 
         # Ensure the feed is public or belongs to the current user
         if not feed.is_public and feed.user_id != user_id:
             raise ValueError("You do not have permission to view this feed.")
 
-        # Serialize feed details
-        feed_details = {
+        return feed
+
+
+    @staticmethod
+    def _serialize_feed_details(feed) -> dict:
+        """
+        Private method that serializes the details of a feed, without its resources.
+        """
+        return {
             "name": feed.name,
             "is_public": feed.is_public,
             "topics": [topic.name for topic in feed.topics],
             "created_at": feed.created_at,
-            "updated_at": feed.updated_at,
-            "resources": []
+            "updated_at": feed.updated_at
         }
 
-        # Get the resources (limit to 20 most recent)
-        for topic in feed.topics:
-            resources = Resource.query.filter_by(topic_id=topic.id).order_by(Resource.date.desc()).limit(20).all()
-            serialized_resources = [{
-                "title": resource.title,
-                "date": resource.date,
-                "type": resource.type,
-                "editorial": resource.editorial,
-                "languages": resource.languages
-            } for resource in resources]
-            feed_details["resources"].extend(serialized_resources)
 
-        return feed_details
+    @staticmethod
+    def _serialize_resource(resource) -> dict:
+        """
+        Private method that serializes a resource row of the feed details.
+        """
+        return {
+            "title": resource.title,
+            "date": resource.date,
+            "type": resource.type,
+            "editorial": resource.editorial,
+            "languages": resource.languages
+        }
+
+
+    @staticmethod
+    def _get_top_resources(topic_ids: list, limit: int) -> list:
+        """
+        Private method that gets the most recent resources of each topic in a single query.
+
+        Args:
+            topic_ids (list): The IDs of the topics.
+            limit (int): The maximum number of resources per topic.
+
+        Returns:
+            list: The resource rows, ordered by topic and rank.
+        """
+        if not topic_ids:
+            return []
+
+        return db.session.execute(PaginationService._top_resources_query(topic_ids, limit)).all()
+
+
+    @staticmethod
+    def _top_resources_query(topic_ids: list, limit: int):
+        """
+        Private method that builds the query of the most recent resources of each topic.
+
+        The resources are ranked with ROW_NUMBER() partitioned by topic, newest first,
+        and only the first rows of each partition are returned.
+
+        Args:
+            topic_ids (list): The IDs of the topics.
+            limit (int): The maximum number of resources per topic.
+
+        Returns:
+            Select: The query of the resource rows, ordered by topic and rank.
+        """
+        row_number = func.row_number().over(
+            partition_by=Resource.topic_id,
+            order_by=(Resource.date.desc(), Resource.id.desc())
+        ).label('row_number')
+
+        ranked = select(
+            Resource.topic_id, Resource.title, Resource.date, Resource.type,
+            Resource.editorial, Resource.languages, row_number
+        ).where(Resource.topic_id.in_(topic_ids)).subquery()
+
+        return select(ranked).where(ranked.c.row_number <= limit).order_by(ranked.c.topic_id, ranked.c.row_number)
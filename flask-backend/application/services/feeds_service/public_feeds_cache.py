@@ -0,0 +1,314 @@
+# Description:
+"""
+    This file contains the response cache of the public feed listing pages,
+        invalidated by tags when the feeds they show are written.
+"""
+
+# Import the necessary modules
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+def feed_cache_state(feed) -> dict:
+    """
+    Get the fields of a feed that decide which cached listing pages it appears in.
+
+    Args:
+        feed (Feed): The feed, before or after a write.
+
+    Returns:
+        dict: The ID, public status, name and topic names of the feed.
+    """
+    return {
+        'id': feed.id,
+        'is_public': feed.is_public,
+        'name': feed.name,
+        'topics': [topic.name for topic in feed.topics]
+    }
+
+
+def invalidate_feed_cache(feed_id: int, *states) -> None:
+    """
+    Invalidate the cached listing pages affected by a write of a feed, if the cache is enabled.
+
+    Args:
+        feed_id (int): The ID of the written feed.
+        *states (dict): The feed cache states before and/or after the write (see feed_cache_state).
+    """
+    cache = current_app.extensions.get('public_feeds_cache')
+    if cache is not None and cache.enabled:
+        cache.invalidate_feed(feed_id, *states)
+
+
+class PublicFeedsCache:
+    """
+    A Flask extension that caches the /feeds/list-public responses, bounded by entries,
+    bytes and TTL, with LRU eviction.
+
+    Each page is tagged so writes only drop the pages they change:
+
+    - "feed:<id>" for every feed on the page: an update or delete of the feed drops them.
+    - "listing:<filters>" for the pages that depend on the whole listing of a filter (the
+      offset pages, the first keyset page and the exact totals): a public feed inserted,
+      updated or deleted drops them only when it matches the topic and name filters.
+
+    Keyset pages after the first one keep only their feed tags, since new and updated feeds
+    are placed at the top of the listing.
+
+    A write committed while a request builds its page invalidates the cache before the page
+    is stored, so every invalidation bumps a generation: the request reads it before its query
+    (generation) and the page is not stored if it changed since (set). A replica may still show
+    the feeds from before a write, so the pages are read from the primary while the last
+    invalidation is within the read-your-writes window (invalidated_within).
+
+    Each process has its own cache, so writes made by other processes are only seen once
+    the entries expire (TTL).
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.ttl = 30
+        self.max_entries = 512
+        self.max_bytes = 16 * 1024 * 1024
+        self.current_bytes = 0
+
+        # key -> (expires_at, body, etag, tags)
+        self._entries = OrderedDict()
+        # tag -> keys of the entries with the tag
+        self._tags = {}
+        # listing tag -> (topic filter, name filter), normalized
+        self._listings = {}
+        self._lock = threading.Lock()
+
+        # Incremented by every invalidation, to drop the pages read before it
+        self._generation = 0
+        self._invalidated_at = None
+
+        # Counters exposed to measure the cache
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        if app is not None:
+            self.init_app(app)
+
+
+    def init_app(self, app) -> None:
+        """
+        Read the cache settings from the app configuration and register the extension.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        self.enabled = app.config.get('PUBLIC_FEEDS_CACHE_ENABLED', True)
+        self.ttl = app.config.get('PUBLIC_FEEDS_CACHE_TTL', 30)
+        self.max_entries = app.config.get('PUBLIC_FEEDS_CACHE_MAX_ENTRIES', 512)
+        self.max_bytes = app.config.get('PUBLIC_FEEDS_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+
+        app.extensions['public_feeds_cache'] = self
+
+
+    @staticmethod
+    def make_key(args) -> str:
+        """
+        Build the cache key of a listing request from its query arguments.
+
+        Args:
+            args (MultiDict): The query arguments of the request.
+
+        Returns:
+            str: The cache key.
+        """
+        return json.dumps(sorted(args.items(multi=True)))
+
+
+    @staticmethod
+    def listing_tag(topic_filter: str = None, name_filter: str = None) -> str:
+        """
+        Build the tag shared by the pages of a listing with the given filters.
+
+        Returns:
+            str: The listing tag.
+        """
+        return 'listing:' + json.dumps([(topic_filter or '').casefold(), (name_filter or '').casefold()])
+
+
+    def get(self, key: str):
+        """
+        Get a cached response by key, refreshing its LRU position.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            tuple: The response body and its ETag.
+            None: If the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+
+    def generation(self) -> int:
+        """
+        Get the invalidation generation, to read before querying the page passed to set.
+
+        Returns:
+            int: The number of invalidations so far.
+        """
+        with self._lock:
+            return self._generation
+
+
+    def invalidated_within(self, seconds: float) -> bool:
+        """
+        Check if the cache was invalidated in the last seconds, when the replicas may not have the write yet.
+
+        Args:
+            seconds (float): The replication lag to allow for, the read-your-writes window.
+
+        Returns:
+            bool: True if the pages stored now must be read from the primary.
+        """
+        with self._lock:
+            return self._invalidated_at is not None and time.monotonic() - self._invalidated_at < seconds
+
+
+    def set(self, key: str, body: bytes, etag: str, feed_ids: list, topic_filter: str = None,
+            name_filter: str = None, whole_listing: bool = True, generation: int = None) -> None:
+        """
+        Store a response with its tags, evicting the least recently used entries when over the bounds.
+
+        The response is not stored if the cache was invalidated after the given generation, since
+        its page may have been read before the write that invalidated it.
+
+        Args:
+            key (str): The cache key.
+            body (bytes): The response body.
+            etag (str): The ETag of the response.
+            feed_ids (list): The IDs of the feeds on the page.
+            topic_filter (str, optional): The topic filter of the listing.
+            name_filter (str, optional): The name filter of the listing.
+            whole_listing (bool, optional): Whether the page depends on the whole listing of its filters.
+            generation (int, optional): The generation read before querying the page (see generation).
+        """
+        size = len(body)
+        if size > self.max_bytes:
+            return
+
+        tags = {f"feed:{feed_id}" for feed_id in feed_ids}
+        if whole_listing:
+            listing_tag = self.listing_tag(topic_filter, name_filter)
+            tags.add(listing_tag)
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.time() + self.ttl, body, etag, tags)
+            self.current_bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            if whole_listing:
+                self._listings[listing_tag] = ((topic_filter or '').casefold(), (name_filter or '').casefold())
+
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+
+    def invalidate_feed(self, feed_id: int, *states) -> None:
+        """
+        Drop the pages that show a feed, and the listings the feed belongs to before or after a write.
+
+        Args:
+            feed_id (int): The ID of the written feed.
+            *states (dict): The feed cache states before and/or after the write.
+        """
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            tags = [f"feed:{feed_id}"]
+
+            for state in states:
+                if state is None or not state['is_public']:
+                    continue
+                tags.extend(tag for tag, filters in self._listings.items() if self._matches(state, *filters))
+
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache.
+        """
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            self._entries.clear()
+            self._tags.clear()
+            self._listings.clear()
+            self.current_bytes = 0
+
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters and size.
+
+        Returns:
+            dict: Whether the cache is enabled, its hits, misses, invalidations, entries and bytes.
+        """
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes
+            }
+
+
+    @staticmethod
+    def _matches(state: dict, topic_filter: str, name_filter: str) -> bool:
+        """
+        Private method that checks if a feed belongs to a listing with the given normalized filters.
+        """
+        if name_filter and name_filter not in state['name'].casefold():
+            return False
+        if topic_filter and not any(topic_filter in topic.casefold() for topic in state['topics']):
+            return False
+        return True
+
+
+    def _remove(self, key: str) -> None:
+        """
+        Private method that removes an entry, its tags and its bytes. The lock must be held.
+        """
+        _, body, _, tags = self._entries.pop(key)
+        self.current_bytes -= len(body)
+
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+                self._listings.pop(tag, None)
@@ -27,21 +27,35 @@ class ResourcesService:
                 continue
 
             for item in data['data']['items']:
-                
-                # Extract the start and end year from the item data
-                start_year = item.get('start_year', '')
-                end_year = item.get('end_year', '')
-
-                new_resource = Resource(
-                    topic_id=topic_model.id,
-                    title=item['title'],
-                    date=f"{start_year} - {end_year}" if start_year and end_year else item.get('date', ''),
-                    type=item.get('type', ''),
-                    editorial=item.get('editorial', ''),
-                    languages=','.join(item.get('language', []))
-                )
+                new_resource = Resource(**self.build_resource_row(topic_model.id, item))
                 db.session.add(new_resource)
                 resources_models.append(new_resource)
 
         db.session.commit()
-        return resources_models
\ No newline at end of file
+        return resources_models
+
+
+    @staticmethod
+    def build_resource_row(topic_id: int, item: dict) -> dict:
+        """
+        Build the column values of a resource from an item of the Azure Function data.
+
+        Args:
+            topic_id (int): The topic ID to which the resource belongs.
+            item (dict): The item data returned by the Azure Function.
+
+        Returns:
+            dict: The column values of the resource.
+        """
+        # Extract the start and end year from the item data
+        start_year = item.get('start_year', '')
+        end_year = item.get('end_year', '')
+
+        return {
+            'topic_id': topic_id,
+            'title': item['title'],
+            'date': f"{start_year} - {end_year}" if start_year and end_year else item.get('date', ''),
+            'type': item.get('type', ''),
+            'editorial': item.get('editorial', ''),
+            'languages': ','.join(item.get('language', []))
+        }
\ No newline at end of file
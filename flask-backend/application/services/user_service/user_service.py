@@ -30,6 +30,7 @@ class UserService(BaseValidationService):
 
         Raises:
             ValueError: If the username or password is missing or does not meet the requirements.
+            PasswordHasherBusy: If too many passwords are being hashed.
         
         Returns:
             JSON: The response JSON with the user details.
@@ -0,0 +1,106 @@
+# Description: Benchmark of the resolution of the user of the JWT token on the protected endpoints.
+"""
+    Sends authenticated requests to protected endpoints with the user cache disabled and
+    enabled, and prints the SQL statements and the median latency per request. Then checks
+    the invalidation: a new login must be seen by the next request, and the token of a
+    deleted user must be rejected with 401. Exits with an error if a check fails.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_current_user --requests 200
+"""
+
+# Import the required modules
+import argparse
+import sys
+import time
+from sqlalchemy import event
+from benchmarks.common import create_benchmark_app, summarize, print_table
+
+
+ENDPOINTS = ['/auth/protected', '/feeds/list?per_page=10', '/feeds/jobs/unknown-job']
+
+
+def login(client, username: str, password: str) -> dict:
+    """
+    Log in and return the CSRF header of the session.
+    """
+    client.post('/auth/login', json={'username': username, 'password': password})
+    return {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+
+
+def run(args) -> int:
+    app = create_benchmark_app()
+
+    from database import db
+    from application.models import User
+
+    cache = app.extensions['current_user_cache']
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *_, **__: statements.append(1))
+
+    client = app.test_client()
+    headers = login(client, 'kiosko', 'kiosko')
+
+    rows = []
+    for enabled in (False, True):
+        cache.enabled = enabled
+        cache.clear()
+        for endpoint in ENDPOINTS:
+            client.get(endpoint, headers=headers)
+
+            statements.clear()
+            durations = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                client.get(endpoint, headers=headers)
+                durations.append(time.perf_counter() - start)
+
+            rows.append([
+                'enabled' if enabled else 'disabled', endpoint,
+                round(len(statements) / args.requests, 2), summarize(durations)['median_ms']
+            ])
+
+    print_table(['user_cache', 'endpoint', 'queries_per_request', 'median_ms'], rows)
+    print(f"\nCache: {cache.stats()}")
+
+    failures = []
+
+    # A login writes the user, the next request must load it again
+    with app.app_context():
+        user_id = User.query.filter_by(username='kiosko').first().id
+        before = cache.get(user_id).last_login
+    time.sleep(0.01)
+    headers = login(client, 'kiosko', 'kiosko')
+
+    # The login time is written with the next batch of the last login writer
+    app.extensions['last_login_writer'].flush()
+    client.get('/auth/protected', headers=headers)
+    with app.app_context():
+        if cache.get(user_id).last_login == before:
+            failures.append('the cached user was not dropped after a login')
+
+    # The token of a deleted user is rejected
+    register = app.test_client()
+    register.post('/user/register', json={'username': 'bench_deleted', 'password': 'Bench-Password-1'})
+    deleted_headers = {'X-CSRF-TOKEN': register.get_cookie('csrf_access_token').value}
+    register.get('/auth/protected', headers=deleted_headers)
+    with app.app_context():
+        db.session.delete(User.query.filter_by(username='bench_deleted').first())
+        db.session.commit()
+    status = register.get('/auth/protected', headers=deleted_headers).status_code
+    print(f"Token of a deleted user: {status}")
+    if status != 401:
+        failures.append(f"the token of a deleted user was answered with {status}")
+
+    if failures:
+        print(f"\nFAILED: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and mode.')
+    sys.exit(run(parser.parse_args()))
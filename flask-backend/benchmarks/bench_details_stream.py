@@ -0,0 +1,108 @@
+# Description: Memory benchmark of the JSON and NDJSON feed details responses.
+"""
+    Seeds a public feed with a growing number of resources per topic, then requests
+    /feeds/details/<id> as one JSON document and as an NDJSON stream. The stream is
+    consumed chunk by chunk and discarded, like a client writing it to disk would.
+
+    Prints the peak Python memory (tracemalloc) and the duration of each request.
+    The JSON peak grows with the feed, the NDJSON peak must stay flat. The durations
+    include the tracemalloc overhead, so only compare them with each other.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_details_stream --sizes 1000 10000 50000 --topics 5
+"""
+
+# Import the required modules
+import argparse
+import time
+import tracemalloc
+from sqlalchemy import insert
+from benchmarks.common import create_benchmark_app, print_table
+from benchmarks.bench_listing_queries import login
+
+
+def seed_feed(topics: int, resources_per_topic: int) -> int:
+    """
+    Insert a public feed of the default user with the given number of topics and resources.
+
+    Returns:
+        int: The ID of the feed.
+    """
+    from database import db
+    from application.models import User, Feed, Topic, Resource
+
+    user_id = User.query.first().id
+    feed_id = db.session.execute(
+        insert(Feed).values(user_id=user_id, name=f"Stream feed {resources_per_topic}", is_public=True).returning(Feed.id)
+    ).scalar_one()
+
+    topic_ids = db.session.execute(
+        insert(Topic).returning(Topic.id), [{'feed_id': feed_id, 'name': f"Topic {index}"} for index in range(topics)]
+    ).scalars().all()
+
+    for topic_id in topic_ids:
+        db.session.execute(insert(Resource), [{
+            'topic_id': topic_id,
+            'title': f"Resource {index} of a long enough newspaper title",
+            'date': f"{1800 + index % 200} - {1850 + index % 200}",
+            'type': 'newspaper',
+            'editorial': 'Benchmark Editorial',
+            'languages': 'English'
+        } for index in range(resources_per_topic)])
+
+    db.session.commit()
+    return feed_id
+
+
+def measure(client, url: str, headers: dict) -> tuple:
+    """
+    Request a URL, consume the body chunk by chunk, and measure the peak memory and duration.
+
+    Returns:
+        tuple: The status code, the body size in bytes, the peak memory in MB and the duration in ms.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    response = client.get(url, headers=headers, buffered=False)
+    size = sum(len(chunk) for chunk in response.iter_encoded())
+    response.close()
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return response.status_code, size, round(peak / 1024 / 1024, 2), round(elapsed * 1000, 1)
+
+
+def run(args) -> None:
+    app = create_benchmark_app()
+
+    from database import db
+
+    rows = []
+    client = app.test_client()
+    csrf = login(client)
+
+    for size in args.sizes:
+        with app.app_context():
+            feed_id = seed_feed(args.topics, size)
+            db.session.remove()
+
+        # Let the JSON response return every resource to compare both formats on the same data
+        app.config['FEED_DETAILS_MAX_RESOURCES_PER_TOPIC'] = size
+        url = f"/feeds/details/{feed_id}?resources_per_topic={size}"
+
+        for label, headers in (('json', {}), ('ndjson', {'Accept': 'application/x-ndjson'})):
+            status, body, peak_mb, elapsed_ms = measure(client, url, {**csrf, **headers})
+            rows.append([args.topics * size, label, status, round(body / 1024 / 1024, 2), peak_mb, elapsed_ms])
+
+    print_table(['resources', 'format', 'status', 'body_mb', 'peak_mb', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Resources per topic.')
+    parser.add_argument('--topics', type=int, default=5)
+    run(parser.parse_args())
@@ -0,0 +1,153 @@
+# Description: Benchmark of the database engine profiles under concurrent reads and writes.
+"""
+    For each engine profile (DATABASE_ENGINE_PROFILE), creates a SQLite database with feeds
+    and runs reader threads (a page of the latest feeds) next to writer threads (an update of
+    a feed, one transaction each) for a fixed duration. Prints the SQLite settings in effect,
+    the reads and writes per second, their 95th percentile latency and the failed operations.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_engine_profiles --readers 4 --writers 2 --duration 5
+"""
+
+# Import the required modules
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import insert, select, update
+from benchmarks.common import print_table
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """
+    Get a percentile of durations in seconds, in milliseconds.
+    """
+    if not samples:
+        return '-'
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 1)
+
+
+def create_profile_app(profile: str, feeds: int):
+    """
+    Create a Flask app with only the database, using an engine profile and a new SQLite file.
+
+    Returns:
+        Flask: The application instance, with its tables created and the feeds seeded.
+    """
+    from flask import Flask
+    from config import DevelopmentConfig
+    from database import db, init_db
+    from application.models import User, Feed
+
+    path = os.path.join(tempfile.mkdtemp(prefix='newsfeed-bench-'), 'profile.db')
+
+    app = Flask(f"bench_engine_profile_{profile}")
+    app.config.from_object(DevelopmentConfig)
+    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}", DATABASE_ENGINE_PROFILE=profile, DEBUG=False)
+    init_db(app)
+
+    with app.app_context():
+        db.create_all()
+        user_id = db.session.execute(
+            insert(User).values(username='bench', password_hash='-').returning(User.id)
+        ).scalar_one()
+        db.session.execute(insert(Feed), [
+            {'user_id': user_id, 'name': f"Profile feed {index}", 'is_public': True} for index in range(feeds)
+        ])
+        db.session.commit()
+
+    return app
+
+
+def run_load(app, readers: int, writers: int, feeds: int, duration: float) -> dict:
+    """
+    Run the reader and writer threads for the given duration.
+
+    Returns:
+        dict: The latencies of the reads and writes, and the failed operations.
+    """
+    from database import db
+    from application.models import Feed
+
+    stop = threading.Event()
+    reads, writes, errors = [], [], []
+
+    def reader(seed: int):
+        generator = random.Random(seed)
+        with app.app_context():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.session.execute(
+                        select(Feed.id, Feed.name, Feed.updated_at)
+                        .order_by(Feed.updated_at.desc()).limit(20).offset(generator.randrange(feeds - 20))
+                    ).all()
+                    db.session.commit()
+                    reads.append(time.perf_counter() - start)
+                except Exception as e:
+                    db.session.rollback()
+                    errors.append(str(e).splitlines()[0])
+
+    def writer(seed: int):
+        generator = random.Random(seed)
+        with app.app_context():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.session.execute(
+                        update(Feed).where(Feed.id == generator.randrange(1, feeds + 1)).values(updated_at=datetime.utcnow())
+                    )
+                    db.session.commit()
+                    writes.append(time.perf_counter() - start)
+                except Exception as e:
+                    db.session.rollback()
+                    errors.append(str(e).splitlines()[0])
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {'reads': reads, 'writes': writes, 'errors': errors}
+
+
+def run(args) -> None:
+    from database import ENGINE_PROFILES
+
+    rows = []
+    for profile in args.profiles or list(ENGINE_PROFILES):
+        app = create_profile_app(profile, args.feeds)
+        settings = app.extensions['database_engine_profile']['settings']
+
+        result = run_load(app, args.readers, args.writers, args.feeds, args.duration)
+        rows.append([
+            profile, settings['journal_mode'], settings['synchronous'], settings['mmap_size'],
+            round(len(result['reads']) / args.duration, 1), percentile(result['reads'], 0.95),
+            round(len(result['writes']) / args.duration, 1), percentile(result['writes'], 0.95),
+            len(result['errors'])
+        ])
+        if result['errors']:
+            print(f"{profile}: {len(result['errors'])} failed operations, e.g. {result['errors'][0]}")
+
+    print(f"readers: {args.readers}, writers: {args.writers}, feeds: {args.feeds}, CPUs: {os.cpu_count()}, duration: {args.duration}s\n")
+    print_table(['profile', 'journal', 'synchronous', 'mmap_size', 'reads_per_s', 'read_p95_ms',
+                 'writes_per_s', 'write_p95_ms', 'errors'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='*', help='Profiles to compare. Defaults to all of them.')
+    parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads.')
+    parser.add_argument('--writers', type=int, default=2, help='Concurrent writer threads.')
+    parser.add_argument('--feeds', type=int, default=2000, help='Feeds of the database.')
+    parser.add_argument('--duration', type=float, default=5, help='Seconds of load per profile.')
+    run(parser.parse_args())
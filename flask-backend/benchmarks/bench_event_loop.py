@@ -0,0 +1,159 @@
+# Description: Benchmark of the async views run on a new event loop per request vs on the persistent event loop.
+"""
+    Measures the per-request overhead of the async views with Flask's default async_to_sync
+    (a new event loop for every request) and with the persistent loop of EventLoopThread:
+
+    - Dispatch: a no-op async view on a bare Flask app, which only measures running the coroutine.
+    - /feeds/test-azure-func: the real endpoint against a local stand-in of the Azure Function,
+      with the topic cache disabled so every request goes upstream. The stand-in counts the TCP
+      connections it accepts, to show the reuse of the pooled connections.
+
+    Each mode is run from concurrent client threads. Prints the median and p95 latency and the
+    requests per second, and exits with an error if the endpoint returns a different document
+    on the persistent loop.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_event_loop --requests 300 --concurrency 4
+"""
+
+# Import the required modules
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+from benchmarks.common import create_benchmark_app, start_azure_function_standin, summarize, print_table
+
+
+TOPICS = ['technology', 'science', 'sports']
+
+
+def measure(send, requests: int, concurrency: int) -> tuple:
+    """
+    Send the requests from concurrent threads and collect their latencies.
+
+    Args:
+        send (function): Sends one request with the client of its thread, returns the response body.
+        requests (int): The number of requests.
+        concurrency (int): The number of client threads.
+
+    Returns:
+        tuple: The latencies in seconds, the total duration and the last response body.
+    """
+    durations = []
+    bodies = []
+
+    def worker(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            bodies.append(send())
+            durations.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, requests // concurrency) for _ in range(concurrency)]:
+            future.result()
+
+    return durations, time.perf_counter() - start, bodies[-1]
+
+
+def row(label: str, mode: str, durations: list, elapsed: float, extra: str = '-') -> list:
+    """
+    Build a result row from the latencies of a run.
+    """
+    p95 = sorted(durations)[int(len(durations) * 0.95) - 1] * 1000
+    return [label, mode, summarize(durations)['median_ms'], round(p95, 3), round(len(durations) / elapsed), extra]
+
+
+def bench_dispatch(args, event_loop_class) -> list:
+    """
+    Measure a no-op async view on a bare Flask app, on a new loop per request and on the persistent loop.
+    """
+    app = Flask(__name__)
+
+    @app.route('/noop')
+    async def noop():
+        return 'ok'
+
+    rows = []
+    for mode in ('per-request', 'persistent'):
+        if mode == 'persistent':
+            app.config['ASYNC_EVENT_LOOP_ENABLED'] = True
+            event_loop_class().init_app(app)
+
+        local = threading.local()
+
+        def send():
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+            return local.client.get('/noop').data
+
+        measure(send, args.concurrency * 10, args.concurrency)
+        durations, elapsed, _ = measure(send, args.requests, args.concurrency)
+        rows.append(row('async no-op view', mode, durations, elapsed))
+
+    return rows
+
+
+def bench_azure_func(args, standin) -> tuple:
+    """
+    Measure /feeds/test-azure-func against the stand-in, on a new loop per request and on the persistent loop.
+    """
+    os.environ['AZURE_FUNCTION_URL'] = standin.url
+    os.environ['AZURE_TOPIC_CACHE_ENABLED'] = 'false'
+    os.environ['AZURE_SINGLE_FLIGHT_ENABLED'] = 'false'
+    app = create_benchmark_app()
+
+    event_loop = app.extensions['event_loop']
+    rows = []
+    bodies = {}
+    for mode in ('per-request', 'persistent'):
+        # Without the instance attribute, Flask runs the async views with its default async_to_sync
+        if mode == 'per-request':
+            del app.async_to_sync
+        else:
+            app.async_to_sync = event_loop.async_to_sync
+
+        local = threading.local()
+
+        def send():
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+                local.client.post('/auth/login', json={'username': 'kiosko', 'password': 'kiosko'})
+                local.headers = {'X-CSRF-TOKEN': local.client.get_cookie('csrf_access_token').value}
+            response = local.client.post('/feeds/test-azure-func', json={'topics': TOPICS}, headers=local.headers)
+            return response.get_json()
+
+        measure(send, args.concurrency * 10, args.concurrency)
+        standin.reset_stats()
+        durations, elapsed, bodies[mode] = measure(send, args.requests, args.concurrency)
+        rows.append(row('/feeds/test-azure-func', mode, durations, elapsed, standin.stats()['connections']))
+
+    return rows, bodies['per-request'] == bodies['persistent']
+
+
+def run(args) -> int:
+    standin = start_azure_function_standin()
+
+    rows, same_documents = bench_azure_func(args, standin)
+
+    from application.event_loop import EventLoopThread
+    rows = bench_dispatch(args, EventLoopThread) + rows
+    standin.shutdown()
+
+    print_table(['view', 'event_loop', 'median_ms', 'p95_ms', 'requests_per_s', 'upstream_connections'], rows)
+
+    if not same_documents:
+        print("\nFAILED: /feeds/test-azure-func returned a different document on the persistent event loop")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300, help='Requests per view and mode.')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent client threads.')
+    sys.exit(run(parser.parse_args()))
@@ -0,0 +1,106 @@
+# Description: Benchmark of the feed listings served from the feed_summaries read model.
+"""
+    Seeds a large database, then compares the pages of the feed listings built by the former
+    query (feeds joined to their creator, with the topics loaded in a second query) with the
+    pages read from the feed_summaries read model. Both must return the same feeds, the
+    script exits with an error otherwise. The duration of a full rebuild of the read model
+    ("flask feeds rebuild-summaries") is printed too.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_feed_summaries --users 100 --feeds-per-user 100 --repeat 30
+"""
+
+# Import the required modules
+import argparse
+import sys
+from benchmarks.common import create_benchmark_app, seed_dataset, summarize, timed, print_table
+
+
+# (listing, filters, page, per_page)
+PAGES = [
+    ('public', {'is_public': True}, 1, 10),
+    ('public', {'is_public': True}, 1, 50),
+    ('public', {'is_public': True}, 200, 20),
+    ('private', {'is_public': False}, 1, 10),
+    ('private', {'is_public': False}, 1, 50),
+]
+
+
+def join_page(filters: dict, page: int, per_page: int) -> list:
+    """
+    Build a listing page with the former query: feeds and creators, then the topics of the page.
+    """
+    from sqlalchemy.orm import joinedload, selectinload
+    from application.models import Feed
+
+    query = Feed.query.options(selectinload(Feed.topics), joinedload(Feed.user)).filter_by(**filters)
+    feeds = query.order_by(Feed.updated_at.desc(), Feed.id.desc()).paginate(page=page, per_page=per_page, error_out=False).items
+
+    return [{
+        "name": feed.name,
+        "creator": feed.user.username,
+        "is_public": feed.is_public,
+        "topics": [topic.name for topic in feed.topics],
+        "created_at": feed.created_at,
+        "updated_at": feed.updated_at
+    } for feed in feeds]
+
+
+def summary_page(filters: dict, page: int, per_page: int) -> list:
+    """
+    Build a listing page from the read model, as PaginationService does.
+    """
+    from application.services.feeds_service import PaginationService
+
+    return PaginationService(page=page, per_page=per_page).get_paginated_feeds(**filters)['feeds']
+
+
+def run(args) -> int:
+    app = create_benchmark_app()
+
+    from database import db
+    from application.services.feeds_service import FeedSummaryService
+
+    with app.app_context():
+        counts = seed_dataset(app, args.users, args.feeds_per_user, args.topics_per_feed, 1)
+        print(f"Seeded: {counts}\n")
+
+        written, seconds = timed(FeedSummaryService.rebuild)
+        print(f"Rebuilt {written} feed summaries in {seconds * 1000:.0f} ms\n")
+        db.session.remove()
+
+    rows = []
+    mismatches = []
+    with app.test_request_context():
+        for listing, filters, page, per_page in PAGES:
+            expected = join_page(filters, page, per_page)
+            actual = summary_page(filters, page, per_page)
+
+            # The creator is only returned on the public listing, and the former query did not
+            # order the topics, so they are compared as sets
+            creator = (lambda feed: None) if listing == 'private' else (lambda feed: feed["creator"])
+            expected = [{**feed, "creator": creator(feed), "topics": sorted(feed["topics"])} for feed in expected]
+            actual = [{**feed, "topics": sorted(feed["topics"])} for feed in actual]
+            if expected != actual:
+                mismatches.append(f"{listing} page {page}")
+
+            join_ms = summarize([timed(join_page, filters, page, per_page)[1] for _ in range(args.repeat)])['median_ms']
+            summary_ms = summarize([timed(summary_page, filters, page, per_page)[1] for _ in range(args.repeat)])['median_ms']
+            rows.append([listing, page, per_page, join_ms, summary_ms, f"{join_ms / summary_ms:.1f}x"])
+
+    print_table(['listing', 'page', 'per_page', 'join_ms', 'summary_ms', 'speedup'], rows)
+
+    if mismatches:
+        print(f"\nFAILED: the read model does not match the joined feeds on {', '.join(mismatches)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--feeds-per-user', type=int, default=100)
+    parser.add_argument('--topics-per-feed', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=30, help='Runs per page and query.')
+    sys.exit(run(parser.parse_args()))
@@ -0,0 +1,68 @@
+# Description: Benchmark of the feed creation write paths (ORM vs bulk).
+"""
+    Inserts one feed with 5 topics and N resources through the original ORM write path
+    and through the single-transaction bulk write path, and reports rows per second.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_feed_write --sizes 1000 10000 100000
+"""
+
+# Import the required modules
+import argparse
+import asyncio
+from benchmarks.common import create_benchmark_app, timed, print_table
+
+
+TOPICS = ['Tennis', 'Cycling', 'Swimming', 'Boxing', 'Sailing']
+
+
+def build_news_data(resources_per_feed: int) -> list:
+    """
+    Build an Azure Function response with the resources spread over the benchmark topics.
+    """
+    per_topic = resources_per_feed // len(TOPICS)
+    return [{
+        'topic': topic,
+        'data': {
+            'totalItems': per_topic,
+            'items': [{
+                'title': f"{topic} chronicle {index}",
+                'start_year': 1900 + index % 100,
+                'end_year': 1910 + index % 100,
+                'type': 'newspaper',
+                'editorial': f"{topic} Weekly",
+                'language': ['English', 'Spanish']
+            } for index in range(per_topic)]
+        }
+    } for topic in TOPICS]
+
+
+def run(sizes: list) -> None:
+    app = create_benchmark_app()
+
+    from application.models import User
+    from application.services import FeedDataHandler
+
+    rows = []
+    with app.app_context():
+        user_id = User.query.first().id
+
+        for size in sizes:
+            news_data = build_news_data(size)
+            inserted_rows = 1 + len(TOPICS) + size // len(TOPICS) * len(TOPICS)
+
+            for write_path in ('orm', 'bulk'):
+                handler = FeedDataHandler({'feed_name': f"Bench {write_path} {size}", 'is_public': True, 'topics': TOPICS})
+                handler._validate_and_initialize_payload()
+
+                _, elapsed = timed(asyncio.run, handler.save_feed(user_id, TOPICS, news_data, write_path=write_path))
+                rows.append([write_path, size, inserted_rows, f"{elapsed:.3f}", f"{inserted_rows / elapsed:,.0f}"])
+
+    print_table(['write_path', 'resources', 'rows', 'seconds', 'rows_per_sec'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Resources per feed.')
+    run(parser.parse_args().sizes)
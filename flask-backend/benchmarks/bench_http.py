@@ -0,0 +1,382 @@
+# Description: End-to-end HTTP benchmark of the feeds API.
+"""
+    Starts the application in its own process, served over HTTP by a threaded WSGI server,
+    on a database seeded with the dataset of "flask seed-bench", and with AZURE_FUNCTION_URL
+    pointing to a local stand-in of the Azure Function (tools/azure_function_standin.py, or the
+    one given with --function-url). Then each endpoint is driven by
+    --concurrency virtual users, each one logged in with its own session:
+
+        login          POST /auth/login
+        list           GET  /feeds/list?page=<n>
+        list_public    GET  /feeds/list-public?topic=<topic>
+        details        GET  /feeds/details/<id>       (public feeds)
+        create_feed    POST /feeds/create-feed
+
+    Prints the throughput and the p50, p95 and p99 latencies of each endpoint, and writes them
+    as JSON (--output). With --compare, the results are compared with an earlier run and the
+    command exits with an error if an endpoint regressed by more than --max-regression percent
+    (p95 latency or throughput). --results compares an existing results file without running.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_http --concurrency 8 --requests 400 --output before.json
+        python -m benchmarks.bench_http --concurrency 8 --requests 400 --compare before.json
+        python -m benchmarks.bench_http --results after.json --compare before.json
+
+    NOTE: The threaded development server of Werkzeug serves the app. The numbers are meant to
+    be compared between runs on the same machine, not as the capacity of a production deployment.
+"""
+
+# Import the required modules
+import argparse
+import datetime
+import itertools
+import json
+import math
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from benchmarks.common import print_table, start_azure_function_standin
+
+
+# Password of the generated users (the password of the default user)
+PASSWORD = 'kiosko'
+
+# Topics searched on the public listing and requested when creating feeds
+TOPICS = ['Tennis', 'Cycling', 'Rowing', 'Judo', 'Marathon', 'Curling']
+
+# Endpoints in the order they are run, the writes last
+ENDPOINTS = ['login', 'list', 'list_public', 'details', 'create_feed']
+
+
+def serve(args) -> None:
+    """
+    Run the application on a free port, in the server process, and print its port once it accepts requests.
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from benchmarks.common import create_benchmark_app, seed_dataset
+
+    app = create_benchmark_app(args.database)
+    if args.seed_users:
+        seed_dataset(app, args.seed_users, args.seed_feeds_per_user, args.seed_topics_per_feed, args.seed_resources_per_topic)
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    print(f"READY {server.server_port}", flush=True)
+    server.serve_forever()
+
+
+def start_server(args, database: str, seed: bool, function_url: str) -> tuple:
+    """
+    Start the server process and wait until it serves requests.
+
+    Returns:
+        tuple: The process and the base URL of the application.
+    """
+    env = dict(os.environ, AZURE_FUNCTION_URL=function_url)
+    env.update(value.split('=', 1) for value in args.env)
+
+    command = [sys.executable, '-m', 'benchmarks.bench_http', '--serve', '--database', database]
+    if seed:
+        command += ['--seed-users', str(args.users), '--seed-feeds-per-user', str(args.feeds_per_user),
+                    '--seed-topics-per-feed', str(args.topics_per_feed), '--seed-resources-per-topic', str(args.resources_per_topic)]
+
+    process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    for line in process.stdout:
+        if line.startswith('READY '):
+            return process, f"http://127.0.0.1:{int(line.split()[1])}"
+
+    raise RuntimeError("The application server exited before serving requests.")
+
+
+def prepare_database(args) -> tuple:
+    """
+    Get the database of the run: a copy of the cached dataset (--dataset-cache) or a new file to seed.
+
+    Returns:
+        tuple: The path of the database, and whether the server must seed it.
+    """
+    database = os.path.join(tempfile.mkdtemp(prefix='newsfeed-bench-'), 'http.db')
+    if args.dataset_cache and os.path.exists(args.dataset_cache):
+        with sqlite3.connect(args.dataset_cache) as source, sqlite3.connect(database) as target:
+            source.backup(target)
+        return database, False
+
+    return database, True
+
+
+class VirtualUser:
+    """
+    A client of the API with its own session (JWT cookies), logged in as one of the generated users.
+    """
+
+    def __init__(self, base_url: str, username: str):
+        self.client = httpx.Client(base_url=base_url, timeout=60)
+        self.username = username
+        self.headers = {}
+
+    def login(self) -> httpx.Response:
+        response = self.client.post('/auth/login', json={'username': self.username, 'password': PASSWORD})
+        csrf_token = self.client.cookies.get('csrf_access_token')
+        if csrf_token:
+            self.headers = {'X-CSRF-TOKEN': csrf_token}
+        return response
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return self.client.request(method, url, headers=self.headers, **kwargs)
+
+
+def make_requests(public_feed_ids: list, pages: int):
+    """
+    Build the request of each endpoint for the n-th call of a virtual user.
+
+    Returns:
+        dict: A function (user, n) -> response per endpoint.
+    """
+    sequence = itertools.count()
+
+    return {
+        'login': lambda user, n: user.login(),
+        'list': lambda user, n: user.request('GET', f"/feeds/list?page={n % pages + 1}&per_page=10"),
+        'list_public': lambda user, n: user.request('GET', f"/feeds/list-public?topic={TOPICS[n % len(TOPICS)]}&page={n % 3 + 1}"),
+        'details': lambda user, n: user.request('GET', f"/feeds/details/{public_feed_ids[n % len(public_feed_ids)]}"),
+        'create_feed': lambda user, n: user.request('POST', '/feeds/create-feed', json={
+            'feed_name': f"HTTP bench feed {next(sequence)}",
+            'is_public': n % 2 == 0,
+            'topics': [TOPICS[n % len(TOPICS)], TOPICS[(n + 1) % len(TOPICS)]]
+        }),
+    }
+
+
+def drive(users: list, send, requests: int) -> dict:
+    """
+    Send the requests of one endpoint from all the virtual users at once, and summarize them.
+
+    Returns:
+        dict: The requests, errors, throughput and latency percentiles of the endpoint.
+    """
+    durations = []
+    errors = []
+    lock = threading.Lock()
+    per_user = max(1, requests // len(users))
+
+    def run_user(index: int) -> None:
+        user = users[index]
+        for n in range(per_user):
+            start = time.perf_counter()
+            try:
+                status = send(user, index * per_user + n).status_code
+            except httpx.HTTPError:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                durations.append(elapsed)
+                if status is None or status >= 400:
+                    errors.append(status)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        list(executor.map(run_user, range(len(users))))
+    wall = time.perf_counter() - start
+
+    return summarize_latencies(durations, wall, len(errors))
+
+
+def summarize_latencies(durations: list, wall: float, errors: int) -> dict:
+    """
+    Summarize the latencies of an endpoint (nearest-rank percentiles, in milliseconds).
+    """
+    ordered = sorted(durations)
+    percentile = lambda p: round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000, 2)
+
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / wall, 1),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+        'p50_ms': percentile(50),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+        'max_ms': round(ordered[-1] * 1000, 2)
+    }
+
+
+def run_benchmark(args) -> dict:
+    """
+    Start the stand-in and the application, drive every endpoint and return the results of the run.
+    """
+    standin = None
+    if not args.function_url:
+        standin = start_azure_function_standin(args.upstream_latency / 1000, items_per_topic=args.upstream_items)
+    database, seed = prepare_database(args)
+    process, base_url = start_server(args, database, seed, args.function_url or standin.url)
+
+    try:
+        if seed and args.dataset_cache:
+            with sqlite3.connect(database) as source, sqlite3.connect(args.dataset_cache) as target:
+                source.backup(target)
+
+        with sqlite3.connect(database) as connection:
+            public_feed_ids = [row[0] for row in connection.execute(
+                "SELECT id FROM feeds WHERE is_public = 1 ORDER BY id LIMIT 1000"
+            )]
+            generated_users = connection.execute("SELECT count(*) FROM users WHERE username LIKE 'bench_user_%'").fetchone()[0]
+
+        users = [VirtualUser(base_url, f"bench_user_{index % generated_users}") for index in range(args.concurrency)]
+        requests = make_requests(public_feed_ids, pages=max(1, args.feeds_per_user // 10))
+
+        # The login endpoint also opens the session of every virtual user used by the next endpoints
+        endpoints = {}
+        for name in args.endpoints:
+            count = args.login_requests if name == 'login' else args.requests
+            if args.warmup and name != 'login':
+                drive(users, requests[name], args.warmup)
+            endpoints[name] = drive(users, requests[name], count)
+            if name == 'login':
+                endpoints[name]['note'] = 'bcrypt in the password hashing pool'
+
+    finally:
+        process.terminate()
+        process.wait()
+        if standin is not None:
+            standin.shutdown()
+        shutil.rmtree(os.path.dirname(database), ignore_errors=True)
+
+    return {
+        'benchmark': 'bench_http',
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'config': {
+            'concurrency': args.concurrency, 'requests': args.requests, 'login_requests': args.login_requests,
+            'warmup': args.warmup, 'upstream_latency_ms': args.upstream_latency, 'upstream_items': args.upstream_items,
+            'function_url': args.function_url, 'env': args.env,
+            'dataset': {'users': args.users, 'feeds_per_user': args.feeds_per_user,
+                        'topics_per_feed': args.topics_per_feed, 'resources_per_topic': args.resources_per_topic}
+        },
+        'endpoints': endpoints
+    }
+
+
+def compare(baseline: dict, results: dict, max_regression: float) -> list:
+    """
+    Print the changes of each endpoint against a baseline run, and return the regressions.
+    """
+    rows = []
+    regressions = []
+    for name, current in results['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+
+        change = lambda key: (current[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        p95_change, throughput_change = change('p95_ms'), change('throughput_rps')
+        regressed = p95_change > max_regression or throughput_change < -max_regression
+        if regressed:
+            regressions.append(name)
+
+        rows.append([
+            name, f"{before['p50_ms']} -> {current['p50_ms']}", f"{before['p95_ms']} -> {current['p95_ms']} ({p95_change:+.1f}%)",
+            f"{before['p99_ms']} -> {current['p99_ms']}", f"{before['throughput_rps']} -> {current['throughput_rps']} ({throughput_change:+.1f}%)",
+            'REGRESSION' if regressed else 'ok'
+        ])
+
+    if baseline.get('config') != results.get('config'):
+        print("NOTE: the runs were made with different settings, see 'config' in the result files.\n")
+
+    print_table(['endpoint', 'p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'status'], rows)
+    return regressions
+
+
+def git_commit() -> str:
+    """
+    Get the commit of the working tree, if it is a git checkout.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> int:
+    if args.results:
+        with open(args.results) as results_file:
+            results = json.load(results_file)
+    else:
+        results = run_benchmark(args)
+
+        rows = [[name, *[result[key] for key in ('requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]]
+                for name, result in results['endpoints'].items()]
+        print_table(['endpoint', 'requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'], rows)
+
+        output = args.output or os.path.join('benchmarks', 'results', f"bench_http-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('commit')}):\n")
+        regressions = compare(baseline, results, args.max_regression)
+        if regressions:
+            print(f"\nFAILED: {', '.join(regressions)} regressed by more than {args.max_regression}%")
+            return 1
+
+    failed = [name for name, result in results['endpoints'].items() if result['errors']]
+    if failed:
+        print(f"\nFAILED: requests with errors on {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=8, help='Virtual users sending requests at the same time.')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per endpoint.')
+    parser.add_argument('--login-requests', type=int, default=40, help='Requests of the login endpoint (bcrypt is slow on purpose).')
+    parser.add_argument('--warmup', type=int, default=40, help='Requests per endpoint sent before measuring.')
+    parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS, choices=ENDPOINTS, help='Endpoints to run (login is needed by the others).')
+    parser.add_argument('--users', type=int, default=200, help='Generated users of the dataset.')
+    parser.add_argument('--feeds-per-user', type=int, default=50, help='Generated feeds per user.')
+    parser.add_argument('--topics-per-feed', type=int, default=5, help='Generated topics per feed.')
+    parser.add_argument('--resources-per-topic', type=int, default=10, help='Generated resources per topic.')
+    parser.add_argument('--dataset-cache', help='SQLite file keeping the seeded dataset between runs, copied for each run.')
+    parser.add_argument('--upstream-latency', type=float, default=0, help='Milliseconds each topic takes to answer on the Azure Function stand-in.')
+    parser.add_argument('--upstream-items', type=int, default=5, help='Items per topic returned by the Azure Function stand-in.')
+    parser.add_argument('--function-url', help='URL of an Azure Function stand-in already running, instead of starting one.')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help='Setting of the application (e.g. PUBLIC_FEEDS_CACHE_ENABLED=false).')
+    parser.add_argument('--output', help='JSON results file. Defaults to benchmarks/results/bench_http-<time>.json.')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare with.')
+    parser.add_argument('--results', help='Compare this JSON results file instead of running the benchmark.')
+    parser.add_argument('--max-regression', type=float, default=10, help='Allowed p95 latency or throughput regression, in percent.')
+
+    # Options of the server process
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    parser.add_argument('--seed-users', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--seed-feeds-per-user', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--seed-topics-per-feed', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--seed-resources-per-topic', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        sys.exit(0)
+
+    if 'login' not in args.endpoints and not args.results:
+        args.endpoints = ['login'] + args.endpoints
+
+    sys.exit(run(args))
@@ -0,0 +1,104 @@
+# Description: Benchmark of the composite indexes on the feed access paths.
+"""
+    Seeds a large database, then runs the hot listing and details queries without
+    and with the composite indexes declared on the models. Prints the SQLite query
+    plan and the median latency of each query in both states.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_indexes --users 200 --feeds-per-user 100 --topics-per-feed 3 --resources-per-topic 10
+"""
+
+# Import the required modules
+import argparse
+from sqlalchemy import text
+from benchmarks.common import create_benchmark_app, seed_dataset, summarize, timed, print_table
+
+
+INDEXES = {
+    'ix_feeds_is_public_updated_at': ('feeds', 'is_public, updated_at, id'),
+    'ix_feeds_user_id_updated_at': ('feeds', 'user_id, updated_at, id'),
+    'ix_topics_name': ('topics', 'name'),
+    'ix_resources_topic_id_date': ('resources', 'topic_id, date'),
+}
+
+QUERIES = {
+    'public_page': (
+        "SELECT id, name, updated_at FROM feeds WHERE is_public = 1 "
+        "ORDER BY updated_at DESC, id DESC LIMIT 10"
+    ),
+    'public_keyset_page': (
+        "SELECT id, name, updated_at FROM feeds WHERE is_public = 1 "
+        "AND (updated_at, id) < (:updated_at, :id) "
+        "ORDER BY updated_at DESC, id DESC LIMIT 10"
+    ),
+    'user_page': (
+        "SELECT id, name, updated_at FROM feeds WHERE user_id = :user_id "
+        "ORDER BY updated_at DESC, id DESC LIMIT 10"
+    ),
+    'topics_of_feeds': "SELECT id, feed_id, name FROM topics WHERE feed_id IN (:feed_id, :feed_id + 1, :feed_id + 2)",
+    'topic_by_name': "SELECT feed_id FROM topics WHERE name = 'Tennis' LIMIT 50",
+    'details_top_resources': (
+        "SELECT * FROM (SELECT topic_id, title, date, ROW_NUMBER() OVER "
+        "(PARTITION BY topic_id ORDER BY date DESC, id DESC) AS row_number FROM resources "
+        "WHERE topic_id IN (SELECT id FROM topics WHERE feed_id = :feed_id)) WHERE row_number <= 20"
+    ),
+}
+
+
+def measure(db, params: dict, repeat: int) -> dict:
+    """
+    Get the query plan and the latency of every benchmark query.
+    """
+    results = {}
+    for name, sql in QUERIES.items():
+        plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).all()
+        samples = [timed(lambda: db.session.execute(text(sql), params).all())[1] for _ in range(repeat)]
+        results[name] = {'plan': ' | '.join(row[-1] for row in plan), **summarize(samples)}
+    return results
+
+
+def run(args) -> None:
+    app = create_benchmark_app()
+
+    from database import db
+
+    with app.app_context():
+        counts = seed_dataset(app, args.users, args.feeds_per_user, args.topics_per_feed, args.resources_per_topic)
+        print(f"Seeded: {counts}\n")
+
+        middle = db.session.execute(text(
+            "SELECT id, updated_at FROM feeds WHERE is_public = 1 ORDER BY updated_at DESC, id DESC LIMIT 1 OFFSET :offset"
+        ), {'offset': counts['feeds'] // 3}).one()
+        params = {'updated_at': middle.updated_at, 'id': middle.id, 'user_id': 2, 'feed_id': middle.id}
+
+        # Before: drop the composite indexes
+        for name in INDEXES:
+            db.session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        db.session.execute(text("ANALYZE"))
+        before = measure(db, params, args.repeat)
+
+        # After: create them again
+        for name, (table, columns) in INDEXES.items():
+            db.session.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+        db.session.execute(text("ANALYZE"))
+        after = measure(db, params, args.repeat)
+        db.session.commit()
+
+    rows = [[name, before[name]['median_ms'], after[name]['median_ms'],
+             f"{before[name]['median_ms'] / max(after[name]['median_ms'], 0.001):.1f}x"] for name in QUERIES]
+    print_table(['query', 'before_ms', 'after_ms', 'speedup'], rows)
+
+    print('\nQuery plans:')
+    for name in QUERIES:
+        print(f"\n{name}\n  before: {before[name]['plan']}\n  after:  {after[name]['plan']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--feeds-per-user', type=int, default=100)
+    parser.add_argument('--topics-per-feed', type=int, default=3)
+    parser.add_argument('--resources-per-topic', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query.')
+    run(parser.parse_args())
@@ -0,0 +1,143 @@
+# Description: Micro-benchmark of the JSON provider of the responses.
+"""
+    Serializes realistic payloads of the API (a listing page, the feed details and the
+    response of a feed creation) as JSON responses with Flask's default provider, and with
+    FastJSONProvider using the standard library and orjson. Prints the median duration of
+    each one, and exits with an error if the standard library and orjson documents differ.
+
+    The responses are compact, as in production (debug mode indents them).
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_json_provider --repeat 50
+"""
+
+# Import the required modules
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from benchmarks.common import create_benchmark_app, summarize, timed, print_table
+
+
+def listing_page(feeds: int, generator: random.Random) -> dict:
+    """
+    Build a page of /feeds/list-public.
+    """
+    now = datetime(2024, 9, 1, 10, 30)
+    return {
+        "feeds": [{
+            "name": f"Feed {index}",
+            "creator": f"user_{generator.randrange(1000)}",
+            "is_public": True,
+            "topics": generator.sample(['Tennis', 'Cycling', 'Swimming', 'Boxing', 'Sailing', 'Rowing'], 3),
+            "created_at": now - timedelta(days=index),
+            "updated_at": now - timedelta(minutes=index)
+        } for index in range(feeds)],
+        "page": 1,
+        "pages": 100
+    }
+
+
+def resource(index: int, generator: random.Random, topic_id: int = None) -> dict:
+    """
+    Build a resource as serialized by the feed details and the feed creation.
+    """
+    start_year = generator.randint(1850, 1960)
+    row = {
+        "title": f"Chronicle of the Olympic Games, édition n° {generator.randrange(100_000)}",
+        "date": f"{start_year} - {start_year + generator.randint(0, 30)}",
+        "type": "newspaper",
+        "editorial": "Bench Weekly",
+        "languages": "English, Français"
+    }
+    if topic_id is not None:
+        row.update(id=index, topic_id=topic_id)
+    return row
+
+
+def feed_details(topics: int, resources_per_topic: int, generator: random.Random) -> dict:
+    """
+    Build the response of /feeds/details/<id>.
+    """
+    names = [f"Topic {index}" for index in range(topics)]
+    return {
+        "name": "Kiosko News Public",
+        "is_public": True,
+        "topics": names,
+        "created_at": datetime(2024, 9, 1, 10, 30, 15, 123456),
+        "updated_at": datetime(2024, 9, 2, 8, 0, 0, 654321),
+        "resources": {name: [resource(index, generator) for index in range(resources_per_topic)] for name in names}
+    }
+
+
+def created_feed(topics: int, resources_per_topic: int, generator: random.Random) -> dict:
+    """
+    Build the response of /feeds/create-feed.
+    """
+    return {
+        "feed_id": 1,
+        "feed_name": "Kiosko News Public",
+        "is_public": True,
+        "topics": {
+            f"Topic {topic}": [resource(topic * resources_per_topic + index, generator, topic) for index in range(resources_per_topic)]
+            for topic in range(topics)
+        },
+        "not_found_topics": []
+    }
+
+
+def run(args) -> int:
+    app = create_benchmark_app()
+
+    from flask.json.provider import DefaultJSONProvider
+    from application.json_provider import FastJSONProvider, orjson
+
+    if orjson is None:
+        print("orjson is not installed, only the standard library can be measured.")
+
+    generator = random.Random(42)
+    payloads = {
+        'listing (50 feeds)': listing_page(50, generator),
+        'details (5 x 100 resources)': feed_details(5, 100, generator),
+        'create-feed (5 x 1000 resources)': created_feed(5, 1000, generator),
+    }
+
+    providers = {'default': DefaultJSONProvider(app)}
+    for serializer in ('stdlib', 'orjson'):
+        app.config['JSON_SERIALIZER'] = serializer
+        providers[serializer] = FastJSONProvider(app)
+    for provider in providers.values():
+        provider.compact = True
+
+    rows = []
+    mismatches = []
+    with app.app_context():
+        for name, payload in payloads.items():
+            bodies = {key: provider.response(payload).get_data() for key, provider in providers.items()}
+            if bodies['stdlib'] != bodies['orjson']:
+                mismatches.append(name)
+
+            medians = {
+                key: summarize([timed(provider.response, payload)[1] for _ in range(args.repeat)])['median_ms']
+                for key, provider in providers.items()
+            }
+            rows.append([
+                name, len(bodies['orjson']), medians['default'], medians['stdlib'], medians['orjson'],
+                f"{medians['default'] / medians['orjson']:.1f}x"
+            ])
+
+    print_table(['payload', 'bytes', 'default_ms', 'stdlib_ms', 'orjson_ms', 'speedup'], rows)
+    print(f"\nDates: default {providers['default'].dumps(datetime(2024, 9, 1, 10, 30))}, "
+          f"FastJSONProvider {providers['orjson'].dumps(datetime(2024, 9, 1, 10, 30))}")
+
+    if mismatches:
+        print(f"\nFAILED: the standard library and orjson documents differ on {', '.join(mismatches)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50, help='Serializations per payload and provider.')
+    sys.exit(run(parser.parse_args()))
@@ -0,0 +1,153 @@
+# Description: Benchmark of the last login writes during concurrent logins.
+"""
+    Sends logins of many users from concurrent clients for a fixed duration, with the last
+    login times written in one transaction per login (LAST_LOGIN_WRITE_MODE=sync) and in
+    batches. Prints the logins per second, the login latency and the write transactions.
+    bcrypt runs inline with a low work factor, so the database writes dominate the login.
+
+    After each run the writer is shut down, and the benchmark exits with an error if a user
+    that logged in has no last_login in the database.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_last_login --users 200 --concurrency 8 --duration 5
+"""
+
+# Import the required modules
+import argparse
+import os
+import sys
+import threading
+import time
+from sqlalchemy import event, insert
+from benchmarks.common import create_benchmark_app, print_table
+
+
+PASSWORD = 'bench-password'
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """
+    Get a percentile of durations in seconds, in milliseconds.
+    """
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 1)
+
+
+def seed_users(count: int) -> list:
+    """
+    Insert users sharing one password hash, and return their usernames.
+    """
+    from database import db
+    from application.models import User
+    from flask import current_app
+
+    password_hash = current_app.extensions['password_hasher'].hash(PASSWORD)
+    usernames = [f"bench_user_{index}" for index in range(count)]
+    db.session.execute(insert(User), [{'username': username, 'password_hash': password_hash} for username in usernames])
+    db.session.commit()
+    return usernames
+
+
+def run_logins(app, usernames: list, concurrency: int, duration: float) -> dict:
+    """
+    Log the users in from concurrent clients for the given duration.
+
+    Returns:
+        dict: The latencies of the logins, the failed logins and the users that logged in.
+    """
+    stop = threading.Event()
+    durations = []
+    failed = []
+    logged_in = set()
+    lock = threading.Lock()
+
+    def client_loop(offset: int):
+        client = app.test_client()
+        index = offset
+        while not stop.is_set():
+            username = usernames[index % len(usernames)]
+            index += concurrency
+
+            start = time.perf_counter()
+            response = client.post('/auth/login', json={'username': username, 'password': PASSWORD})
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                if response.status_code == 201:
+                    durations.append(elapsed)
+                    logged_in.add(username)
+                else:
+                    failed.append(response.status_code)
+
+    threads = [threading.Thread(target=client_loop, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {'durations': durations, 'failed': failed, 'logged_in': logged_in}
+
+
+def run(args) -> int:
+    os.environ['PASSWORD_HASH_ROUNDS'] = '4'
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'
+    app = create_benchmark_app()
+
+    from database import db
+    from application.models import User
+
+    writer = app.extensions['last_login_writer']
+    commits = []
+    with app.app_context():
+        usernames = seed_users(args.users)
+        event.listen(db.engine, 'commit', lambda *_: commits.append(1))
+
+    rows = []
+    failures = []
+    for mode in ('sync', 'batched'):
+        writer.shutdown()
+        writer.mode = mode
+
+        # Reset the last logins, to check that every logged in user is written
+        with app.app_context():
+            db.session.query(User).filter(User.username.in_(usernames)).update({'last_login': None})
+            db.session.commit()
+
+        commits.clear()
+        result = run_logins(app, usernames, args.concurrency, args.duration)
+        writer.shutdown()
+        transactions = len(commits)
+
+        with app.app_context():
+            written = {
+                username for (username,) in
+                db.session.query(User.username).filter(User.username.in_(usernames), User.last_login.isnot(None))
+            }
+        missing = result['logged_in'] - written
+        if missing:
+            failures.append(f"{len(missing)} users without their last login in {mode} mode")
+
+        rows.append([
+            mode, args.concurrency, round(len(result['durations']) / args.duration, 1), len(result['failed']),
+            percentile(result['durations'], 0.5), percentile(result['durations'], 0.95), transactions
+        ])
+
+    print(f"users: {args.users}, CPUs: {os.cpu_count()}, duration: {args.duration}s\n")
+    print_table(['last_login', 'clients', 'logins_per_s', 'failed', 'login_p50_ms', 'login_p95_ms', 'commits'], rows)
+    print(f"\nWriter: {writer.stats()}")
+
+    if failures:
+        print(f"\nFAILED: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200, help='Users logging in.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent login clients.')
+    parser.add_argument('--duration', type=float, default=5, help='Seconds of logins per mode.')
+    sys.exit(run(parser.parse_args()))
@@ -0,0 +1,128 @@
+# Description: Query count check of the feed listing endpoints.
+"""
+    Calls /feeds/list and /feeds/list-public with growing page sizes and counts the SQL
+    statements each request executes. The listings must cost a constant number of queries
+    regardless of the page size, the script exits with an error otherwise.
+
+    Each request is then repeated with the ETag it returned (If-None-Match), which must be
+    answered with 304 by the fingerprint query alone (or without any query when the page
+    is in the public listing cache).
+
+    The same checks run with the tests (tests/test_listing_queries.py), this script prints
+    the counts behind them.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_listing_queries --feeds 60
+"""
+
+# Import the required modules
+import argparse
+import sys
+from sqlalchemy import event, insert
+from benchmarks.common import create_benchmark_app, print_table
+
+
+PAGE_SIZES = [1, 10, 50]
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed on an engine.
+    """
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._increment)
+
+    def _increment(self, *args, **kwargs):
+        self.count += 1
+
+
+def seed_feeds(count: int) -> None:
+    """
+    Insert public and private feeds with two topics each for the default user.
+    """
+    from database import db
+    from application.models import User, Feed, Topic
+    from application.services.feeds_service import FeedSummaryService
+
+    user_id = User.query.first().id
+    for index in range(count):
+        feed_id = db.session.execute(
+            insert(Feed).values(user_id=user_id, name=f"Listing feed {index}", is_public=index % 2 == 0).returning(Feed.id)
+        ).scalar_one()
+        db.session.execute(insert(Topic), [{'feed_id': feed_id, 'name': name} for name in ('Tennis', f"Topic {index}")])
+    FeedSummaryService.rebuild()
+
+
+def login(client) -> dict:
+    """
+    Log in with the default user and return the CSRF header of the session.
+    """
+    client.post('/auth/login', json={'username': 'kiosko', 'password': 'kiosko'})
+    headers = {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+
+    # Write the last login now, the batch would evict the cached user in the middle of the pages
+    with client.application.app_context():
+        client.application.extensions['last_login_writer'].flush()
+
+    # Load the user of the token into the user cache, so the first measured page doesn't count it
+    client.get('/auth/protected', headers=headers)
+    return headers
+
+
+def run(feeds: int) -> int:
+    app = create_benchmark_app()
+
+    from database import db
+
+    with app.app_context():
+        seed_feeds(feeds)
+        counter = QueryCounter(db.engine)
+
+    client = app.test_client()
+    headers = login(client)
+
+    rows = []
+    counts = {}
+    not_modified_failures = []
+    for endpoint in ('/feeds/list', '/feeds/list-public', '/feeds/list-public?topic=tennis'):
+        for per_page in PAGE_SIZES:
+            separator = '&' if '?' in endpoint else '?'
+            url = f"{endpoint}{separator}per_page={per_page}"
+
+            counter.count = 0
+            response = client.get(url, headers=headers)
+            items = len(response.get_json()['feeds'])
+            queries = counter.count
+
+            # Revalidate the page with its ETag
+            counter.count = 0
+            revalidation = client.get(url, headers={**headers, 'If-None-Match': response.headers['ETag']})
+
+            counts.setdefault(endpoint, set()).add(queries)
+            rows.append([endpoint, per_page, items, queries, revalidation.status_code, counter.count])
+
+            if revalidation.status_code != 304 or counter.count > 1:
+                not_modified_failures.append(url)
+
+    print_table(['endpoint', 'per_page', 'feeds', 'queries', 'revalidation', 'revalidation_queries'], rows)
+
+    # The number of queries must not depend on the page size
+    growing = [endpoint for endpoint, values in counts.items() if len(values) > 1]
+    if growing:
+        print(f"\nFAILED: the query count grows with the page size on {', '.join(growing)}")
+        return 1
+
+    # A revalidation must be answered with 304 by the single fingerprint query, at most
+    if not_modified_failures:
+        print(f"\nFAILED: the revalidation did not return 304 with one query on {', '.join(not_modified_failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=60, help='Number of feeds to seed.')
+    sys.exit(run(parser.parse_args().feeds))
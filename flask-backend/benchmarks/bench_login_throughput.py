@@ -0,0 +1,103 @@
+# Description: Benchmark of the login throughput and of the feed reads during a login burst.
+"""
+    Sends logins from concurrent clients for a fixed duration while another client reads
+    /feeds/list-public in a loop, with the passwords hashed inline on the request threads
+    (PASSWORD_HASH_WORKERS=0) and in the pool of hashing processes. Prints the logins per
+    second and the latency of the feed reads, next to the latency of the reads alone.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_login_throughput --concurrency 8 --duration 5 --workers 2 --rounds 10
+"""
+
+# Import the required modules
+import argparse
+import os
+import threading
+import time
+from benchmarks.common import create_benchmark_app, print_table
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """
+    Get a percentile of durations in seconds, in milliseconds.
+    """
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 1)
+
+
+def run_load(app, concurrency: int, duration: float) -> dict:
+    """
+    Run the login clients and the feed reader for the given duration.
+
+    Returns:
+        dict: The number of logins, the rejected logins and the latencies of the feed reads.
+    """
+    stop = threading.Event()
+    logins = []
+    rejected = []
+    reads = []
+
+    def login_client():
+        client = app.test_client()
+        while not stop.is_set():
+            status = client.post('/auth/login', json={'username': 'kiosko', 'password': 'kiosko'}).status_code
+            (logins if status == 201 else rejected).append(status)
+
+    def reader():
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/feeds/list-public?per_page=10')
+            reads.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=login_client) for _ in range(concurrency)] + [threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {'logins': len(logins), 'rejected': len(rejected), 'reads': reads}
+
+
+def run(args) -> None:
+    os.environ['PASSWORD_HASH_ROUNDS'] = str(args.rounds)
+    app = create_benchmark_app()
+
+    hasher = app.extensions['password_hasher']
+    app.extensions['public_feeds_cache'].enabled = False
+
+    rows = []
+    baseline = run_load(app, 0, args.duration)
+    rows.append(['reads alone', 0, '-', '-', len(baseline['reads']),
+                 percentile(baseline['reads'], 0.5), percentile(baseline['reads'], 0.95)])
+
+    for mode, workers in (('inline', 0), ('process pool', args.workers)):
+        hasher.shutdown()
+        hasher.workers = workers
+
+        # Start the pool before measuring
+        hasher.verify('kiosko', hasher.hash('kiosko'))
+
+        result = run_load(app, args.concurrency, args.duration)
+        rows.append([
+            f"{mode} ({workers} workers)" if workers else mode, args.concurrency,
+            round(result['logins'] / args.duration, 1), result['rejected'], len(result['reads']),
+            percentile(result['reads'], 0.5), percentile(result['reads'], 0.95)
+        ])
+
+    hasher.shutdown()
+
+    print(f"bcrypt rounds: {args.rounds}, CPUs: {os.cpu_count()}, duration: {args.duration}s\n")
+    print_table(['hashing', 'login_clients', 'logins_per_s', 'rejected', 'reads', 'read_p50_ms', 'read_p95_ms'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent login clients.')
+    parser.add_argument('--duration', type=float, default=5, help='Seconds of load per mode.')
+    parser.add_argument('--workers', type=int, default=2, help='Hashing processes of the pool.')
+    parser.add_argument('--rounds', type=int, default=10, help='bcrypt work factor.')
+    run(parser.parse_args())
@@ -0,0 +1,69 @@
+# Description: Benchmark of the response cache of /feeds/list-public.
+"""
+    Seeds a large database, then requests a set of /feeds/list-public pages repeatedly
+    with the response cache disabled and enabled, and prints the median latency and the
+    cache counters. A write to one public feed is then made to show how many cached
+    pages it invalidates.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_public_feeds_cache --users 100 --feeds-per-user 50 --repeat 50
+"""
+
+# Import the required modules
+import argparse
+from benchmarks.common import create_benchmark_app, seed_dataset, summarize, timed, print_table
+
+
+URLS = [
+    '/feeds/list-public',
+    '/feeds/list-public?page=5&per_page=20',
+    '/feeds/list-public?cursor=&per_page=10',
+    '/feeds/list-public?topic=tennis',
+    '/feeds/list-public?topic=row&per_page=50',
+    '/feeds/list-public?name=feed 7-',
+]
+
+
+def run(args) -> None:
+    app = create_benchmark_app()
+
+    with app.app_context():
+        counts = seed_dataset(app, args.users, args.feeds_per_user, args.topics_per_feed, 1)
+        print(f"Seeded: {counts}\n")
+
+    cache = app.extensions['public_feeds_cache']
+    client = app.test_client()
+
+    rows = []
+    for enabled in (False, True):
+        cache.enabled = enabled
+        cache.clear()
+        for url in URLS:
+            samples = [timed(client.get, url)[1] for _ in range(args.repeat)]
+            rows.append(['on' if enabled else 'off', url, summarize(samples)['median_ms']])
+
+    print_table(['cache', 'url', 'median_ms'], rows)
+    print(f"\nCache: {cache.stats()}")
+
+    # Update one public feed that is on the first page: only the pages showing it or listing it are dropped
+    from database import db
+    from application.models import Feed
+    from application.services.feeds_service.public_feeds_cache import feed_cache_state
+
+    with app.app_context():
+        feed = Feed.query.filter_by(is_public=True).order_by(Feed.updated_at.desc(), Feed.id.desc()).first()
+        state = feed_cache_state(feed)
+        before = cache.stats()['entries']
+        cache.invalidate_feed(feed.id, state)
+        print(f"Write to feed {feed.id} ({state['topics']}): {before - cache.stats()['entries']} of {before} cached pages invalidated")
+        db.session.remove()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--feeds-per-user', type=int, default=50)
+    parser.add_argument('--topics-per-feed', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=50, help='Requests per page and cache state.')
+    run(parser.parse_args())
@@ -0,0 +1,106 @@
+# Description: Check of the routing of the read-only endpoints to a SQLite stand-in replica.
+"""
+    Runs the application with a second SQLite file as its replica (DATABASE_REPLICA_URLS),
+    filled from the primary with the same copy as "flask replica sync", and checks the routing:
+
+    - The listing and details endpoints run their queries on the replica.
+    - A client that updates a feed reads its own write from the primary during the
+      read-your-writes window, while another client still reads the stale replica.
+    - The listing cache is filled from the primary during the window after the update, so
+      the other client's listing is not cached from the stale replica.
+    - After a sync, the other client sees the update. Once the window is over, the writer
+      reads the replica again, and so does the listing cache.
+
+    Prints the statements run on each database per step, and exits with an error if a check fails.
+    The user of the JWT token is always loaded from the primary, on the first request of each client.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_replica_routing --window 1
+"""
+
+# Import the required modules
+import argparse
+import os
+import sys
+import tempfile
+import time
+from sqlalchemy import event
+from benchmarks.common import create_benchmark_app, print_table
+
+
+def login(client) -> dict:
+    """
+    Log in with the default user and return the CSRF header of the session.
+    """
+    client.post('/auth/login', json={'username': 'kiosko', 'password': 'kiosko'})
+    return {'X-CSRF-TOKEN': client.get_cookie('csrf_access_token').value}
+
+
+def run(args) -> int:
+    directory = tempfile.mkdtemp(prefix='newsfeed-bench-')
+    os.environ['DATABASE_REPLICA_URLS'] = f"sqlite:///{os.path.join(directory, 'replica.db')}"
+    os.environ['READ_YOUR_WRITES_WINDOW'] = str(args.window)
+    app = create_benchmark_app(os.path.join(directory, 'primary.db'))
+
+    from database import db, sync_sqlite_replicas
+    from application.models import Feed
+
+    replica = app.extensions['database_replicas'][0]
+    counts = {'primary': 0, 'replica': 0}
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *_, **__: counts.__setitem__('primary', counts['primary'] + 1))
+        event.listen(replica, 'before_cursor_execute', lambda *_, **__: counts.__setitem__('replica', counts['replica'] + 1))
+        feed_id = Feed.query.filter_by(name='Kiosko News Public').first().id
+        sync_sqlite_replicas(db.engine, [replica])
+
+    writer, reader = app.test_client(), app.test_client()
+    writer_headers, reader_headers = login(writer), login(reader)
+
+    rows = []
+    failures = []
+
+    def step(label: str, client, method: str, url: str, headers: dict, expected_name: str = None, expected_database: str = None):
+        """
+        Send a request, record the statements it ran on each database and check where it read from.
+        """
+        counts.update(primary=0, replica=0)
+        payload = {'feed_name': 'Renamed feed', 'is_public': True} if method == 'PUT' else None
+        body = client.open(url, method=method, headers=headers, json=payload).get_json(silent=True) or {}
+
+        # The user of the token is always loaded from the primary (once, then cached)
+        database = 'replica' if counts['replica'] else 'primary'
+        rows.append([label, f"{method} {url}", body.get('name', '-'), counts['primary'], counts['replica']])
+
+        if expected_database and database != expected_database:
+            failures.append(f"'{label}' read from the {database}, expected the {expected_database}")
+        if expected_name and body.get('name') != expected_name:
+            failures.append(f"'{label}' returned {body.get('name')!r}, expected {expected_name!r}")
+
+    step('listing (no write)', reader, 'GET', '/feeds/list-public', reader_headers, expected_database='replica')
+    step('details (no write)', reader, 'GET', f"/feeds/details/{feed_id}", reader_headers, 'Kiosko News Public', 'replica')
+    step('writer updates the feed', writer, 'PUT', f"/feeds/{feed_id}", writer_headers)
+    step('writer reads its write', writer, 'GET', f"/feeds/details/{feed_id}", writer_headers, 'Renamed feed', 'primary')
+    step('other client, listing refill', reader, 'GET', '/feeds/list-public', reader_headers, expected_database='primary')
+    step('other client, replica behind', reader, 'GET', f"/feeds/details/{feed_id}", reader_headers, 'Kiosko News Public', 'replica')
+
+    with app.app_context():
+        sync_sqlite_replicas(db.engine, [replica])
+    step('other client, after sync', reader, 'GET', f"/feeds/details/{feed_id}", reader_headers, 'Renamed feed', 'replica')
+
+    time.sleep(args.window + 0.1)
+    step('writer, window over', writer, 'GET', f"/feeds/details/{feed_id}", writer_headers, 'Renamed feed', 'replica')
+    step('listing refill, window over', reader, 'GET', '/feeds/list-public?per_page=5', reader_headers, expected_database='replica')
+
+    print_table(['step', 'request', 'feed_name', 'primary_statements', 'replica_statements'], rows)
+
+    if failures:
+        print(f"\nFAILED: {'; '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--window', type=float, default=1, help='Read-your-writes window in seconds.')
+    sys.exit(run(parser.parse_args()))
@@ -0,0 +1,188 @@
+# Description: Benchmark of the application startup, from the import of the app to the first request served.
+"""
+    Starts the application (app.py) in new processes and measures, in each process, the time to
+    import and create the app and the time to serve its first request (/feeds/list-public), with
+    the SQL statements run at startup:
+
+    - development and production startup modes (STARTUP_MODE), on a new and on a seeded database.
+    - Several workers starting together on a new migrated database, as gunicorn without preload.
+      Checks that the database is seeded exactly once.
+    - The app loaded once and the workers forked from it, as gunicorn --preload. The time of the
+      workers is measured from the fork. Checks that every worker serves its first request.
+
+    Exits with an error if a check fails.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_startup --workers 4
+"""
+
+# Import the required modules (the startup of the app is timed from here, it is imported later)
+import time
+
+PROCESS_START = time.perf_counter()
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+from benchmarks.common import print_table
+
+
+def measure_startup() -> dict:
+    """
+    Import the app, serve its first request and return the durations, in the process being measured.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+    event.listen(Engine, 'before_cursor_execute', lambda *_, **__: statements.append(1))
+
+    import app as wsgi
+    loaded = time.perf_counter()
+    startup_statements = len(statements)
+
+    status = wsgi.app.test_client().get('/feeds/list-public').status_code
+    served = time.perf_counter()
+
+    return {
+        'create_app_ms': (loaded - PROCESS_START) * 1000,
+        'first_request_ms': (served - loaded) * 1000,
+        'total_ms': (served - PROCESS_START) * 1000,
+        'statements': startup_statements,
+        'status': status
+    }
+
+
+def measure_preloaded(workers: int) -> dict:
+    """
+    Import the app once, fork the workers and return the durations of the app and of each worker from its fork.
+    """
+    import app as wsgi
+    loaded = time.perf_counter()
+
+    children = []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        forked = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            status = wsgi.app.test_client().get('/feeds/list-public').status_code
+            result = {'first_request_ms': (time.perf_counter() - forked) * 1000, 'status': status}
+            os.write(write_end, json.dumps(result).encode())
+            os._exit(0)
+
+        os.close(write_end)
+        children.append((pid, read_end))
+
+    results = []
+    for pid, read_end in children:
+        with os.fdopen(read_end) as pipe:
+            output = pipe.read()
+        os.waitpid(pid, 0)
+        results.append(json.loads(output) if output else {'first_request_ms': 0, 'status': None})
+
+    return {'create_app_ms': (loaded - PROCESS_START) * 1000, 'workers': results}
+
+
+def start_processes(database: str, mode: str, count: int, *child_args) -> list:
+    """
+    Start processes running this benchmark as a child, wait for them and return their JSON results.
+    """
+    env = dict(os.environ, DEV_DATABASE_DOCKER_URL=f"sqlite:///{database}", DEV_DATABASE_URL=f"sqlite:///{database}", STARTUP_MODE=mode)
+    processes = [
+        subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_startup', '--child', *child_args], env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        for _ in range(count)
+    ]
+
+    results = []
+    for process in processes:
+        output, _ = process.communicate()
+        lines = output.decode().strip().splitlines()
+        results.append(json.loads(lines[-1]) if lines and process.returncode == 0 else None)
+    return results
+
+
+def migrate(database: str) -> None:
+    """
+    Create the schema of a new database with the migrations (flask db upgrade).
+    """
+    env = dict(os.environ, DEV_DATABASE_DOCKER_URL=f"sqlite:///{database}", DEV_DATABASE_URL=f"sqlite:///{database}", STARTUP_MODE='production', FLASK_APP='app.py')
+    subprocess.run(['flask', 'db', 'upgrade'], env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def seeded_rows(database: str) -> tuple:
+    """
+    Count the default users and feeds of a database.
+    """
+    with sqlite3.connect(database) as connection:
+        users = connection.execute("SELECT count(*) FROM users WHERE username = 'kiosko'").fetchone()[0]
+        feeds = connection.execute("SELECT count(*) FROM feeds").fetchone()[0]
+    return users, feeds
+
+
+def run(args) -> int:
+    directory = tempfile.mkdtemp(prefix='newsfeed-bench-')
+    rows = []
+    failures = []
+
+    def record(scenario: str, mode: str, results: list, total_key: str = 'total_ms') -> None:
+        if any(result is None or result['status'] != 200 for result in results):
+            failures.append(f"'{scenario}' ({mode}): a process failed to start or to serve its first request")
+            results = [result for result in results if result is not None]
+        if not results:
+            return
+        median = lambda key: round(statistics.median(result[key] for result in results), 1) if key in results[0] else '-'
+        rows.append([scenario, mode, len(results), median('create_app_ms'), median('first_request_ms'), median(total_key), median('statements')])
+
+    # One process, new then seeded database
+    for mode in ('development', 'production'):
+        database = os.path.join(directory, f"{mode}.db")
+        if mode == 'production':
+            migrate(database)
+        record('new database', mode, start_processes(database, mode, 1))
+        record('seeded database', mode, start_processes(database, mode, 1))
+
+    # Workers starting together on a new migrated database
+    database = os.path.join(directory, 'workers.db')
+    migrate(database)
+    record(f"{args.workers} workers, new database", 'production', start_processes(database, 'production', args.workers))
+    if seeded_rows(database) != (1, 2):
+        failures.append(f"The workers seeded {seeded_rows(database)} (users, feeds), expected (1, 2)")
+
+    # App preloaded once, workers forked from it
+    if hasattr(os, 'fork'):
+        preloaded = start_processes(database, 'production', 1, '--preload', str(args.workers))[0]
+        if preloaded is None:
+            failures.append("The preloaded app failed to start")
+        else:
+            rows.append(['preloaded app (master)', 'production', 1, round(preloaded['create_app_ms'], 1), '-', '-', '-'])
+            record(f"{args.workers} workers forked from it", 'production', preloaded['workers'], 'first_request_ms')
+
+    print_table(['scenario', 'startup_mode', 'processes', 'create_app_ms', 'first_request_ms', 'ready_ms', 'startup_statements'], rows)
+    print("\nready_ms: from the import of the app to the first response, or from the fork for the preloaded workers.")
+
+    if failures:
+        print(f"\nFAILED: {'; '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes started together.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--preload', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_preloaded(args.preload) if args.preload else measure_startup()))
+        sys.exit(0)
+
+    sys.exit(run(args))
@@ -0,0 +1,101 @@
+# Description: Benchmark of the topic and feed name filters of /feeds/list-public.
+"""
+    Seeds a large database, then pages through the public feeds filtered by topic
+    and by feed name with every search strategy:
+
+    - join_ilike: the former JOIN topics + ILIKE '%term%' query (full scan, duplicate feeds).
+    - like: EXISTS with ILIKE '%term%' (distinct feeds, scan in page order).
+    - fts5: the FTS5 trigram search index for selective terms, the like strategy otherwise.
+
+    Prints the median latency of the first page of each filter. The seeded topics share a
+    small vocabulary, so a few rare topics are added to measure selective terms as well:
+    common terms match a large share of the feeds and are found quickly by any scan that
+    stops at the first page, while rare terms are where the search index pays off.
+
+    Usage (from the flask-backend directory):
+
+        python -m benchmarks.bench_topic_search --users 200 --feeds-per-user 100 --topics-per-feed 3
+"""
+
+# Import the required modules
+import argparse
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import selectinload
+from benchmarks.common import create_benchmark_app, seed_dataset, summarize, timed, print_table
+
+
+# Rare topics added to a few public feeds
+RARE_TOPICS = ['Curling', 'Underwater hockey', 'Sepak takraw']
+
+FILTERS = [
+    ('topic', 'enn'),
+    ('topic', 'archery'),
+    ('topic', 'curl'),
+    ('topic', 'takraw'),
+    ('topic', 'Te'),
+    ('name', '12345'),
+    ('name', 'evening marathon'),
+]
+
+
+def join_ilike_page(Feed, Topic, field: str, term: str, per_page: int) -> list:
+    """
+    Get a page of public feeds with the former JOIN + ILIKE filter.
+    """
+    query = Feed.query.options(selectinload(Feed.topics)).filter_by(is_public=True)
+    if field == 'topic':
+        query = query.join(Topic).filter(Topic.name.ilike(f"%{term}%"))
+    else:
+        query = query.filter(Feed.name.ilike(f"%{term}%"))
+    return query.order_by(Feed.updated_at.desc(), Feed.id.desc()).limit(per_page).all()
+
+
+def run(args) -> None:
+    app = create_benchmark_app()
+
+    from database import db
+    from application.models import Feed, Topic
+    from application.services.feeds_service.pagination_service import PaginationService
+    from application.services.feeds_service import FeedSummaryService
+
+    with app.app_context():
+        counts = seed_dataset(app, args.users, args.feeds_per_user, args.topics_per_feed, 1)
+
+        feed_ids = db.session.execute(select(Feed.id).where(Feed.is_public.is_(True)).limit(len(RARE_TOPICS) * 5)).scalars().all()
+        db.session.execute(insert(Topic), [
+            {'feed_id': feed_id, 'name': RARE_TOPICS[index % len(RARE_TOPICS)]} for index, feed_id in enumerate(feed_ids)
+        ])
+        FeedSummaryService.refresh(feed_ids)
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+        print(f"Seeded: {counts} (search backend: {app.extensions['search_backend']})\n")
+
+    rows = []
+    with app.test_request_context():
+        for field, term in FILTERS:
+            filters = {'topic_filter': term} if field == 'topic' else {'name_filter': term}
+            results = {}
+
+            samples = [timed(lambda: join_ilike_page(Feed, Topic, field, term, args.per_page))[1] for _ in range(args.repeat)]
+            results['join_ilike'] = summarize(samples)['median_ms']
+
+            for backend in ('like', 'fts5'):
+                app.extensions['search_backend'] = backend
+                service = PaginationService(per_page=args.per_page, cursor='')
+                samples = [timed(lambda: service.get_paginated_feeds(is_public=True, **filters))[1] for _ in range(args.repeat)]
+                results[backend] = summarize(samples)['median_ms']
+
+            rows.append([f"{field}={term}", results['join_ilike'], results['like'], results['fts5'],
+                         f"{results['join_ilike'] / max(results['fts5'], 0.001):.1f}x"])
+
+    print_table(['filter', 'join_ilike_ms', 'like_ms', 'fts5_ms', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--feeds-per-user', type=int, default=100)
+    parser.add_argument('--topics-per-feed', type=int, default=3)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per filter and strategy.')
+    run(parser.parse_args())
@@ -0,0 +1,109 @@
+# Description: Shared helpers for the benchmark scripts.
+"""
+    The benchmarks are run from the flask-backend directory as modules, for example:
+
+        python -m benchmarks.bench_feed_write
+
+    Each benchmark builds the real application against its own SQLite database file,
+    so the results are not affected by the development database.
+"""
+
+# Import the required modules
+import os
+import statistics
+import tempfile
+import time
+from tools.azure_function_standin import AzureFunctionStandIn
+
+
+def create_benchmark_app(database_path: str = None):
+    """
+    Create the Flask application bound to a benchmark database.
+
+    NOTE: The configuration classes read the environment when config.py is imported,
+    so this must be called before anything imports the application package.
+
+    Args:
+        database_path (str, optional): The SQLite database file. Defaults to a new temporary file.
+
+    Returns:
+        Flask: The application instance.
+    """
+    if database_path is None:
+        database_path = os.path.join(tempfile.mkdtemp(prefix='newsfeed-bench-'), 'bench.db')
+
+    os.environ['DEV_DATABASE_DOCKER_URL'] = f"sqlite:///{os.path.abspath(database_path)}"
+    os.environ['DEV_DATABASE_URL'] = os.environ['DEV_DATABASE_DOCKER_URL']
+
+    from application import create_app
+
+    return create_app()
+
+
+def timed(function, *args, **kwargs) -> tuple:
+    """
+    Run a function and measure its wall-clock duration.
+
+    Returns:
+        tuple: The result of the function and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def summarize(samples: list) -> dict:
+    """
+    Summarize a list of durations in seconds.
+
+    Returns:
+        dict: The median, minimum and maximum durations in milliseconds.
+    """
+    return {
+        'median_ms': round(statistics.median(samples) * 1000, 3),
+        'min_ms': round(min(samples) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3)
+    }
+
+
+def print_table(headers: list, rows: list) -> None:
+    """
+    Print the benchmark results as an aligned text table.
+    """
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    line = '  '.join(f"{{:<{width}}}" for width in widths)
+
+    print(line.format(*headers))
+    print(line.format(*['-' * width for width in widths]))
+    for row in rows:
+        print(line.format(*[str(value) for value in row]))
+
+
+def seed_dataset(app, users: int, feeds_per_user: int, topics_per_feed: int, resources_per_topic: int, seed: int = 42) -> dict:
+    """
+    Insert a large synthetic dataset with the seeder of "flask seed-bench" (SyntheticDataSeeder).
+
+    The dataset only depends on the arguments, so the benchmarks run against the same data.
+
+    Returns:
+        dict: The number of rows inserted per table.
+    """
+    from database import SyntheticDataSeeder
+
+    counts = SyntheticDataSeeder(app, seed=seed).seed_dataset(users, users * feeds_per_user, topics_per_feed, resources_per_topic)
+    counts.pop('seconds')
+    return counts
+
+
+def start_azure_function_standin(latency: float = 0.0, **settings):
+    """
+    Start the local stand-in of the Azure Function (tools/azure_function_standin.py) on a free port, in a background thread.
+
+    Args:
+        latency (float, optional): Seconds each topic takes to answer. Defaults to 0.
+        **settings: The other settings of AzureFunctionStandIn (items_per_topic, error_rate, ...).
+
+    Returns:
+        AzureFunctionStandIn: The running stand-in, with its URL (url), counters (stats()) and shutdown().
+    """
+    return AzureFunctionStandIn(latency=latency, **settings).start()
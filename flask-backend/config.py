@@ -26,6 +26,95 @@ class Config:
     JWT_CSRF_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
     AZURE_FUNCTION_URL = os.environ.get('AZURE_FUNCTION_URL', 'http://localhost:7071/api/get-news-data?')
 
+    # Startup mode: "development" creates the missing tables at boot, "production" requires a migrated database
+    # (flask db upgrade) and only checks its Alembic revision. In both modes the seeding runs once, under a lock
+    STARTUP_MODE = os.environ.get('STARTUP_MODE', 'development')
+    # Lock file of the seeding (defaults to the SQLite database path with a .seed.lock suffix, PostgreSQL uses an advisory lock)
+    STARTUP_LOCK_PATH = os.environ.get('STARTUP_LOCK_PATH') or None
+
+    # Tuning profile of the database engine: "concurrent" (SQLite WAL, synchronous=NORMAL, mmap and page cache,
+    # larger server pools), "durable" (WAL with synchronous=FULL) or "default" (driver defaults), see database/engine_profiles.py
+    DATABASE_ENGINE_PROFILE = os.environ.get('DATABASE_ENGINE_PROFILE', 'concurrent')
+
+    # Read replicas (comma-separated database URLs) for the read-only endpoints, and seconds a client
+    # keeps reading from the primary after its own writes (read-your-writes)
+    DATABASE_REPLICA_URIS = [uri.strip() for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri.strip()]
+    READ_YOUR_WRITES_WINDOW = float(os.environ.get('READ_YOUR_WRITES_WINDOW', 5))
+
+    # Password hashing: bcrypt work factor, worker processes (0 hashes inline on the request thread),
+    # hashes accepted at a time and seconds the next ones wait before being rejected
+    PASSWORD_HASH_ROUNDS = int(os.environ.get('PASSWORD_HASH_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5))
+    # Niceness added to the worker processes, so the request threads get the CPU first (0 keeps the priority of the app)
+    PASSWORD_HASH_NICE = int(os.environ.get('PASSWORD_HASH_NICE', 10))
+
+    # Cache of the users of the JWT tokens (TTL in seconds, bounded by entries), dropped when a user is written
+    CURRENT_USER_CACHE_ENABLED = os.environ.get('CURRENT_USER_CACHE_ENABLED', 'true').lower() == 'true'
+    CURRENT_USER_CACHE_TTL = int(os.environ.get('CURRENT_USER_CACHE_TTL', 60))
+    CURRENT_USER_CACHE_MAX_ENTRIES = int(os.environ.get('CURRENT_USER_CACHE_MAX_ENTRIES', 1024))
+
+    # Writes of the users' last login: "batched" (buffered, written every interval in milliseconds or
+    # once the batch size is reached, in one transaction) or "sync" (one transaction per login)
+    LAST_LOGIN_WRITE_MODE = os.environ.get('LAST_LOGIN_WRITE_MODE', 'batched')
+    LAST_LOGIN_FLUSH_INTERVAL = int(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL', 500))
+    LAST_LOGIN_FLUSH_SIZE = int(os.environ.get('LAST_LOGIN_FLUSH_SIZE', 100))
+
+    # Run the async views on one persistent event loop per process (false: a new event loop per request)
+    ASYNC_EVENT_LOOP_ENABLED = os.environ.get('ASYNC_EVENT_LOOP_ENABLED', 'true').lower() == 'true'
+
+    # Pooled HTTP client settings for the Azure Function (connection limits, keep-alive and timeouts in seconds)
+    AZURE_HTTP_MAX_CONNECTIONS = int(os.environ.get('AZURE_HTTP_MAX_CONNECTIONS', 20))
+    AZURE_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('AZURE_HTTP_MAX_KEEPALIVE_CONNECTIONS', 10))
+    AZURE_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('AZURE_HTTP_KEEPALIVE_EXPIRY', 30))
+    AZURE_HTTP_CONNECT_TIMEOUT = float(os.environ.get('AZURE_HTTP_CONNECT_TIMEOUT', 5))
+    AZURE_HTTP_READ_TIMEOUT = float(os.environ.get('AZURE_HTTP_READ_TIMEOUT', 30))
+    AZURE_HTTP_POOL_TIMEOUT = float(os.environ.get('AZURE_HTTP_POOL_TIMEOUT', 5))
+    # HTTP/2 requires the optional "h2" package (pip install httpx[http2])
+    AZURE_HTTP2 = os.environ.get('AZURE_HTTP2', 'false').lower() == 'true'
+
+    # Per-topic cache of the Azure Function data (TTL in seconds, bounded by entries and bytes)
+    AZURE_TOPIC_CACHE_ENABLED = os.environ.get('AZURE_TOPIC_CACHE_ENABLED', 'true').lower() == 'true'
+    AZURE_TOPIC_CACHE_TTL = int(os.environ.get('AZURE_TOPIC_CACHE_TTL', 600))
+    AZURE_TOPIC_CACHE_MAX_ENTRIES = int(os.environ.get('AZURE_TOPIC_CACHE_MAX_ENTRIES', 1024))
+    AZURE_TOPIC_CACHE_MAX_BYTES = int(os.environ.get('AZURE_TOPIC_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Optional SQLite file tier, survives restarts and is shared by the workers on one host
+    AZURE_TOPIC_CACHE_SQLITE_PATH = os.environ.get('AZURE_TOPIC_CACHE_SQLITE_PATH') or None
+    AZURE_TOPIC_CACHE_SQLITE_MAX_ENTRIES = int(os.environ.get('AZURE_TOPIC_CACHE_SQLITE_MAX_ENTRIES', 10000))
+
+    # Coalesce concurrent Azure Function requests for the same topics into a single upstream call
+    AZURE_SINGLE_FLIGHT_ENABLED = os.environ.get('AZURE_SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+
+    # Serializer of the JSON responses: "auto" (orjson if installed), "orjson" or "stdlib"
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER', 'auto')
+
+    # Write path for feed creation: "bulk" (one transaction, INSERT ... RETURNING) or "orm" (one ORM object per row)
+    FEED_WRITE_PATH = os.environ.get('FEED_WRITE_PATH', 'bulk')
+
+    # Maximum resources per topic of the JSON feed details (the NDJSON stream has no cap)
+    FEED_DETAILS_MAX_RESOURCES_PER_TOPIC = int(os.environ.get('FEED_DETAILS_MAX_RESOURCES_PER_TOPIC', 100))
+    # Resources fetched from the server-side cursor and written per chunk of the NDJSON stream
+    FEED_DETAILS_STREAM_BATCH_SIZE = int(os.environ.get('FEED_DETAILS_STREAM_BATCH_SIZE', 500))
+
+    # Response cache of the public feed listing pages (TTL in seconds, bounded by entries and bytes)
+    PUBLIC_FEEDS_CACHE_ENABLED = os.environ.get('PUBLIC_FEEDS_CACHE_ENABLED', 'true').lower() == 'true'
+    PUBLIC_FEEDS_CACHE_TTL = int(os.environ.get('PUBLIC_FEEDS_CACHE_TTL', 30))
+    PUBLIC_FEEDS_CACHE_MAX_ENTRIES = int(os.environ.get('PUBLIC_FEEDS_CACHE_MAX_ENTRIES', 512))
+    PUBLIC_FEEDS_CACHE_MAX_BYTES = int(os.environ.get('PUBLIC_FEEDS_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+    # Optional SQLite job store, keeps the jobs across restarts and is shared by the workers on one host
+    FEED_JOBS_SQLITE_PATH = os.environ.get('FEED_JOBS_SQLITE_PATH') or None
+    # Background jobs for feed creation (clients opt in with "Prefer: respond-async" or ?mode=async).
+    # On by default only with the SQLite store: the in-process store is not shared by the worker processes
+    FEED_JOBS_ENABLED = (os.environ.get('FEED_JOBS_ENABLED') or str(FEED_JOBS_SQLITE_PATH is not None)).lower() == 'true'
+    FEED_JOBS_WORKERS = int(os.environ.get('FEED_JOBS_WORKERS', 4))
+    FEED_JOBS_MAX_QUEUED = int(os.environ.get('FEED_JOBS_MAX_QUEUED', 100))
+    # Seconds the finished jobs and their results are kept
+    FEED_JOBS_RETENTION = int(os.environ.get('FEED_JOBS_RETENTION', 3600))
+    # Seconds without progress after which a running job is considered interrupted and marked as failed on restart
+    FEED_JOBS_STALE_AFTER = int(os.environ.get('FEED_JOBS_STALE_AFTER', 300))
+
     # Print config
     def __repr__(self) -> str:
         return f"Config({self.__dict__})"
@@ -1,2 +1,7 @@
 from .database import init_db, create_tables, db
-from .startup_seeder import StartupSeeder
\ No newline at end of file
+from .engine_profiles import ENGINE_PROFILES, get_engine_profile
+from .routing import RoutingSession, reads_from_replica, sync_sqlite_replicas
+from .search_index import create_search_index, indexed_name_matches, name_contains_clause
+from .startup import STARTUP_MODES, get_startup_mode, check_schema_revision, startup_lock
+from .startup_seeder import StartupSeeder
+from .synthetic_seeder import SyntheticDataSeeder
\ No newline at end of file
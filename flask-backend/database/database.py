@@ -1,13 +1,17 @@
 # Description: This file initializes the database with the provided app or the current app. It also creates all tables if they don't exist.
 
 # Import the required modules
+import functools
+import os
 from flask_sqlalchemy import SQLAlchemy
 from flask import current_app
 from flask_migrate import Migrate
 from sqlalchemy.exc import OperationalError
+from .routing import RoutingSession, init_replicas
+from .engine_profiles import get_engine_profile, is_sqlite_uri, server_engine_options, register_sqlite_pragmas, read_sqlite_pragmas
 
-# Initialize the SQLAlchemy object
-db = SQLAlchemy()
+# Initialize the SQLAlchemy object, its session sends the reads of the read-only endpoints to the replicas
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Function to initialize the database with the provided app or the current app
 def init_db(app=None):
@@ -15,9 +19,38 @@ def init_db(app=None):
     if app is None:
         app = current_app
 
+    # Get the tuning profile of the engine (see engine_profiles.py)
+    profile_name = app.config.get('DATABASE_ENGINE_PROFILE', 'concurrent')
+    profile = get_engine_profile(profile_name)
+    sqlite = is_sqlite_uri(app.config.get('SQLALCHEMY_DATABASE_URI'))
+
+    # Server databases: size the connection pool before the engine is created
+    if not sqlite:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = server_engine_options(app, profile)
+
     # Initialize the database with the app
     db.init_app(app)
 
+    with app.app_context():
+        # SQLite: run the PRAGMAs of the profile on every new connection
+        if sqlite:
+            register_sqlite_pragmas(db.engine, profile['sqlite'])
+            settings = read_sqlite_pragmas(db.engine, ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size'))
+        else:
+            settings = {name: app.config['SQLALCHEMY_ENGINE_OPTIONS'].get(name) for name in ('pool_size', 'max_overflow', 'pool_recycle', 'pool_pre_ping')}
+
+        app.extensions['database_engine_profile'] = {'name': profile_name, 'dialect': db.engine.dialect.name, 'settings': settings}
+        app.logger.info("Database engine profile '%s' (%s): %s", profile_name, db.engine.dialect.name, settings)
+
+    # Create the engines of the read replicas, with the same profile (see routing.py)
+    init_replicas(app, server_engine_options(app, profile), on_engine=lambda engine: register_sqlite_pragmas(engine, profile['sqlite']))
+
+    # A forked worker process (gunicorn --preload) must not reuse the connections of the parent
+    if hasattr(os, 'register_at_fork'):
+        with app.app_context():
+            engines = list(db.engines.values()) + app.extensions['database_replicas']
+        os.register_at_fork(after_in_child=functools.partial(_dispose_engines_after_fork, engines))
+
 # Create all tables if they don't exist
 def create_tables(app):
     # Create tables
@@ -30,4 +63,10 @@ def create_tables(app):
         app.logger.error("For Docker development, use: app.config.from_object('DevelopmentDockerConfig')")
         app.logger.error("For local development, use: app.config.from_object('DevelopmentConfig')")
         app.logger.error("Ensure the database path is correctly set in the .env file.")
-        exit(1)
\ No newline at end of file
+        exit(1)
+
+
+# Drop the pooled connections inherited from the parent process, without closing them for the parent
+def _dispose_engines_after_fork(engines):
+    for engine in engines:
+        engine.dispose(close=False)
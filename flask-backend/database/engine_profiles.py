@@ -0,0 +1,140 @@
+# Description: This file contains the tuning profiles of the database engine, selected with DATABASE_ENGINE_PROFILE.
+
+"""
+    A profile holds two groups of settings, the one matching the database of the app is applied:
+
+    - "sqlite": PRAGMAs run on every new SQLite connection (journal mode, synchronous, memory
+      map, page cache and busy timeout).
+    - "server": options of the connection pool of server databases such as PostgreSQL or MySQL
+      (size, overflow, recycle and pre-ping). Options set in SQLALCHEMY_ENGINE_OPTIONS win.
+
+    Profiles:
+
+    - "default": the driver and SQLAlchemy defaults (rollback journal, readers and the writer
+      block each other).
+    - "concurrent": WAL, so readers never wait for the writer, synchronous=NORMAL (a commit is
+      durable once the WAL is checkpointed, a power loss may drop the last transactions but
+      never corrupts the database), memory-mapped reads and a larger page cache.
+    - "durable": WAL with synchronous=FULL, every commit is synced to disk.
+"""
+
+# Import the required modules
+from sqlalchemy import event
+
+
+ENGINE_PROFILES = {
+    'default': {
+        'sqlite': {},
+        'server': {}
+    },
+    'concurrent': {
+        'sqlite': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'cache_size': -16000,
+            'mmap_size': 128 * 1024 * 1024
+        },
+        'server': {
+            'pool_size': 10,
+            'max_overflow': 20,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True
+        }
+    },
+    'durable': {
+        'sqlite': {
+            'journal_mode': 'WAL',
+            'synchronous': 'FULL',
+            'busy_timeout': 5000
+        },
+        'server': {
+            'pool_size': 5,
+            'max_overflow': 10,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True
+        }
+    }
+}
+
+
+def get_engine_profile(name: str) -> dict:
+    """
+    Get the settings of an engine profile.
+
+    Args:
+        name (str): The name of the profile.
+
+    Returns:
+        dict: The "sqlite" PRAGMAs and the "server" pool options of the profile.
+
+    Raises:
+        ValueError: If the profile doesn't exist.
+    """
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"Invalid DATABASE_ENGINE_PROFILE '{name}', it must be one of: {', '.join(ENGINE_PROFILES)}.")
+
+    return ENGINE_PROFILES[name]
+
+
+def is_sqlite_uri(uri: str) -> bool:
+    """
+    Check if a database URI points to SQLite.
+
+    Args:
+        uri (str): The SQLAlchemy database URI.
+
+    Returns:
+        bool: True for SQLite databases.
+    """
+    return str(uri or '').startswith('sqlite')
+
+
+def server_engine_options(app, profile: dict) -> dict:
+    """
+    Merge the pool options of a profile into the engine options of the app, for server databases.
+
+    Args:
+        app (Flask): The Flask application instance.
+        profile (dict): The engine profile.
+
+    Returns:
+        dict: The engine options, the explicit SQLALCHEMY_ENGINE_OPTIONS taking precedence.
+    """
+    return {**profile['server'], **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+
+
+def register_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """
+    Run the PRAGMAs of a profile on every new connection of a SQLite engine.
+
+    Args:
+        engine (Engine): The SQLite engine.
+        pragmas (dict): The PRAGMA names and values.
+    """
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def read_sqlite_pragmas(engine, names) -> dict:
+    """
+    Read the values of PRAGMAs on a connection of a SQLite engine, to log the settings in effect.
+
+    Args:
+        engine (Engine): The SQLite engine.
+        names (iterable): The PRAGMA names.
+
+    Returns:
+        dict: The PRAGMA names and their current values.
+    """
+    with engine.connect() as connection:
+        return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
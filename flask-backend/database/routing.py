@@ -0,0 +1,179 @@
+# Description: This file contains the session that routes the read-only queries to the replica databases.
+
+"""
+    The replicas are listed in DATABASE_REPLICA_URIS. Without replicas every query goes to the
+    primary database, as before.
+
+    - Endpoints decorated with reads_from_replica send their queries to one of the replicas,
+      picked at random. Writes (INSERT, UPDATE, DELETE and flushes) always go to the primary.
+    - Read-your-writes: a request that writes to the primary sets a cookie valid for
+      READ_YOUR_WRITES_WINDOW seconds. While it is valid, the client's requests read from the
+      primary, so a user sees their own writes even if the replicas lag behind. The cookie works
+      whatever the worker process serving the next request.
+    - The public listings cache fills its pages from the primary while its last invalidation is
+      within the same window, so a lagging replica does not put back the feeds of before a write.
+
+    A replica can be a second SQLite file, filled from the primary with "flask replica sync".
+"""
+
+# Import the required modules
+import functools
+import random
+import sqlite3
+import time
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Delete, Insert, Update, create_engine
+from sqlalchemy.engine import make_url
+
+
+# Cookie holding the time until which the client reads from the primary
+READ_PRIMARY_COOKIE = 'read_primary_until'
+
+
+class RoutingSession(Session):
+    """
+    A Flask-SQLAlchemy session that sends the queries of the read-only endpoints to a replica.
+
+    The statements of a flush reach get_bind with only their mapper, so flush marks the session
+    as writing until it is done.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writing = False
+
+
+    def flush(self, objects=None) -> None:
+        """
+        Flush the pending changes of the session, always to the primary.
+
+        Args:
+            objects (list, optional): Restrict the flush to these objects.
+        """
+        self.writing = True
+        try:
+            super().flush(objects)
+        finally:
+            self.writing = False
+
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """
+        Select the engine of a query: a replica for the reads of a read-only endpoint, the primary otherwise.
+
+        Args:
+            mapper (Mapper, optional): The mapper of the queried model.
+            clause (ClauseElement, optional): The statement being executed.
+            bind (Engine, optional): An explicit engine, always used when given.
+
+        Returns:
+            Engine: The engine to run the statement on.
+        """
+        if bind is None and has_app_context():
+            if self.writing or isinstance(clause, (Insert, Update, Delete)):
+                g.wrote_to_primary = True
+
+            elif g.get('read_from_replica') and not (self.new or self.dirty or self.deleted):
+                replicas = current_app.extensions.get('database_replicas')
+                if replicas:
+                    return random.choice(replicas)
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def reads_from_replica(func):
+    """
+    Send the queries of an endpoint to a replica, unless its client wrote within the read-your-writes window.
+
+    Args:
+        func (function): The endpoint.
+
+    Returns:
+        function: The decorated endpoint.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        g.read_from_replica = not _reads_own_writes()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def init_replicas(app, engine_options: dict = None, on_engine=None) -> list:
+    """
+    Create the engines of the replicas and the read-your-writes cookie of the app.
+
+    Args:
+        app (Flask): The Flask application instance.
+        engine_options (dict, optional): Options of create_engine for server databases.
+        on_engine (callable, optional): Called with each SQLite replica engine, to apply the engine profile.
+
+    Returns:
+        list: The replica engines, empty without DATABASE_REPLICA_URIS.
+    """
+    replicas = []
+    for uri in app.config.get('DATABASE_REPLICA_URIS') or []:
+        sqlite = uri.startswith('sqlite')
+        engine = create_engine(uri, **({} if sqlite else engine_options or {}))
+        if sqlite and on_engine is not None:
+            on_engine(engine)
+        replicas.append(engine)
+
+    app.extensions['database_replicas'] = replicas
+    if replicas:
+        app.after_request(_set_read_primary_cookie)
+        app.logger.info("Database replicas: %s", ', '.join(repr(engine.url) for engine in replicas))
+
+    return replicas
+
+
+def sync_sqlite_replicas(primary_engine, replicas: list) -> list:
+    """
+    Copy the primary SQLite database into the SQLite replicas, as a stand-in for replication.
+
+    Args:
+        primary_engine (Engine): The engine of the primary database.
+        replicas (list): The replica engines, the non-SQLite ones are skipped.
+
+    Returns:
+        list: The paths of the replicas written.
+    """
+    written = []
+    for engine in replicas:
+        if engine.dialect.name != 'sqlite':
+            continue
+
+        # Close the pooled connections of the replica, the copy replaces its file
+        engine.dispose()
+        path = make_url(str(engine.url)).database
+        source = primary_engine.raw_connection()
+        try:
+            with sqlite3.connect(path) as target:
+                source.driver_connection.backup(target)
+        finally:
+            source.close()
+        written.append(path)
+
+    return written
+
+
+def _reads_own_writes() -> bool:
+    """
+    Private function that checks if the client wrote to the primary within the read-your-writes window.
+    """
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _set_read_primary_cookie(response):
+    """
+    Private function that opens the read-your-writes window of the client after a write to the primary.
+    """
+    if has_request_context() and g.get('wrote_to_primary'):
+        window = current_app.config.get('READ_YOUR_WRITES_WINDOW', 5)
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, f"{time.time() + window:.3f}", max_age=int(window) + 1, httponly=True, samesite='Lax'
+        )
+    return response
@@ -0,0 +1,182 @@
+# Description: This file creates and queries the search indexes on topic and feed names.
+
+"""
+    Substring search on topic and feed names (ILIKE '%term%') cannot use a regular B-tree index.
+    The search index keeps a trigram index of the names so the filters become index lookups:
+
+    - SQLite: FTS5 virtual tables with the trigram tokenizer (external content tables),
+      kept in sync with triggers on insert, update and delete.
+    - PostgreSQL: GIN trigram indexes (pg_trgm), which serve ILIKE '%term%' directly.
+    - Any other database, or SQLite without FTS5: plain ILIKE, without an index.
+"""
+
+# Import the required modules
+from sqlalchemy import Integer, bindparam, column, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from .database import db
+
+
+# Trigram indexes only match terms of at least 3 characters
+MIN_INDEXED_TERM_LENGTH = 3
+
+# Terms matching at least this many rows are searched by scanning the feeds in page order
+SELECTIVE_MATCH_LIMIT = 500
+
+# (search table, content table) pairs indexed on their "name" column
+SEARCH_TABLES = (('topics_search', 'topics'), ('feeds_search', 'feeds'))
+
+
+def sqlite_search_ddl(search_table: str, content_table: str) -> list:
+    """
+    Build the SQLite statements of an FTS5 trigram index synchronized with its content table.
+
+    Args:
+        search_table (str): The name of the FTS5 table.
+        content_table (str): The name of the indexed table.
+
+    Returns:
+        list: The CREATE statements of the FTS5 table and its triggers.
+    """
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {search_table} USING fts5("
+        f"name, content='{content_table}', content_rowid='id', tokenize='trigram')",
+
+        f"CREATE TRIGGER IF NOT EXISTS {search_table}_after_insert AFTER INSERT ON {content_table} BEGIN "
+        f"INSERT INTO {search_table}(rowid, name) VALUES (new.id, new.name); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {search_table}_after_delete AFTER DELETE ON {content_table} BEGIN "
+        f"INSERT INTO {search_table}({search_table}, rowid, name) VALUES ('delete', old.id, old.name); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {search_table}_after_update AFTER UPDATE OF name ON {content_table} BEGIN "
+        f"INSERT INTO {search_table}({search_table}, rowid, name) VALUES ('delete', old.id, old.name); "
+        f"INSERT INTO {search_table}(rowid, name) VALUES (new.id, new.name); END",
+    ]
+
+
+def create_search_index(app, create: bool = True) -> str:
+    """
+    Create the search indexes if they don't exist, and register the search backend in use.
+
+    Args:
+        app (Flask): The Flask application instance.
+        create (bool, optional): False to only detect the indexes created by the migrations
+            (production startup). Defaults to True.
+
+    Returns:
+        str: The search backend: "fts5", "pg_trgm" or "like".
+    """
+    backend = 'like'
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+
+        if not create:
+            backend = _existing_search_backend(dialect)
+            app.extensions['search_backend'] = backend
+            return backend
+
+        try:
+            with db.engine.begin() as connection:
+                if dialect == 'sqlite':
+                    for search_table, content_table in SEARCH_TABLES:
+                        exists = connection.execute(
+                            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {'name': search_table}
+                        ).first()
+
+                        for statement in sqlite_search_ddl(search_table, content_table):
+                            connection.exec_driver_sql(statement)
+
+                        # Index the rows that existed before the search table was created
+                        if not exists:
+                            connection.exec_driver_sql(f"INSERT INTO {search_table}({search_table}) VALUES ('rebuild')")
+                    backend = 'fts5'
+
+                elif dialect == 'postgresql':
+                    connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                    for _, content_table in SEARCH_TABLES:
+                        connection.exec_driver_sql(
+                            f"CREATE INDEX IF NOT EXISTS ix_{content_table}_name_trgm "
+                            f"ON {content_table} USING gin (name gin_trgm_ops)"
+                        )
+                    backend = 'pg_trgm'
+
+        except (OperationalError, ProgrammingError) as e:
+            app.logger.warning("The search index could not be created, falling back to ILIKE: %s", e)
+            backend = 'like'
+
+    app.extensions['search_backend'] = backend
+    return backend
+
+
+def _existing_search_backend(dialect: str) -> str:
+    """
+    Private function that returns the search backend of the indexes found in the database, without creating them.
+    """
+    if dialect == 'sqlite':
+        names = [search_table for search_table, _ in SEARCH_TABLES]
+        found = db.session.execute(
+            text("SELECT count(*) FROM sqlite_master WHERE name IN :names").bindparams(bindparam('names', expanding=True)),
+            {'names': names}
+        ).scalar()
+        return 'fts5' if found == len(names) else 'like'
+
+    if dialect == 'postgresql':
+        names = [f"ix_{content_table}_name_trgm" for _, content_table in SEARCH_TABLES]
+        found = db.session.execute(
+            text("SELECT count(*) FROM pg_indexes WHERE indexname IN :names").bindparams(bindparam('names', expanding=True)),
+            {'names': names}
+        ).scalar()
+        return 'pg_trgm' if found == len(names) else 'like'
+
+    return 'like'
+
+
+def indexed_name_matches(search_table: str, term: str, backend: str):
+    """
+    Get the IDs of the rows whose name contains a term from the FTS5 index, when the term is selective.
+
+    The index is only worth it for selective terms: a term matching many rows is found faster
+    by scanning the feeds in page order and stopping at the first page. The matches are counted
+    up to SELECTIVE_MATCH_LIMIT to tell both cases apart.
+
+    Args:
+        search_table (str): The FTS5 table to search.
+        term (str): The substring to search.
+        backend (str): The search backend in use.
+
+    Returns:
+        TextualSelect: A subquery of the matching row IDs.
+        None: If the term must be searched by scanning the names instead.
+    """
+    if backend != 'fts5' or len(term) < MIN_INDEXED_TERM_LENGTH:
+        return None
+
+    # Quote the term as an FTS5 phrase so its characters are matched literally
+    phrase = '"' + term.replace('"', '""') + '"'
+    match_sql = f"SELECT rowid FROM {search_table} WHERE {search_table} MATCH :{search_table}_term"
+
+    matches = db.session.execute(
+        text(f"SELECT count(*) FROM ({match_sql} LIMIT :limit)"),
+        {f"{search_table}_term": phrase, 'limit': SELECTIVE_MATCH_LIMIT}
+    ).scalar()
+    if matches >= SELECTIVE_MATCH_LIMIT:
+        return None
+
+    return text(match_sql).bindparams(**{f"{search_table}_term": phrase}).columns(column('rowid', Integer))
+
+
+def name_contains_clause(model, term: str):
+    """
+    Build a case-insensitive substring filter on the name of a model, with the wildcards of the term escaped.
+
+    On PostgreSQL the trigram index serves this filter directly.
+
+    Args:
+        model (db.Model): The model with the "name" column.
+        term (str): The substring to search.
+
+    Returns:
+        ColumnElement: The ILIKE filter clause.
+    """
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return model.name.ilike(f"%{escaped}%", escape='\\')
@@ -0,0 +1,145 @@
+# Description: This file contains the checks and the lock of the application startup.
+
+"""
+    STARTUP_MODE selects how the application prepares the database when it boots:
+
+    - "development": the missing tables and search indexes are created (db.create_all), as before.
+    - "production": the schema is owned by the migrations. The tables are never created at boot,
+      the database must be at the Alembic head revision ("flask db upgrade" runs once, before the
+      workers start), otherwise the application refuses to start.
+
+    In both modes the seeding runs in one process at a time, under a lock held on the database
+    (PostgreSQL advisory lock) or on a lock file next to the SQLite database, so workers booting
+    together don't seed twice. Once the database is seeded, the startup costs a single query.
+"""
+
+# Import the required modules
+import contextlib
+import os
+import tempfile
+import zlib
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from .database import db
+
+try:
+    import fcntl
+except ImportError:  # Windows, the lock file is not available
+    fcntl = None
+
+
+# Startup modes of STARTUP_MODE
+STARTUP_MODES = ('development', 'production')
+
+# Directory of the Alembic migrations (flask-backend/migrations)
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def get_startup_mode(app) -> str:
+    """
+    Get the startup mode of the app.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        str: "development" or "production".
+
+    Raises:
+        ValueError: If STARTUP_MODE is not a known mode.
+    """
+    mode = app.config.get('STARTUP_MODE', 'development')
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"Unknown STARTUP_MODE '{mode}', expected one of: {', '.join(STARTUP_MODES)}")
+    return mode
+
+
+def check_schema_revision(app) -> bool:
+    """
+    Check that the database is at the head revision of the migrations.
+
+    The Flask CLI loads the app to run its commands, including "flask db upgrade" on a database
+    that is not migrated yet, so under the CLI an outdated database is only reported.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        bool: True if the database is at the head revision.
+
+    Raises:
+        RuntimeError: If the database is not at the head revision, outside the Flask CLI.
+    """
+    expected = set(ScriptDirectory(MIGRATIONS_DIRECTORY).get_heads())
+
+    with app.app_context(), db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+
+    if current == expected:
+        app.logger.info("Database schema at revision %s.", ', '.join(sorted(current)))
+        return True
+
+    message = (
+        f"The database is at revision {', '.join(sorted(current)) or 'none'}, the application expects "
+        f"{', '.join(sorted(expected))}. Run 'flask db upgrade' before starting the application."
+    )
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        app.logger.warning(message)
+        return False
+
+    raise RuntimeError(message)
+
+
+@contextlib.contextmanager
+def startup_lock(app, name: str = 'seed'):
+    """
+    Hold a lock shared by every process of the application, for the work that must run once.
+
+    PostgreSQL databases are locked with an advisory lock, the other databases with an
+    exclusive lock on a file (STARTUP_LOCK_PATH, next to the SQLite database by default).
+
+    Args:
+        app (Flask): The Flask application instance.
+        name (str, optional): The name of the lock. Defaults to 'seed'.
+    """
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name == 'postgresql':
+        key = zlib.crc32(f"newsfeed-startup-{name}".encode())
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {'key': key})
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': key})
+        return
+
+    if fcntl is None:
+        app.logger.warning("File locks are not available, the startup '%s' is not locked.", name)
+        yield
+        return
+
+    path = _lock_path(app, engine, name)
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _lock_path(app, engine, name: str) -> str:
+    """
+    Private function that returns the path of the lock file of the startup.
+    """
+    if app.config.get('STARTUP_LOCK_PATH'):
+        return app.config['STARTUP_LOCK_PATH']
+
+    database = make_url(str(engine.url)).database
+    if engine.dialect.name == 'sqlite' and database and database != ':memory:':
+        return f"{os.path.abspath(database)}.{name}.lock"
+
+    return os.path.join(tempfile.gettempdir(), f"newsfeed-startup-{name}.lock")
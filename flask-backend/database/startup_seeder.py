@@ -1,16 +1,60 @@
 # Description: This file contains the function that seeds the database with default roles.
 
 # Import the User model
-from application.models import User, Feed, Topic, Resource
+from application.models import User, Feed, Topic, Resource, FeedSummary
 from flask import current_app as app
+from sqlalchemy import exists, select
 from . import db
+from .startup import startup_lock
 import random
 
+
+# Sample data for resources (also used by the synthetic datasets, see synthetic_seeder.py)
+RESOURCE_TITLES = [
+    'The World of Sports', 'Breaking Records', 'Winning Strategies', 'The Future of Sports',
+    'Sports Illustrated', 'Champion Mindset', 'Athletic Life', 'Olympic Dreams', 
+    'Game Day Insights', 'Masters of the Game', 'Sports Legends', 'Victory Lap', 
+    'Athlete Spotlight', 'Game Changers', 'Sports Science', 'Beyond the Finish Line', 
+    'Inside the Arena', 'The Playbook', 'Sports Heroes', 'Winning Streak', 
+    'The Competitive Edge', 'Sports Revolution', 'Peak Performance', 'The Sports Journal', 
+    'Game On', 'The Athletic Tribune', 'Sports Pulse', 'The Winning Formula', 
+    'Sports Chronicles', 'The Sports Digest'
+]
+
+RESOURCE_TYPES = ['Magazine', 'Journal', 'Article', 'Newspaper']
+RESOURCE_EDITORIALS = ['Sports Weekly', 'Olympic Digest', 'Global Sports', 'Winning Edge']
+RESOURCE_LANGUAGES = ['English', 'Spanish', 'French']
+
+
 class StartupSeeder:
     def __init__(self, app):
         self.app = app
 
     def seed(self):
+        # Seeded databases cost a single query, whatever the number of workers starting
+        if self.is_seeded():
+            return
+
+        # Seed in one process at a time, the next ones find the database seeded
+        with startup_lock(self.app, 'seed'):
+            if not self.is_seeded():
+                self._seed()
+
+    def is_seeded(self) -> bool:
+        """
+        Check in one query if the default user, the feeds and their listing summaries exist.
+
+        Returns:
+            bool: True if there is nothing to seed.
+        """
+        with self.app.app_context():
+            statement = select(exists(select(User.id)), exists(select(Feed.id)), exists(select(FeedSummary.feed_id)))
+            return all(db.session.execute(statement).one())
+
+    def _seed(self):
+        """
+        Private method that seeds the missing default data.
+        """
         with self.app.app_context():
             # If there are no User in the database
             if User.query.count() == 0:
@@ -59,32 +103,16 @@ class StartupSeeder:
                    even if any of the third party APIs are not available or the user has not added any resources manually.
                 """
 
-                # Sample data for resources
-                titles = [
-                    'The World of Sports', 'Breaking Records', 'Winning Strategies', 'The Future of Sports',
-                    'Sports Illustrated', 'Champion Mindset', 'Athletic Life', 'Olympic Dreams', 
-                    'Game Day Insights', 'Masters of the Game', 'Sports Legends', 'Victory Lap', 
-                    'Athlete Spotlight', 'Game Changers', 'Sports Science', 'Beyond the Finish Line', 
-                    'Inside the Arena', 'The Playbook', 'Sports Heroes', 'Winning Streak', 
-                    'The Competitive Edge', 'Sports Revolution', 'Peak Performance', 'The Sports Journal', 
-                    'Game On', 'The Athletic Tribune', 'Sports Pulse', 'The Winning Formula', 
-                    'Sports Chronicles', 'The Sports Digest'
-                ]
-
-                types = ['Magazine', 'Journal', 'Article', 'Newspaper']
-                editorials = ['Sports Weekly', 'Olympic Digest', 'Global Sports', 'Winning Edge']
-                languages = ['English', 'Spanish', 'French']
-
                 # Add resources to each topic
                 for topic in topics_to_add:
                     resources_to_add = [
                         Resource(
                             topic_id=topic.id,
-                            title=random.choice(titles),
+                            title=random.choice(RESOURCE_TITLES),
                             date=random_date_range(),
-                            type=random.choice(types),
-                            editorial=random.choice(editorials),
-                            languages=random.choice(languages)
+                            type=random.choice(RESOURCE_TYPES),
+                            editorial=random.choice(RESOURCE_EDITORIALS),
+                            languages=random.choice(RESOURCE_LANGUAGES)
                         )
                         for _ in range(50)
                     ]
@@ -97,6 +125,13 @@ class StartupSeeder:
 
                 app.logger.info('Database seeded successfully.')
 
+            # Backfill the listing summaries of the seeded feeds, or of a database created before the read model
+            from application.services.feeds_service import FeedSummaryService
+
+            if FeedSummaryService.is_empty():
+                written = FeedSummaryService.rebuild()
+                app.logger.info('Backfilled %s feed summaries.', written)
+
 
 
 # Function to generate a random date range like "1950 - 2024"
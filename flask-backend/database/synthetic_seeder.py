@@ -0,0 +1,248 @@
+# Description: This file contains the seeder of the large synthetic datasets used by the benchmarks.
+
+"""
+    StartupSeeder only creates the default user with two feeds. The performance benchmarks need
+    datasets the size of production to get the same query plans, so SyntheticDataSeeder generates
+    users, feeds, topics and resources in batches:
+
+    - Each batch of rows is generated with one call of the random generator per column
+      (random.choices) instead of one per row, from the sample data of StartupSeeder.
+    - The rows are inserted with Core bulk inserts (executemany) of chunk_size rows and the
+      transaction is committed after each chunk, so the memory stays flat whatever the size.
+    - The generator is seeded: the same arguments (seed and chunk size included) always produce
+      the same dataset, timestamps included.
+
+    Run it with: flask seed-bench --users N --feeds M --resources-per-topic K
+"""
+
+# Import the required modules
+import heapq
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import exists, insert, select, text
+from application.models import User, Feed, Topic, Resource
+from .database import db
+from .startup_seeder import StartupSeeder, RESOURCE_TITLES, RESOURCE_TYPES, RESOURCE_EDITORIALS, RESOURCE_LANGUAGES
+
+
+# Topic names of the generated feeds, the first ones are the most popular
+TOPIC_NAMES = [
+    'Tennis', 'Cycling', 'Swimming', 'Boxing', 'Sailing', 'Rowing', 'Fencing', 'Archery',
+    'Gymnastics', 'Equestrian', 'Hockey', 'Golf', 'Judo', 'Karate', 'Surfing', 'Diving',
+    'Athletics', 'Basketball', 'Volleyball', 'Handball', 'Badminton', 'Wrestling', 'Weightlifting', 'Canoeing',
+    'Triathlon', 'Taekwondo', 'Shooting', 'Skateboarding', 'Climbing', 'Rugby', 'Baseball', 'Softball',
+    'Table Tennis', 'Water Polo', 'Pentathlon', 'Breaking', 'Trampoline', 'Rhythmic', 'Jumping', 'Marathon'
+]
+
+# Popularity of the topic names (Zipf-like), the first ones are picked more often
+TOPIC_WEIGHTS = {name: 1 / rank for rank, name in enumerate(TOPIC_NAMES, start=1)}
+
+# Words of the generated feed names
+FEED_NAME_WORDS = ['Daily', 'Weekly', 'Olympic', 'Global', 'Local', 'Pro', 'Classic', 'Championship', 'Morning', 'Evening']
+
+# Prefix of the usernames of the generated users
+USERNAME_PREFIX = 'bench_user_'
+
+
+class SyntheticDataSeeder(StartupSeeder):
+    """
+    Seeder of large synthetic datasets, on top of the default data of StartupSeeder.
+    """
+
+    # Rows inserted per statement, and per transaction
+    CHUNK_SIZE = 5000
+
+    # Share of public feeds
+    PUBLIC_RATIO = 0.7
+
+    def __init__(self, app, seed: int = 42, chunk_size: int = None, progress_callback=None):
+        super().__init__(app)
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+
+        # Optional callable notified with the counts of the rows inserted so far
+        self.progress_callback = progress_callback
+
+        self.generator = random.Random(seed)
+
+
+    def seed_dataset(self, users: int, feeds: int, topics_per_feed: int = 5, resources_per_topic: int = 10) -> dict:
+        """
+        Generate and insert the dataset, after the default data of StartupSeeder.
+
+        The feeds are spread evenly over the users, each feed has topics_per_feed distinct topics
+        and each topic resources_per_topic resources.
+
+        Args:
+            users (int): The number of users.
+            feeds (int): The total number of feeds.
+            topics_per_feed (int, optional): The topics of each feed. Defaults to 5.
+            resources_per_topic (int, optional): The resources of each topic. Defaults to 10.
+
+        Returns:
+            dict: The number of rows inserted per table, and the duration in seconds.
+
+        Raises:
+            ValueError: If the arguments are out of range, or if the database already has generated users.
+        """
+        if users < 1 or feeds < 0 or not 0 <= topics_per_feed <= len(TOPIC_NAMES) or resources_per_topic < 0:
+            raise ValueError(f"Invalid dataset size: users >= 1, feeds >= 0, 0 <= topics per feed <= {len(TOPIC_NAMES)}, resources per topic >= 0")
+
+        from application.services.feeds_service import FeedSummaryService
+
+        self.seed()
+        start = time.perf_counter()
+
+        with self.app.app_context():
+            if db.session.execute(select(exists().where(User.username.like(f"{USERNAME_PREFIX}%")))).scalar():
+                raise ValueError("The database already has generated users, generate the dataset on a new database.")
+
+            counts = {'users': 0, 'feeds': 0, 'topics': 0, 'resources': 0}
+            user_ids = self._insert_users(users, counts)
+
+            # Groups of feeds whose topics fit in one chunk
+            feeds_per_group = max(1, self.chunk_size // max(topics_per_feed, 1))
+            for first in range(0, feeds, feeds_per_group):
+                owners = [user_ids[index % len(user_ids)] for index in range(first, min(first + feeds_per_group, feeds))]
+                feed_ids = self._insert_feeds(owners, counts)
+                topic_ids = self._insert_topics(feed_ids, topics_per_feed, counts)
+                self._insert_resources(topic_ids, resources_per_topic, counts)
+
+                # Listing summaries of the group (feed_summaries read model)
+                FeedSummaryService.refresh(feed_ids)
+                db.session.commit()
+                self._report_progress(counts)
+
+            # Refresh the statistics of the query planner for the new tables sizes
+            if db.engine.dialect.name in ('sqlite', 'postgresql'):
+                db.session.execute(text("ANALYZE"))
+                db.session.commit()
+
+        counts['seconds'] = round(time.perf_counter() - start, 3)
+        return counts
+
+
+    def _insert_users(self, users: int, counts: dict) -> list:
+        """
+        Private method that inserts the users, all with the password of the default user, and returns their IDs.
+        """
+        password_hash = db.session.execute(select(User.password_hash).order_by(User.id).limit(1)).scalar_one()
+
+        user_ids = []
+        for first in range(0, users, self.chunk_size):
+            rows = [
+                {'username': f"{USERNAME_PREFIX}{index}", 'password_hash': password_hash}
+                for index in range(first, min(first + self.chunk_size, users))
+            ]
+            user_ids += db.session.execute(insert(User).returning(User.id, sort_by_parameter_order=True), rows).scalars().all()
+            db.session.commit()
+            counts['users'] += len(rows)
+
+        return user_ids
+
+
+    def _insert_feeds(self, owners: list, counts: dict) -> list:
+        """
+        Private method that inserts one feed per owner and returns their IDs, in order.
+        """
+        size = len(owners)
+        generator = self.generator
+        first_words = generator.choices(FEED_NAME_WORDS, k=size)
+        topics = generator.choices(TOPIC_NAMES, k=size)
+        public = generator.choices((True, False), weights=(self.PUBLIC_RATIO, 1 - self.PUBLIC_RATIO), k=size)
+        minutes = generator.choices(range(3_000_000), k=size)
+        # Minutes between the creation and the last update of each feed (up to a year)
+        ages = generator.choices(range(525_600), k=size)
+
+        rows = [
+            {
+                'user_id': user_id,
+                'name': f"{word} {topic} {counts['feeds'] + index}",
+                'is_public': is_public,
+                'created_at': datetime(2019, 1, 1) + timedelta(minutes=max(minute - age, 0)),
+                'updated_at': datetime(2019, 1, 1) + timedelta(minutes=minute)
+            }
+            for index, (user_id, word, topic, is_public, minute, age) in enumerate(zip(owners, first_words, topics, public, minutes, ages))
+        ]
+        feed_ids = db.session.execute(insert(Feed).returning(Feed.id, sort_by_parameter_order=True), rows).scalars().all()
+        counts['feeds'] += len(feed_ids)
+        return feed_ids
+
+
+    def _insert_topics(self, feed_ids: list, topics_per_feed: int, counts: dict) -> list:
+        """
+        Private method that inserts distinct topics for each feed, the popular names being more frequent, and returns their IDs.
+        """
+        if not feed_ids or topics_per_feed == 0:
+            return []
+
+        rows = [
+            {'feed_id': feed_id, 'name': name}
+            for feed_id in feed_ids
+            for name in self._sample_topic_names(topics_per_feed)
+        ]
+        topic_ids = db.session.execute(insert(Topic).returning(Topic.id, sort_by_parameter_order=True), rows).scalars().all()
+        counts['topics'] += len(topic_ids)
+        return topic_ids
+
+
+    def _insert_resources(self, topic_ids: list, resources_per_topic: int, counts: dict) -> None:
+        """
+        Private method that inserts the resources of the topics, in chunks committed one by one.
+        """
+        if not topic_ids or resources_per_topic == 0:
+            return
+
+        topic_of_resources = (topic_id for topic_id in topic_ids for _ in range(resources_per_topic))
+        while True:
+            chunk = list(itertools.islice(topic_of_resources, self.chunk_size))
+            if not chunk:
+                break
+
+            db.session.execute(insert(Resource), self._resource_rows(chunk))
+            db.session.commit()
+            counts['resources'] += len(chunk)
+
+
+    def _resource_rows(self, topic_ids: list) -> list:
+        """
+        Private method that generates the rows of a chunk of resources, one column at a time.
+        """
+        size = len(topic_ids)
+        generator = self.generator
+        titles = generator.choices(RESOURCE_TITLES, k=size)
+        types = generator.choices(RESOURCE_TYPES, k=size)
+        editorials = generator.choices(RESOURCE_EDITORIALS, k=size)
+        languages = generator.choices(RESOURCE_LANGUAGES, k=size)
+        start_years = generator.choices(range(1950, 2017), k=size)
+        spans = generator.choices(range(9), k=size)
+
+        return [
+            {
+                'topic_id': topic_id,
+                'title': title,
+                'date': f"{start_year} - {start_year + span}",
+                'type': resource_type,
+                'editorial': editorial,
+                'languages': language
+            }
+            for topic_id, title, resource_type, editorial, language, start_year, span
+            in zip(topic_ids, titles, types, editorials, languages, start_years, spans)
+        ]
+
+
+    def _sample_topic_names(self, size: int) -> list:
+        """
+        Private method that picks distinct topic names, weighted by popularity (weighted sampling without replacement).
+        """
+        return heapq.nlargest(size, TOPIC_NAMES, key=lambda name: self.generator.random() ** (1 / TOPIC_WEIGHTS[name]))
+
+
+    def _report_progress(self, counts: dict) -> None:
+        """
+        Private method that notifies the progress callback, if any.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(dict(counts))
+
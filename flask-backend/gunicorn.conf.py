@@ -0,0 +1,30 @@
+# Description: Gunicorn settings of the production image (see DockerfileProd).
+"""
+    The application is loaded once in the master process before the workers are forked
+    (preload_app), so the startup work (schema revision check, seeding, imports) runs once
+    and the workers share the loaded code and data copy-on-write. The connections, pools and
+    background threads of the application are opened by each worker on first use.
+
+    Usage (from the flask-backend directory, after "flask db upgrade"):
+
+        STARTUP_MODE=production gunicorn -c gunicorn.conf.py app:app
+"""
+
+# Import the required modules
+import gc
+import multiprocessing
+import os
+
+
+# Address and number of worker processes
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+# Load the application before forking the workers
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+def pre_fork(server, worker):
+    # Move the objects of the loaded application out of the garbage collector's generations,
+    # so its collections in the workers don't write to (and copy) the shared memory pages
+    gc.freeze()
@@ -0,0 +1,74 @@
+"""Initial schema
+
+Revision ID: 7a3e5c1d9b20
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e5c1d9b20'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created before the migrations existed already have these tables (db.create_all),
+    # only the missing ones are created so those databases can be upgraded in place
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'users' not in existing_tables:
+        op.create_table('users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=50), nullable=False),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('last_login', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('username')
+        )
+
+    if 'feeds' not in existing_tables:
+        op.create_table('feeds',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('is_public', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'topics' not in existing_tables:
+        op.create_table('topics',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('feed_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.ForeignKeyConstraint(['feed_id'], ['feeds.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('feed_id', 'name', name='unique_topic_per_feed')
+        )
+
+    if 'resources' not in existing_tables:
+        op.create_table('resources',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('topic_id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('date', sa.String(length=255), nullable=False),
+            sa.Column('type', sa.String(length=100), nullable=True),
+            sa.Column('editorial', sa.String(length=255), nullable=True),
+            sa.Column('languages', sa.String(length=255), nullable=True),
+            sa.ForeignKeyConstraint(['topic_id'], ['topics.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('resources')
+    op.drop_table('topics')
+    op.drop_table('feeds')
+    op.drop_table('users')
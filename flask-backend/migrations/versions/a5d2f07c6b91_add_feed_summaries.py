@@ -0,0 +1,85 @@
+"""Add the feed_summaries read model of the feed listings
+
+Revision ID: a5d2f07c6b91
+Revises: e19d4a7c3f82
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d2f07c6b91'
+down_revision = 'e19d4a7c3f82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # db.create_all already creates the table on new databases, so it is created only if missing
+    if not sa.inspect(bind).has_table('feed_summaries'):
+        op.create_table(
+            'feed_summaries',
+            sa.Column('feed_id', sa.Integer(), sa.ForeignKey('feeds.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('is_public', sa.Boolean(), nullable=False),
+            sa.Column('creator', sa.String(length=50), nullable=False),
+            sa.Column('topics', sa.JSON(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+    op.create_index('ix_feed_summaries_is_public_updated_at', 'feed_summaries', ['is_public', 'updated_at', 'feed_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_feed_summaries_user_id_updated_at', 'feed_summaries', ['user_id', 'updated_at', 'feed_id'], unique=False, if_not_exists=True)
+
+    # Backfill the summaries of the existing feeds (same rows as "flask feeds rebuild-summaries")
+    if bind.execute(sa.text("SELECT 1 FROM feed_summaries LIMIT 1")).first() is not None:
+        return
+
+    feeds = sa.table(
+        'feeds',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('name', sa.String),
+        sa.column('is_public', sa.Boolean), sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+    )
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('username', sa.String))
+    topics_table = sa.table('topics', sa.column('id', sa.Integer), sa.column('feed_id', sa.Integer), sa.column('name', sa.String))
+    summaries = sa.table(
+        'feed_summaries',
+        sa.column('feed_id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('name', sa.String),
+        sa.column('is_public', sa.Boolean), sa.column('creator', sa.String), sa.column('topics', sa.JSON),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+    )
+
+    # Topic names of each feed, in insertion order
+    topics = {}
+    topic_rows = bind.execute(
+        sa.select(topics_table.c.feed_id, topics_table.c.name).order_by(topics_table.c.feed_id, topics_table.c.id)
+    )
+    for feed_id, name in topic_rows:
+        topics.setdefault(feed_id, []).append(name)
+
+    feed_rows = bind.execute(
+        sa.select(feeds, users.c.username).join(users, users.c.id == feeds.c.user_id)
+    ).all()
+
+    rows = [{
+        'feed_id': feed.id,
+        'user_id': feed.user_id,
+        'name': feed.name,
+        'is_public': bool(feed.is_public),
+        'creator': feed.username,
+        'topics': topics.get(feed.id, []),
+        'created_at': feed.created_at,
+        'updated_at': feed.updated_at
+    } for feed in feed_rows]
+    if rows:
+        op.bulk_insert(summaries, rows)
+
+
+def downgrade():
+    op.drop_index('ix_feed_summaries_user_id_updated_at', table_name='feed_summaries')
+    op.drop_index('ix_feed_summaries_is_public_updated_at', table_name='feed_summaries')
+    op.drop_table('feed_summaries')
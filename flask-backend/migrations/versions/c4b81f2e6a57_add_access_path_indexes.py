@@ -0,0 +1,31 @@
+"""Add composite indexes for the feed access paths
+
+Revision ID: c4b81f2e6a57
+Revises: 7a3e5c1d9b20
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4b81f2e6a57'
+down_revision = '7a3e5c1d9b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all already creates these indexes on new databases, so they are created only if missing
+    op.create_index('ix_feeds_is_public_updated_at', 'feeds', ['is_public', 'updated_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_feeds_user_id_updated_at', 'feeds', ['user_id', 'updated_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_topics_name', 'topics', ['name'], unique=False, if_not_exists=True)
+    op.create_index('ix_resources_topic_id_date', 'resources', ['topic_id', 'date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_resources_topic_id_date', table_name='resources')
+    op.drop_index('ix_topics_name', table_name='topics')
+    op.drop_index('ix_feeds_user_id_updated_at', table_name='feeds')
+    op.drop_index('ix_feeds_is_public_updated_at', table_name='feeds')
@@ -0,0 +1,52 @@
+"""Add the search indexes on topic and feed names
+
+Revision ID: e19d4a7c3f82
+Revises: c4b81f2e6a57
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from database.search_index import SEARCH_TABLES, sqlite_search_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = 'e19d4a7c3f82'
+down_revision = 'c4b81f2e6a57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # FTS5 trigram tables kept in sync with their content tables by triggers
+        for search_table, content_table in SEARCH_TABLES:
+            for statement in sqlite_search_ddl(search_table, content_table):
+                op.execute(statement)
+            op.execute(f"INSERT INTO {search_table}({search_table}) VALUES ('rebuild')")
+
+    elif dialect == 'postgresql':
+        # GIN trigram indexes serve ILIKE '%term%' directly
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for _, content_table in SEARCH_TABLES:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{content_table}_name_trgm "
+                f"ON {content_table} USING gin (name gin_trgm_ops)"
+            )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        for search_table, _ in SEARCH_TABLES:
+            for operation in ('insert', 'delete', 'update'):
+                op.execute(f"DROP TRIGGER IF EXISTS {search_table}_after_{operation}")
+            op.execute(f"DROP TABLE IF EXISTS {search_table}")
+
+    elif dialect == 'postgresql':
+        for _, content_table in SEARCH_TABLES:
+            op.execute(f"DROP INDEX IF EXISTS ix_{content_table}_name_trgm")
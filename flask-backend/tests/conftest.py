@@ -0,0 +1,45 @@
+# Description: Fixtures shared by the tests.
+"""
+    The tests are run from the flask-backend directory:
+
+        python -m pytest tests
+
+    The configuration classes read the environment when config.py is imported, so the
+    application is created once per test session, against its own SQLite database file.
+"""
+
+# Import the required modules
+import os
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """
+    Create the application bound to a new SQLite database, seeded with the default user and feeds.
+    """
+    database_path = tmp_path_factory.mktemp('database') / 'test.db'
+    os.environ['DEV_DATABASE_DOCKER_URL'] = f"sqlite:///{database_path}"
+    os.environ['DEV_DATABASE_URL'] = os.environ['DEV_DATABASE_DOCKER_URL']
+
+    from application import create_app
+
+    return create_app()
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    """
+    A client logged in with the default user, with the CSRF header sent on every request.
+    """
+    client = app.test_client()
+    client.post('/auth/login', json={'username': 'kiosko', 'password': 'kiosko'})
+    client.environ_base['HTTP_X_CSRF_TOKEN'] = client.get_cookie('csrf_access_token').value
+
+    # Write the last login now, the batch would evict the cached user in the middle of a test
+    with app.app_context():
+        app.extensions['last_login_writer'].flush()
+
+    # Load the user of the token into the user cache, so the tests don't count its query
+    client.get('/auth/protected')
+    return client
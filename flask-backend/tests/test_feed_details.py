@@ -0,0 +1,26 @@
+# Description: Tests of the feed details endpoint.
+
+# Import the required modules
+from sqlalchemy import insert, select
+from database import db
+from application.models import Feed, Topic, User
+from application.services.feeds_service import FeedSummaryService
+
+
+TOPICS = ['Tennis', 'Basketball', 'Soccer']
+
+
+def test_details_list_the_topics_in_insertion_order(app, client):
+    with app.app_context():
+        feed_id = db.session.execute(
+            insert(Feed).values(user_id=db.session.scalar(select(User.id)), name='Topic order feed', is_public=True)
+            .returning(Feed.id)
+        ).scalar_one()
+        db.session.execute(insert(Topic), [{'feed_id': feed_id, 'name': name} for name in TOPICS])
+        FeedSummaryService.rebuild()
+
+    details = client.get(f"/feeds/details/{feed_id}").get_json()
+    listing = client.get('/feeds/list-public?name=Topic order feed').get_json()
+
+    assert details['topics'] == TOPICS
+    assert listing['feeds'][0]['topics'] == TOPICS
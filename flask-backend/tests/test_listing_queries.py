@@ -0,0 +1,66 @@
+# Description: Query count tests of the feed listing endpoints.
+
+# Import the required modules
+import pytest
+from sqlalchemy import event
+from database import db
+from benchmarks.bench_listing_queries import PAGE_SIZES, seed_feeds
+
+
+ENDPOINTS = ['/feeds/list', '/feeds/list-public', '/feeds/list-public?topic=tennis']
+
+
+@pytest.fixture(scope='module')
+def client(app, client):
+    """
+    The logged-in client, after seeding public and private feeds.
+    """
+    with app.app_context():
+        seed_feeds(60)
+    return client
+
+
+@pytest.fixture
+def queries(app):
+    """
+    The SQL statements executed on the primary while the test runs.
+    """
+    with app.app_context():
+        engine = db.engine
+
+    statements = []
+    listener = lambda connection, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', listener)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', listener)
+
+
+def page_url(endpoint: str, per_page: int) -> str:
+    return f"{endpoint}{'&' if '?' in endpoint else '?'}per_page={per_page}"
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS)
+def test_query_count_does_not_grow_with_the_page_size(client, queries, endpoint):
+    counts = {}
+    for per_page in PAGE_SIZES:
+        queries.clear()
+        response = client.get(page_url(endpoint, per_page))
+
+        assert response.status_code == 200
+        assert len(response.get_json()['feeds']) == per_page
+        counts[per_page] = len(queries)
+
+    assert len(set(counts.values())) == 1, f"queries per page size: {counts}"
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS)
+@pytest.mark.parametrize('per_page', PAGE_SIZES)
+def test_revalidation_is_answered_by_one_query(client, queries, endpoint, per_page):
+    url = page_url(endpoint, per_page)
+    etag = client.get(url).headers['ETag']
+
+    queries.clear()
+    revalidation = client.get(url, headers={'If-None-Match': etag})
+
+    assert revalidation.status_code == 304
+    assert len(queries) <= 1
@@ -0,0 +1,51 @@
+# Description: Tests of the routing of the queries between the primary and the replicas.
+
+# Import the required modules
+import pytest
+from flask import g
+from sqlalchemy import create_engine, select, update
+from database import db
+from application.models import Feed, User
+
+
+@pytest.fixture
+def replica(app, monkeypatch):
+    """
+    An empty in-memory replica, so a statement sent to it fails on the missing tables.
+    """
+    engine = create_engine('sqlite://')
+    monkeypatch.setitem(app.extensions, 'database_replicas', [engine])
+    yield engine
+    engine.dispose()
+
+
+def test_reads_go_to_the_replica(app, replica):
+    with app.test_request_context():
+        g.read_from_replica = True
+        assert db.session.get_bind(mapper=Feed.__mapper__, clause=select(Feed)) is replica
+        assert not g.get('wrote_to_primary')
+
+
+def test_dml_statements_go_to_the_primary(app, replica):
+    with app.test_request_context():
+        g.read_from_replica = True
+        statement = update(Feed).where(Feed.id == -1).values(name='Not a feed')
+        assert db.session.get_bind(mapper=Feed.__mapper__, clause=statement) is db.engine
+        assert g.wrote_to_primary
+        db.session.rollback()
+
+
+def test_flush_goes_to_the_primary(app, replica):
+    with app.app_context():
+        user_id = db.session.scalar(select(User.id))
+
+    with app.test_request_context():
+        g.read_from_replica = True
+        feed = Feed(user_id=user_id, name='Flushed feed', is_public=False)
+        db.session.add(feed)
+        db.session.flush()
+
+        assert feed.id is not None
+        assert g.wrote_to_primary
+        assert not db.session().writing
+        db.session.rollback()
@@ -0,0 +1,335 @@
+# Description: Local stand-in of the get-news-data Azure Function, for offline development and load tests.
+"""
+    The feed creation depends on AZURE_FUNCTION_URL, the Node function of azure-functions/ that
+    searches chroniclingamerica.loc.gov. This server answers the same contract without network
+    access, with a deterministic payload and a configurable behaviour:
+
+        POST <any path>   {"topics": ["Tennis", ...]}
+        200               [{"topic": "Tennis", "data": {"totalItems": N, "items": [...]}}, ...]
+        500               {"error": "Error fetching news data. Please try again later."}
+        401               (when a function key is set and the request doesn't send it)
+        GET  /stats       The counters of the stand-in.
+
+    - The items of a topic only depend on the topic and the seed, so every run gets the same data.
+    - The latency of a request is the latency of its slowest topic, as the function fetches
+      the topics concurrently. Topics can have their own latency and number of items.
+    - The not-found topics are answered with no items (totalItems 0), as the real search.
+    - A share of the requests (error rate) fails with the error of the function.
+
+    Run it with:
+
+        python -m tools.azure_function_standin --port 7071 --latency 80 --items 20 --not-found Curling
+
+    and point the app to it: AZURE_FUNCTION_URL=http://127.0.0.1:7071/api/get-news-data
+"""
+
+# Import the required modules
+import argparse
+import json
+import random
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# Path of the function, as deployed on Azure
+FUNCTION_PATH = '/api/get-news-data'
+
+# Error returned by the function when the search fails
+FUNCTION_ERROR = {'error': 'Error fetching news data. Please try again later.'}
+
+# Sample values of the generated items
+ITEM_TYPES = ['title', 'newspaper', 'magazine', 'bulletin']
+ITEM_PUBLISHERS = ['Kiosko Press', 'Daily Herald Co.', 'Evening Star Publishing', 'Gazette Printing', 'Tribune Association']
+ITEM_PLACES = ['Washington, D.C.', 'New York, N.Y.', 'Chicago, Ill.', 'Boston, Mass.', 'San Francisco, Calif.']
+ITEM_LANGUAGES = [['English'], ['English'], ['English', 'Spanish'], ['German'], ['French']]
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    Normalize a topic name to match the topic settings (case and surrounding spaces ignored).
+    """
+    return str(topic).strip().lower()
+
+
+class AzureFunctionStandIn:
+    """
+    HTTP server speaking the contract of the get-news-data Azure Function.
+
+    Args:
+        host (str, optional): The interface to listen on. Defaults to 127.0.0.1.
+        port (int, optional): The port to listen on, 0 for a free one. Defaults to 0.
+        latency (float, optional): Seconds each topic takes to answer. Defaults to 0.
+        topic_latency (dict, optional): Seconds of specific topics, overriding latency.
+        items_per_topic (int, optional): Items returned per topic. Defaults to 5.
+        topic_items (dict, optional): Items of specific topics, overriding items_per_topic.
+        not_found_topics (list, optional): Topics answered with no items.
+        error_rate (float, optional): Share of the requests answered with an error, from 0 to 1. Defaults to 0.
+        error_status (int, optional): Status code of the errors. Defaults to 500.
+        payload_padding (int, optional): Characters of filler text added to each item, to grow the payloads. Defaults to 0.
+        function_key (str, optional): Key required in the "code" parameter or the x-functions-key header, as authLevel 'function'.
+        seed (int, optional): Seed of the generated items and of the errors. Defaults to 42.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, topic_latency: dict = None,
+                 items_per_topic: int = 5, topic_items: dict = None, not_found_topics: list = None, error_rate: float = 0.0,
+                 error_status: int = 500, payload_padding: int = 0, function_key: str = None, seed: int = 42):
+        if not 0 <= error_rate <= 1:
+            raise ValueError("The error rate must be between 0 and 1.")
+
+        self.latency = latency
+        self.topic_latency = {normalize_topic(topic): value for topic, value in (topic_latency or {}).items()}
+        self.items_per_topic = items_per_topic
+        self.topic_items = {normalize_topic(topic): value for topic, value in (topic_items or {}).items()}
+        self.not_found_topics = {normalize_topic(topic) for topic in not_found_topics or []}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_padding = payload_padding
+        self.function_key = function_key
+        self.seed = seed
+
+        self._errors = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.reset_stats()
+
+        self.server = ThreadingHTTPServer((host, port), _StandInRequestHandler)
+        self.server.daemon_threads = True
+        self.server.standin = self
+
+
+    @property
+    def url(self) -> str:
+        """
+        Get the URL of the function (AZURE_FUNCTION_URL).
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{FUNCTION_PATH}"
+
+
+    def start(self) -> 'AzureFunctionStandIn':
+        """
+        Serve the requests from a background thread.
+
+        Returns:
+            AzureFunctionStandIn: The stand-in, to chain with the constructor.
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, name='azure-function-standin', daemon=True)
+        self._thread.start()
+        return self
+
+
+    def serve_forever(self) -> None:
+        """
+        Serve the requests from the current thread, until shutdown.
+        """
+        self.server.serve_forever()
+
+
+    def shutdown(self) -> None:
+        """
+        Stop serving and close the listening socket.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+    def reset_stats(self) -> None:
+        """
+        Reset the counters of the stand-in.
+        """
+        with self._lock:
+            self._stats = {'connections': 0, 'requests': 0, 'topics': 0, 'not_found': 0, 'errors': 0, 'unauthorized': 0}
+
+
+    def stats(self) -> dict:
+        """
+        Get the counters of the stand-in.
+
+        Returns:
+            dict: The TCP connections accepted, the requests and topics answered, the not-found topics,
+                the errors returned and the requests refused for a missing function key.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to one of the counters.
+        """
+        with self._lock:
+            self._stats[name] += value
+
+
+    def handle_topics(self, topics: list) -> tuple:
+        """
+        Build the answer of the function to a list of topics, after waiting its latency.
+
+        Args:
+            topics (list): The topics of the request.
+
+        Returns:
+            tuple: The status code and the JSON document of the answer.
+        """
+        time.sleep(max((self.topic_latency.get(normalize_topic(topic), self.latency) for topic in topics), default=0))
+
+        with self._lock:
+            self._stats['requests'] += 1
+            failed = self.error_rate > 0 and self._errors.random() < self.error_rate
+            if failed:
+                self._stats['errors'] += 1
+                return self.error_status, FUNCTION_ERROR
+
+            self._stats['topics'] += len(topics)
+            self._stats['not_found'] += sum(normalize_topic(topic) in self.not_found_topics for topic in topics)
+
+        return 200, [{'topic': topic, 'data': self.topic_data(topic)} for topic in topics]
+
+
+    def topic_data(self, topic: str) -> dict:
+        """
+        Generate the search results of a topic, always the same for the same topic and seed.
+
+        Args:
+            topic (str): The topic searched.
+
+        Returns:
+            dict: The data of the topic, with its total of items and the items.
+        """
+        key = normalize_topic(topic)
+        if key in self.not_found_topics:
+            return {'totalItems': 0, 'endIndex': 0, 'startIndex': 1, 'itemsPerPage': 0, 'items': []}
+
+        size = self.topic_items.get(key, self.items_per_topic)
+        generator = random.Random(f"{self.seed}:{key}")
+        name = str(topic).strip().title()
+
+        items = []
+        for index in range(size):
+            start_year = generator.randrange(1836, 1960)
+            item = {
+                'title': f"The {name} {generator.choice(['Chronicle', 'Gazette', 'Herald', 'Tribune', 'Review'])} {index + 1}",
+                'type': generator.choice(ITEM_TYPES),
+                'editorial': generator.choice(ITEM_PUBLISHERS),
+                'place_of_publication': generator.choice(ITEM_PLACES),
+                'start_year': str(start_year),
+                'end_year': str(start_year + generator.randrange(1, 40)),
+                'language': generator.choice(ITEM_LANGUAGES),
+                'lccn': f"sn{generator.randrange(10 ** 7, 10 ** 8)}"
+            }
+            if self.payload_padding:
+                item['note'] = (f"{name} " * (self.payload_padding // (len(name) + 1) + 1))[:self.payload_padding]
+            items.append(item)
+
+        return {'totalItems': size, 'endIndex': size, 'startIndex': 1, 'itemsPerPage': size, 'items': items}
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the stand-in, with keep-alive connections as the function host.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.standin.count('connections')
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/stats':
+            self._send_json(200, self.server.standin.stats())
+        else:
+            self._send_json(404, {'error': 'Not found.'})
+
+    def do_POST(self):
+        standin = self.server.standin
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        if standin.function_key and standin.function_key not in (
+            self.headers.get('x-functions-key'), parse_qs(urlparse(self.path).query).get('code', [None])[0]
+        ):
+            standin.count('unauthorized')
+            self._send_json(401, None)
+            return
+
+        # Same defaults as the function: no topics searches "general", an invalid body is an error
+        try:
+            topics = (json.loads(body) if body else {}).get('topics') or ['general']
+        except (ValueError, AttributeError):
+            self._send_json(500, FUNCTION_ERROR)
+            return
+
+        self._send_json(*standin.handle_topics(topics))
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, document) -> None:
+        body = json.dumps(document).encode() if document is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def parse_topic_values(values: list, convert) -> dict:
+    """
+    Parse the TOPIC=VALUE options of the command line.
+    """
+    parsed = {}
+    for value in values:
+        topic, separator, setting = value.rpartition('=')
+        if not separator or not topic:
+            raise argparse.ArgumentTypeError(f"Expected TOPIC=VALUE, got '{value}'")
+        parsed[topic] = convert(setting)
+    return parsed
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (0.0.0.0 in a container).')
+    parser.add_argument('--port', type=int, default=7071, help='Port to listen on.')
+    parser.add_argument('--latency', type=float, default=0, help='Milliseconds each topic takes to answer.')
+    parser.add_argument('--topic-latency', action='append', default=[], metavar='TOPIC=MS', help='Latency of a topic, in milliseconds.')
+    parser.add_argument('--items', type=int, default=5, help='Items returned per topic.')
+    parser.add_argument('--topic-items', action='append', default=[], metavar='TOPIC=N', help='Items returned for a topic.')
+    parser.add_argument('--not-found', nargs='*', default=[], metavar='TOPIC', help='Topics answered with no items.')
+    parser.add_argument('--error-rate', type=float, default=0, help='Share of the requests answered with an error, from 0 to 1.')
+    parser.add_argument('--error-status', type=int, default=500, help='Status code of the errors.')
+    parser.add_argument('--payload-padding', type=int, default=0, help='Characters of filler text added to each item.')
+    parser.add_argument('--function-key', help='Key required in the "code" parameter or the x-functions-key header.')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the generated items and of the errors.')
+    args = parser.parse_args(argv)
+
+    try:
+        topic_latency = parse_topic_values(args.topic_latency, lambda value: float(value) / 1000)
+        topic_items = parse_topic_values(args.topic_items, int)
+        standin = AzureFunctionStandIn(
+            args.host, args.port, latency=args.latency / 1000, topic_latency=topic_latency,
+            items_per_topic=args.items, topic_items=topic_items, not_found_topics=args.not_found,
+            error_rate=args.error_rate, error_status=args.error_status, payload_padding=args.payload_padding,
+            function_key=args.function_key, seed=args.seed
+        )
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    # Stop on SIGTERM too (docker compose stop), the process being PID 1 in its container
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"Azure Function stand-in listening on {standin.url}", flush=True)
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+
+
+if __name__ == '__main__':
+    main()